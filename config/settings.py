@@ -9,6 +9,9 @@ Optional Environment Variables:
 - DEBUG (default: False)
 - USE_POSTGRESQL (default: False)
 - ALLOWED_HOSTS (comma-separated)
+- API_CACHE_BACKEND (locmem, file or none; default: locmem)
+- API_PROFILING (default: False)
+- IMPORT_LOADER (auto, orm or copy; default: auto)
 
 NOTE: The meter_readings app is mounted at both root (/) and /meter_readings/
 for backward compatibility. This causes a URL namespace warning which is
@@ -92,6 +95,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "meter_readings.profiling.ProfilingMiddleware",  # No-op unless API_PROFILING
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",  # CORS support (must be early)
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -139,7 +143,7 @@ DATABASES = {
         "HOST": os.environ.get("DB_HOST", "localhost"),
         "PORT": os.environ.get("DB_PORT", "5432"),
         "CONN_MAX_AGE": 600,  # Connection pooling (10 minutes)
-        "OPTIONS": {"options": "-c default_transaction_isolation=read committed"},
+        "OPTIONS": {"options": "-c default_transaction_isolation=read\\ committed"},
         "TEST": {
             "NAME": "test_kraken_d0010",
         },
@@ -338,3 +342,67 @@ LOGGING = {
         },
     },
 }
+
+# ==============================================================================
+# CACHING
+# ==============================================================================
+
+# Rendered API responses: "locmem" (per process), "file" (shared by every
+# process on the host) or "none". Entries are keyed on a data version kept
+# in the database, so imports invalidate them in every process either way.
+API_CACHE_BACKEND = os.environ.get("API_CACHE_BACKEND", "locmem")
+API_CACHE_BACKENDS = {
+    "locmem": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "api-responses",
+        "OPTIONS": {"MAX_ENTRIES": 1000},
+    },
+    "file": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.environ.get("API_CACHE_DIR", BASE_DIR / "cache" / "api"),
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+    "none": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+}
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "api": API_CACHE_BACKENDS[API_CACHE_BACKEND],
+}
+
+# Seconds a cached API response is kept; a new import invalidates it sooner
+API_CACHE_TIMEOUT = int(os.environ.get("API_CACHE_TIMEOUT", "3600"))
+
+# ==============================================================================
+# PROFILING
+# ==============================================================================
+
+# Time API requests and their queries, add Server-Timing headers and keep
+# slow or N+1 requests for the staff profiling page (/admin/profiling/)
+API_PROFILING = os.environ.get("API_PROFILING", "false").lower() == "true"
+API_PROFILING_PATH_PREFIX = "/api/"
+
+# Requests at least this slow are sampled
+API_PROFILING_SLOW_MS = float(os.environ.get("API_PROFILING_SLOW_MS", "500"))
+
+# Requests running one query shape this many times are sampled as N+1
+API_PROFILING_REPEAT_THRESHOLD = int(
+    os.environ.get("API_PROFILING_REPEAT_THRESHOLD", "10")
+)
+
+# Sampled requests kept per process, oldest dropped first
+API_PROFILING_SAMPLES = int(os.environ.get("API_PROFILING_SAMPLES", "200"))
+
+# ==============================================================================
+# METER READINGS
+# ==============================================================================
+
+# Tables estimated at or above this many rows show the PostgreSQL planner
+# estimate instead of an exact COUNT(*) on dashboards and the readings admin
+APPROXIMATE_COUNT_THRESHOLD = int(
+    os.environ.get("APPROXIMATE_COUNT_THRESHOLD", "100000")
+)
+
+# How import_d0010 writes readings: "auto" (COPY on PostgreSQL, the ORM
+# elsewhere), "orm" or "copy" (PostgreSQL only)
+IMPORT_LOADER = os.environ.get("IMPORT_LOADER", "auto")
@@ -1,10 +1,150 @@
 """Django admin configuration for meter readings models."""
 
+from datetime import datetime, time, timedelta
+
 from django.contrib import admin
-from django.urls import reverse
+from django.contrib.admin.utils import unquote
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.http import Http404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
 from django.utils.html import format_html
+from django.utils.timezone import make_aware
+
+from .caching import data_changed
+from .counters import refresh_counters
+from .counts import ApproximateCountPaginator
+from .latest import refresh_latest_readings
+from .models import FlowFile, ImportRun, Meter, MeterPoint, Reading, RejectedLine
+from .rollups import refresh_rollups
+from .utils import parse_date_param
+
+
+class ReadingTotalsMixin:
+    """
+    Keep summary rollups, meter counters and latest readings in step with
+    admin edits that change readings or meters, directly or through
+    cascades and inlines.
+
+    ``reading_lookup`` and ``meter_lookup`` are the paths from Reading and
+    Meter to this admin's model.
+    """
+
+    reading_lookup = "pk"
+    meter_lookup = "pk"
+
+    def affected_totals(self, objects):
+        """Return the flow file and meter ids whose totals ``objects`` feed."""
+        flow_file_ids = set(
+            Reading.objects.filter(**{f"{self.reading_lookup}__in": objects})
+            .order_by()
+            .values_list("flow_file_id", flat=True)
+            .distinct()
+        )
+        meters = Meter.objects.filter(**{f"{self.meter_lookup}__in": objects})
+        return (
+            flow_file_ids,
+            set(meters.values_list("pk", flat=True)),
+            set(meters.values_list("meter_point_id", flat=True)),
+        )
+
+    def refresh_totals(self, before, after=((), (), ())):
+        data_changed()
+        refresh_rollups(set(before[0]) | set(after[0]))
+        refresh_counters(set(before[1]) | set(after[1]), set(before[2]) | set(after[2]))
+        refresh_latest_readings(set(before[1]) | set(after[1]))
+
+    def save_model(self, request, obj, form, change):
+        form.affected_totals = (
+            self.affected_totals([obj.pk]) if change else ((), (), ())
+        )
+        super().save_model(request, obj, form, change)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        self.refresh_totals(
+            form.affected_totals, self.affected_totals([form.instance.pk])
+        )
+
+    def delete_model(self, request, obj):
+        before = self.affected_totals([obj.pk])
+        super().delete_model(request, obj)
+        self.refresh_totals(before)
+
+    def delete_queryset(self, request, queryset):
+        before = self.affected_totals(queryset.values("pk"))
+        super().delete_queryset(request, queryset)
+        self.refresh_totals(before)
+
 
-from .models import FlowFile, Meter, MeterPoint, Reading
+class ReadingsPanelMixin:
+    """
+    Show an object's readings on its change page as a paginated panel
+    fetched by a separate request, instead of an inline formset.
+
+    The change page itself then costs the same however long the reading
+    history is. ``panel_reading_lookup`` is the filter from Reading to
+    this admin's model.
+    """
+
+    change_form_template = "admin/meter_readings/change_form_with_readings.html"
+    panel_reading_lookup = None
+    panel_page_size = 50
+
+    def get_urls(self):
+        opts = self.model._meta
+        return [
+            path(
+                "<path:object_id>/readings/",
+                self.admin_site.admin_view(self.readings_panel_view),
+                name=f"{opts.app_label}_{opts.model_name}_readings",
+            ),
+        ] + super().get_urls()
+
+    def readings_panel_view(self, request, object_id):
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            raise Http404(f"No {self.opts.verbose_name} with ID {object_id!r}.")
+        if not self.has_view_or_change_permission(request, obj):
+            raise PermissionDenied
+
+        readings = (
+            Reading.objects.filter(**{self.panel_reading_lookup: obj})
+            .select_related("meter", "flow_file")
+            .order_by("-reading_date", "-id")
+        )
+        # Malformed or impossible dates are ignored, as if left blank
+        date_from = parse_date_param(request.GET.get("date_from"))
+        date_to = parse_date_param(request.GET.get("date_to"))
+        # Whole local days, as bounds on the column so the index is used
+        if date_from:
+            readings = readings.filter(
+                reading_date__gte=make_aware(datetime.combine(date_from, time.min))
+            )
+        if date_to:
+            readings = readings.filter(
+                reading_date__lt=make_aware(
+                    datetime.combine(date_to + timedelta(days=1), time.min)
+                )
+            )
+
+        paginator = Paginator(readings, self.panel_page_size)
+        if not (date_from or date_to):
+            # The stored counter saves a COUNT(*) over the whole history
+            paginator.count = obj.reading_count
+        page = paginator.get_page(request.GET.get("page"))
+
+        return TemplateResponse(
+            request,
+            "admin/meter_readings/readings_panel.html",
+            {
+                "page": page,
+                "date_from": date_from,
+                "date_to": date_to,
+                "show_meter": self.panel_reading_lookup != "meter",
+            },
+        )
 
 
 class MeterInline(admin.TabularInline):
@@ -14,27 +154,18 @@ class MeterInline(admin.TabularInline):
     fields = ["serial_number", "meter_type", "created_at", "updated_at"]
 
 
-class ReadingInline(admin.TabularInline):
-    model = Reading
-    extra = 0
-    readonly_fields = ["created_at"]
-    fields = [
-        "register_id",
-        "reading_date",
-        "reading_value",
-        "reading_type",
-        "flow_file",
-        "created_at",
-    ]
-    ordering = ["-reading_date"]
-
-
 @admin.register(FlowFile)
 class FlowFileAdmin(admin.ModelAdmin):
-    list_display = ["filename", "file_reference", "record_count", "imported_at"]
+    list_display = [
+        "filename",
+        "file_reference",
+        "record_count",
+        "rejected_count",
+        "imported_at",
+    ]
     list_filter = ["imported_at"]
-    search_fields = ["filename", "file_reference"]
-    readonly_fields = ["imported_at"]
+    search_fields = ["filename", "file_reference", "content_hash"]
+    readonly_fields = ["imported_at", "content_hash"]
     ordering = ["-imported_at"]
 
     def has_delete_permission(self, request, obj=None):
@@ -42,37 +173,64 @@ class FlowFileAdmin(admin.ModelAdmin):
 
 
 @admin.register(MeterPoint)
-class MeterPointAdmin(admin.ModelAdmin):
-    list_display = ["mpan", "meter_count", "reading_count", "created_at"]
+class MeterPointAdmin(ReadingsPanelMixin, ReadingTotalsMixin, admin.ModelAdmin):
+    reading_lookup = "meter__meter_point"
+    meter_lookup = "meter_point"
+    panel_reading_lookup = "meter__meter_point"
+    list_display = [
+        "mpan",
+        "meter_count_display",
+        "reading_count_display",
+        "last_reading_date",
+        "created_at",
+    ]
     search_fields = ["mpan"]
-    readonly_fields = ["created_at", "updated_at"]
+    readonly_fields = [
+        "meter_count",
+        "reading_count",
+        "first_reading_date",
+        "last_reading_date",
+        "created_at",
+        "updated_at",
+    ]
     inlines = [MeterInline]
     ordering = ["mpan"]
 
-    def meter_count(self, obj):
-        return obj.meters.count()
+    def meter_count_display(self, obj):
+        return obj.meter_count
 
-    meter_count.short_description = "Meters"
+    meter_count_display.short_description = "Meters"
+    meter_count_display.admin_order_field = "meter_count"
 
-    def reading_count(self, obj):
-        return sum(meter.readings.count() for meter in obj.meters.all())
+    def reading_count_display(self, obj):
+        return obj.reading_count
 
-    reading_count.short_description = "Total Readings"
+    reading_count_display.short_description = "Total Readings"
+    reading_count_display.admin_order_field = "reading_count"
 
 
 @admin.register(Meter)
-class MeterAdmin(admin.ModelAdmin):
+class MeterAdmin(ReadingsPanelMixin, ReadingTotalsMixin, admin.ModelAdmin):
+    reading_lookup = "meter"
+    panel_reading_lookup = "meter"
     list_display = [
         "serial_number",
         "mpan_link",
         "meter_type",
-        "reading_count",
+        "reading_count_display",
+        "last_reading_date",
         "created_at",
     ]
     list_filter = ["meter_type", "created_at"]
+    list_select_related = ["meter_point"]
     search_fields = ["serial_number", "meter_point__mpan"]
-    readonly_fields = ["created_at", "updated_at"]
-    inlines = [ReadingInline]
+    readonly_fields = [
+        "reading_count",
+        "first_reading_date",
+        "last_reading_date",
+        "created_at",
+        "updated_at",
+    ]
     ordering = ["meter_point__mpan", "serial_number"]
 
     def mpan_link(self, obj):
@@ -82,17 +240,21 @@ class MeterAdmin(admin.ModelAdmin):
         return format_html('<a href="{}">{}</a>', url, obj.meter_point.mpan)
 
     mpan_link.short_description = "MPAN"
+    mpan_link.admin_order_field = "meter_point__mpan"
 
-    def reading_count(self, obj):
-        return obj.readings.count()
+    def reading_count_display(self, obj):
+        return obj.reading_count
 
-    reading_count.short_description = "Readings"
+    reading_count_display.short_description = "Readings"
+    reading_count_display.admin_order_field = "reading_count"
 
 
 @admin.register(Reading)
-class ReadingAdmin(admin.ModelAdmin):
+class ReadingAdmin(ReadingTotalsMixin, admin.ModelAdmin):
     """Main admin interface for readings with advanced search capabilities."""
 
+    meter_lookup = "readings"
+
     list_display = [
         "mpan_display",
         "meter_serial_display",
@@ -118,6 +280,10 @@ class ReadingAdmin(admin.ModelAdmin):
     readonly_fields = ["created_at"]
     ordering = ["-reading_date"]
     date_hierarchy = "reading_date"
+    # Count the unfiltered table from planner statistics on large tables,
+    # and skip the second full-table count behind "N total"
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
 
     def get_queryset(self, request):
         return (
@@ -148,3 +314,45 @@ class ReadingAdmin(admin.ModelAdmin):
 
     flow_file_display.short_description = "Source File"
     flow_file_display.admin_order_field = "flow_file__filename"
+
+
+@admin.register(RejectedLine)
+class RejectedLineAdmin(admin.ModelAdmin):
+    """Lines quarantined by ``import_d0010 --on-error=quarantine``."""
+
+    list_display = ["flow_file", "line_number", "reason", "raw_line"]
+    list_filter = ["flow_file"]
+    list_select_related = ["flow_file"]
+    search_fields = ["flow_file__filename", "raw_line", "reason"]
+    ordering = ["flow_file", "line_number"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ImportRun)
+class ImportRunAdmin(admin.ModelAdmin):
+    """Phase timings recorded by ``import_d0010``."""
+
+    list_display = [
+        "flow_file",
+        "started_at",
+        "reading_count",
+        "total_seconds",
+        "rows_per_second",
+        "parse_seconds",
+        "insert_seconds",
+        "query_count",
+    ]
+    list_select_related = ["flow_file"]
+    search_fields = ["flow_file__filename"]
+    ordering = ["-started_at"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
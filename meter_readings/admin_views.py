@@ -4,13 +4,17 @@ import os
 from io import StringIO
 from pathlib import Path
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.admin.views.decorators import staff_member_required
 from django.core.management import call_command
 from django.db import transaction
 from django.shortcuts import redirect, render
 
+from .counts import table_count
 from .models import FlowFile, Meter, MeterPoint, Reading
+from .profiling import clear_samples, recent_samples
+from .utils import clear_all_data
 
 
 @staff_member_required
@@ -40,20 +44,13 @@ def testing_dashboard(request):
 
         if action == "clear_all":
             with transaction.atomic():
-                reading_count = Reading.objects.count()
-                meter_count = Meter.objects.count()
-                mp_count = MeterPoint.objects.count()
-                file_count = FlowFile.objects.count()
-
-                Reading.objects.all().delete()
-                Meter.objects.all().delete()
-                MeterPoint.objects.all().delete()
-                FlowFile.objects.all().delete()
+                count = clear_all_data()
 
                 messages.success(
                     request,
-                    f"✓ Cleared {reading_count} readings, {meter_count} meters, "
-                    f"{mp_count} meter points, {file_count} flow files",
+                    f"✓ Cleared {count['readings']} readings, {count['meters']} meters, "
+                    f"{count['meter_points']} meter points, "
+                    f"{count['flow_files']} flow files",
                 )
             return redirect("testing_dashboard")
 
@@ -106,12 +103,32 @@ def testing_dashboard(request):
         "title": "Testing & Debug Dashboard",
         "sample_files": sample_files,
         "stats": {
-            "flow_files": FlowFile.objects.count(),
-            "meter_points": MeterPoint.objects.count(),
-            "meters": Meter.objects.count(),
-            "readings": Reading.objects.count(),
+            "flow_files": table_count(FlowFile),
+            "meter_points": table_count(MeterPoint),
+            "meters": table_count(Meter),
+            "readings": table_count(Reading),
         },
-        "recent_files": FlowFile.objects.order_by("-imported_at")[:5],
+        "recent_files": FlowFile.objects.select_related("import_run").order_by(
+            "-imported_at"
+        )[:5],
     }
 
     return render(request, "admin/testing_dashboard.html", context)
+
+
+@staff_member_required
+def api_profiling(request):
+    """Slow and N+1 API requests sampled by ProfilingMiddleware."""
+    if request.method == "POST" and request.POST.get("action") == "clear":
+        clear_samples()
+        messages.success(request, "✓ Cleared profiled requests")
+        return redirect("api_profiling")
+
+    context = {
+        "title": "API Profiling",
+        "enabled": settings.API_PROFILING,
+        "slow_ms": settings.API_PROFILING_SLOW_MS,
+        "repeat_threshold": settings.API_PROFILING_REPEAT_THRESHOLD,
+        "samples": recent_samples(),
+    }
+    return render(request, "admin/api_profiling.html", context)
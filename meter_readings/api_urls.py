@@ -10,14 +10,23 @@ from drf_spectacular.views import (
 )
 from rest_framework.routers import DefaultRouter
 
-from .api_views import FlowFileViewSet, MeterPointViewSet, MeterViewSet, ReadingViewSet
+from .api_views import (
+    FlowFileViewSet,
+    ImportRunViewSet,
+    LatestReadingViewSet,
+    MeterPointViewSet,
+    MeterViewSet,
+    ReadingViewSet,
+)
 
 # Create router and register viewsets
 router = DefaultRouter()
 router.register(r"flow-files", FlowFileViewSet, basename="flowfile")
+router.register(r"import-runs", ImportRunViewSet, basename="importrun")
 router.register(r"meter-points", MeterPointViewSet, basename="meterpoint")
 router.register(r"meters", MeterViewSet, basename="meter")
 router.register(r"readings", ReadingViewSet, basename="reading")
+router.register(r"latest-readings", LatestReadingViewSet, basename="latestreading")
 
 urlpatterns = [
     # API endpoints
@@ -3,30 +3,231 @@ API views for meter readings.
 Provides REST endpoints for querying meter data.
 """
 
+from itertools import groupby
+from json.encoder import encode_basestring_ascii as json_string
+from operator import itemgetter
+
 from django.db.models import Count, Max, Min
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from drf_spectacular.utils import extend_schema
-from rest_framework import filters, viewsets
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, inline_serializer
+from rest_framework import filters, serializers, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-
-from .models import FlowFile, Meter, MeterPoint, Reading
+from rest_framework.utils.encoders import JSONEncoder
+
+from .caching import cache_response
+from .consumption import CONSUMPTION_BUCKETS, consumption
+from .exports import (
+    EXPORT_CHUNK_SIZE,
+    EXPORT_FIELDS,
+    EXPORT_FORMATS,
+    ExportContentNegotiation,
+    export_rows,
+    reading_json,
+)
+from .models import (
+    FlowFile,
+    ImportRun,
+    LatestReading,
+    Meter,
+    MeterPoint,
+    Reading,
+    RejectedLine,
+)
+from .pagination import ReadingPagination
+from .rollups import rollup_summary
 from .serializers import (
+    ConsumptionSerializer,
     FlowFileSerializer,
+    ImportRunSerializer,
+    LatestReadingSerializer,
     MeterPointDetailSerializer,
     MeterPointSerializer,
     MeterSerializer,
+    ReadingBatchSerializer,
     ReadingDetailSerializer,
     ReadingSerializer,
     ReadingSummarySerializer,
+    RejectedLineSerializer,
+)
+from .utils import (
+    QUERY_CHUNK_SIZE,
+    READING_FILTER_PARAMS,
+    chunked,
+    date_filter_errors,
+    filter_readings,
+    parse_date_param,
 )
 
+# Rows fetched and serialized per round trip when streaming readings
+STREAM_CHUNK_SIZE = 2000
+
+# MPANs accepted by one latest-readings request
+LATEST_MAX_MPANS = 500
+
+READINGS_ACTION_PARAMETERS = [
+    OpenApiParameter(
+        "stream",
+        str,
+        enum=["ndjson", "json"],
+        description=(
+            "Stream every reading instead of a page: `ndjson` for one JSON "
+            "object per line, `json` for a single array"
+        ),
+    ),
+]
+
+CONSUMPTION_PARAMETERS = [
+    OpenApiParameter(
+        "bucket",
+        str,
+        enum=CONSUMPTION_BUCKETS,
+        description="Period to sum consumption over (default: day)",
+    ),
+    OpenApiParameter(
+        "date_from", OpenApiTypes.DATE, description="First period to include"
+    ),
+    OpenApiParameter(
+        "date_to", OpenApiTypes.DATE, description="Last period to include"
+    ),
+]
+
+PAGINATED_READINGS = inline_serializer(
+    name="PaginatedReadingList",
+    fields={
+        "count": serializers.IntegerField(required=False),
+        "next": serializers.URLField(allow_null=True),
+        "previous": serializers.URLField(allow_null=True),
+        "results": ReadingSerializer(many=True),
+    },
+)
+
+
+def stream_readings(readings, stream_format):
+    """
+    Stream ``readings`` as NDJSON or a JSON array.
+
+    The queryset is walked with ``.iterator()`` and serialized a chunk at
+    a time, so memory stays flat however long the history is and the
+    first bytes go out straight away.
+    """
+    encoder = JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def ndjson():
+        for chunk in chunked(readings.iterator(STREAM_CHUNK_SIZE), STREAM_CHUNK_SIZE):
+            yield "".join(
+                encoder.encode(row) + "\n"
+                for row in ReadingSerializer(chunk, many=True).data
+            )
+
+    def json_array():
+        separator = ""
+        yield "["
+        for chunk in chunked(readings.iterator(STREAM_CHUNK_SIZE), STREAM_CHUNK_SIZE):
+            for row in ReadingSerializer(chunk, many=True).data:
+                yield separator + encoder.encode(row)
+                separator = ","
+        yield "]"
+
+    if stream_format == "ndjson":
+        return StreamingHttpResponse(ndjson(), content_type="application/x-ndjson")
+    return StreamingHttpResponse(json_array(), content_type="application/json")
+
+
+def stream_batch(readings, mpans):
+    """
+    Stream the readings of ``mpans`` as NDJSON, one line per MPAN.
+
+    Each line is ``{"mpan": ..., "readings": [...]}`` with the readings
+    newest first. MPANs are queried ``QUERY_CHUNK_SIZE`` at a time and
+    their rows read from the cursor with ``values_list``, so only one
+    MPAN's readings are held in memory at once. MPANs without readings
+    follow the rest of their chunk with an empty list.
+    """
+    lookups = [lookup for _, lookup in EXPORT_FIELDS]
+
+    def ndjson():
+        for chunk in chunked(dict.fromkeys(mpans), QUERY_CHUNK_SIZE):
+            rows = (
+                readings.filter(meter__meter_point__mpan__in=chunk)
+                .order_by("meter__meter_point__mpan", "-reading_date", "id")
+                .values_list(*lookups)
+                .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            )
+            missing = dict.fromkeys(chunk)
+            for mpan, group in groupby(rows, key=itemgetter(1)):
+                missing.pop(mpan, None)
+                yield (
+                    f'{{"mpan":{json_string(mpan)},"readings":['
+                    + ",".join(map(reading_json, group))
+                    + "]}\n"
+                )
+            for mpan in missing:
+                yield f'{{"mpan":{json_string(mpan)},"readings":[]}}\n'
+
+    return StreamingHttpResponse(ndjson(), content_type="application/x-ndjson")
+
+
+def readings_response(request, view, readings):
+    """
+    Respond with ``readings`` for a per-meter or per-MPAN readings action.
+
+    Paginated like the readings list (page numbers, or keyset pages with
+    ``pagination=cursor``), unless ``stream`` asks for the full history.
+    """
+    stream_format = request.query_params.get("stream")
+    if stream_format:
+        if stream_format not in ("ndjson", "json"):
+            raise ValidationError({"stream": "Must be one of: ndjson, json"})
+        return stream_readings(readings, stream_format)
+
+    paginator = ReadingPagination()
+    page = paginator.paginate_queryset(readings, request, view=view)
+    serializer = ReadingSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
+def consumption_response(request, readings):
+    """
+    Respond with consumption per period for a meter point or meter.
+
+    ``bucket`` picks day, week or month periods; ``date_from`` and
+    ``date_to`` keep the periods that overlap those dates. Deltas are
+    always taken against the previous reading, even one before
+    ``date_from``.
+    """
+    bucket = request.query_params.get("bucket", "day")
+    if bucket not in CONSUMPTION_BUCKETS:
+        raise ValidationError(
+            {"bucket": f"Must be one of: {', '.join(CONSUMPTION_BUCKETS)}"}
+        )
+
+    bounds = {}
+    for param in ("date_from", "date_to"):
+        value = request.query_params.get(param)
+        if value:
+            bounds[param] = parse_date_param(value)
+            if bounds[param] is None:
+                raise ValidationError({param: "Must be a date (YYYY-MM-DD)"})
+
+    results = consumption(readings, bucket, **bounds)
+
+    serializer = ConsumptionSerializer({"bucket": bucket, "results": results})
+    return Response(serializer.data)
+
 
 class FlowFileViewSet(viewsets.ReadOnlyModelViewSet):
     """
     API endpoint for viewing imported D0010 files.
 
     List all imported files with their metadata.
+
+    Custom Actions:
+    - `/api/v1/flow-files/{id}/rejected-lines/` - Lines quarantined by
+      `import_d0010 --on-error=quarantine` (paginated)
     """
 
     queryset = FlowFile.objects.all().order_by("-imported_at")
@@ -45,6 +246,7 @@ class FlowFileViewSet(viewsets.ReadOnlyModelViewSet):
         summary="List all imported D0010 flow files",
         description="Retrieve a list of all imported D0010 flow files with metadata including filename, record count, and import timestamp.",
     )
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -52,6 +254,67 @@ class FlowFileViewSet(viewsets.ReadOnlyModelViewSet):
         summary="Get details for a specific flow file",
         description="Retrieve detailed information about a specific imported D0010 flow file.",
     )
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Get the lines quarantined from a flow file",
+        responses={200: RejectedLineSerializer(many=True)},
+        filters=False,
+    )
+    @action(detail=True, methods=["get"], url_path="rejected-lines")
+    @cache_response
+    def rejected_lines(self, request, pk=None):
+        """Get the invalid lines set aside when this file was imported."""
+        flow_file = self.get_object()
+        rejected = RejectedLine.objects.filter(flow_file=flow_file).order_by(
+            "line_number"
+        )
+        page = self.paginate_queryset(rejected)
+        serializer = RejectedLineSerializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+
+class ImportRunViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for the timings recorded by each import.
+
+    One run per imported file, with the seconds spent reading, parsing,
+    resolving MPANs and meters, inserting readings and finalizing, plus
+    rows per second, rejected lines, bytes and queries.
+
+    Query Parameters:
+    - `flow_file` - Filter by flow file id
+    - `ordering` - e.g. `-total_seconds` or `rows_per_second`
+    """
+
+    queryset = ImportRun.objects.select_related("flow_file").order_by("-started_at")
+    serializer_class = ImportRunSerializer
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ["flow_file"]
+    ordering_fields = [
+        "started_at",
+        "total_seconds",
+        "rows_per_second",
+        "reading_count",
+        "query_count",
+    ]
+    ordering = ["-started_at"]
+
+    @extend_schema(
+        summary="List import runs",
+        description="Retrieve the phase timings, throughput and counts recorded for each imported file.",
+    )
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Get an import run",
+        description="Retrieve the phase timings, throughput and counts recorded for one imported file.",
+    )
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
@@ -67,12 +330,13 @@ class MeterPointViewSet(viewsets.ReadOnlyModelViewSet):
 
     Custom Actions:
     - `/api/v1/meter-points/{id}/readings/` - Get all readings for a meter point
+      (paginated; `pagination=cursor` for keyset pages, `stream=ndjson|json`
+      for the full history)
+    - `/api/v1/meter-points/{id}/consumption/` - Get consumption per day, week or
+      month (`bucket`), from consecutive register readings
     """
 
-    queryset = MeterPoint.objects.annotate(
-        meter_count=Count("meters", distinct=True),
-        reading_count=Count("meters__readings", distinct=True),
-    ).order_by("mpan")
+    queryset = MeterPoint.objects.order_by("mpan")
 
     filter_backends = [
         DjangoFilterBackend,
@@ -80,7 +344,14 @@ class MeterPointViewSet(viewsets.ReadOnlyModelViewSet):
         filters.OrderingFilter,
     ]
     search_fields = ["mpan"]
-    ordering_fields = ["mpan", "created_at", "meter_count", "reading_count"]
+    ordering_fields = [
+        "mpan",
+        "created_at",
+        "meter_count",
+        "reading_count",
+        "first_reading_date",
+        "last_reading_date",
+    ]
     ordering = ["mpan"]
 
     def get_serializer_class(self):
@@ -93,6 +364,7 @@ class MeterPointViewSet(viewsets.ReadOnlyModelViewSet):
         summary="List all meter points (MPANs)",
         description="Retrieve a list of all meter points with counts of associated meters and readings.",
     )
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -100,14 +372,17 @@ class MeterPointViewSet(viewsets.ReadOnlyModelViewSet):
         summary="Get details for a specific meter point",
         description="Retrieve detailed information about a meter point including all associated meters.",
     )
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
     @extend_schema(
         summary="Get all readings for a meter point",
-        responses={200: ReadingSerializer(many=True)},
+        parameters=READINGS_ACTION_PARAMETERS,
+        responses={200: PAGINATED_READINGS},
     )
     @action(detail=True, methods=["get"])
+    @cache_response
     def readings(self, request, pk=None):
         """Get all readings for this meter point."""
         meter_point = self.get_object()
@@ -117,8 +392,26 @@ class MeterPointViewSet(viewsets.ReadOnlyModelViewSet):
             .order_by("-reading_date")
         )
 
-        serializer = ReadingSerializer(readings, many=True)
-        return Response(serializer.data)
+        return readings_response(request, self, readings)
+
+    @extend_schema(
+        summary="Get consumption per period for a meter point",
+        description=(
+            "Sum the differences between consecutive readings on each "
+            "register by day, week or month."
+        ),
+        parameters=CONSUMPTION_PARAMETERS,
+        filters=False,
+        responses={200: ConsumptionSerializer},
+    )
+    @action(detail=True, methods=["get"])
+    @cache_response
+    def consumption(self, request, pk=None):
+        """Get consumption per period for this meter point."""
+        meter_point = self.get_object()
+        return consumption_response(
+            request, Reading.objects.filter(meter__meter_point=meter_point)
+        )
 
 
 class MeterViewSet(viewsets.ReadOnlyModelViewSet):
@@ -132,12 +425,14 @@ class MeterViewSet(viewsets.ReadOnlyModelViewSet):
 
     Custom Actions:
     - `/api/v1/meters/{id}/readings/` - Get all readings for a meter
+      (paginated; `pagination=cursor` for keyset pages, `stream=ndjson|json`
+      for the full history)
+    - `/api/v1/meters/{id}/consumption/` - Get consumption per day, week or
+      month (`bucket`), from consecutive register readings
     """
 
-    queryset = (
-        Meter.objects.select_related("meter_point")
-        .annotate(reading_count=Count("readings"))
-        .order_by("meter_point__mpan", "serial_number")
+    queryset = Meter.objects.select_related("meter_point").order_by(
+        "meter_point__mpan", "serial_number"
     )
 
     serializer_class = MeterSerializer
@@ -148,13 +443,21 @@ class MeterViewSet(viewsets.ReadOnlyModelViewSet):
     ]
     filterset_fields = ["meter_type", "meter_point__mpan"]
     search_fields = ["serial_number", "meter_point__mpan"]
-    ordering_fields = ["serial_number", "meter_type", "created_at", "reading_count"]
+    ordering_fields = [
+        "serial_number",
+        "meter_type",
+        "created_at",
+        "reading_count",
+        "first_reading_date",
+        "last_reading_date",
+    ]
     ordering = ["meter_point__mpan", "serial_number"]
 
     @extend_schema(
         summary="List all meters",
         description="Retrieve a list of all meters with their serial numbers, types, and reading counts.",
     )
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -162,25 +465,44 @@ class MeterViewSet(viewsets.ReadOnlyModelViewSet):
         summary="Get details for a specific meter",
         description="Retrieve detailed information about a specific meter including its MPAN and reading count.",
     )
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
     @extend_schema(
         summary="Get all readings for a meter",
-        responses={200: ReadingSerializer(many=True)},
+        parameters=READINGS_ACTION_PARAMETERS,
+        responses={200: PAGINATED_READINGS},
     )
     @action(detail=True, methods=["get"])
+    @cache_response
     def readings(self, request, pk=None):
         """Get all readings for this meter."""
         meter = self.get_object()
         readings = (
             Reading.objects.filter(meter=meter)
-            .select_related("flow_file")
+            .select_related("meter__meter_point", "flow_file")
             .order_by("-reading_date")
         )
 
-        serializer = ReadingSerializer(readings, many=True)
-        return Response(serializer.data)
+        return readings_response(request, self, readings)
+
+    @extend_schema(
+        summary="Get consumption per period for a meter",
+        description=(
+            "Sum the differences between consecutive readings on each "
+            "register by day, week or month."
+        ),
+        parameters=CONSUMPTION_PARAMETERS,
+        filters=False,
+        responses={200: ConsumptionSerializer},
+    )
+    @action(detail=True, methods=["get"])
+    @cache_response
+    def consumption(self, request, pk=None):
+        """Get consumption per period for this meter."""
+        meter = self.get_object()
+        return consumption_response(request, Reading.objects.filter(meter=meter))
 
 
 class ReadingViewSet(viewsets.ReadOnlyModelViewSet):
@@ -202,15 +524,25 @@ class ReadingViewSet(viewsets.ReadOnlyModelViewSet):
     - `date_to` - Readings up to this date
     - `search` - Search in MPAN or serial number
     - `ordering` - Order by field (e.g., `-reading_date`)
+    - `pagination=cursor` - Keyset pages on (reading_date, id) with
+      next/previous cursor links and no total count; constant cost at any
+      depth. Ordering is limited to `reading_date` / `-reading_date`.
 
     Custom Actions:
     - `/api/v1/readings/summary/` - Get summary statistics
+    - `/api/v1/readings/batch/` - POST a list of MPANs (and optional
+      `date_from` / `date_to`) to get their readings grouped by MPAN
+    - `/api/v1/readings/export/` - Stream every matching reading as NDJSON
+      or CSV (`export_format`), filtered by `mpan`, `meter_serial`,
+      `date_from` and `date_to`
     """
 
     queryset = Reading.objects.select_related(
         "meter__meter_point", "meter", "flow_file"
     ).order_by("-reading_date")
 
+    pagination_class = ReadingPagination
+
     filter_backends = [
         DjangoFilterBackend,
         filters.SearchFilter,
@@ -235,6 +567,7 @@ class ReadingViewSet(viewsets.ReadOnlyModelViewSet):
         summary="List all meter readings",
         description="Retrieve a paginated list of all meter readings. Supports filtering by MPAN, date range, reading type, and meter type.",
     )
+    @cache_response
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
@@ -242,47 +575,43 @@ class ReadingViewSet(viewsets.ReadOnlyModelViewSet):
         summary="Get details for a specific reading",
         description="Retrieve detailed information about a specific meter reading including nested meter and flow file data.",
     )
+    @cache_response
     def retrieve(self, request, *args, **kwargs):
         return super().retrieve(request, *args, **kwargs)
 
     def get_queryset(self):
         """Filter queryset by query parameters."""
         queryset = super().get_queryset()
-
-        # Filter by MPAN
-        mpan = self.request.query_params.get("mpan")
-        if mpan:
-            queryset = queryset.filter(meter__meter_point__mpan=mpan)
-
-        # Filter by meter serial
-        meter_serial = self.request.query_params.get("meter_serial")
-        if meter_serial:
-            queryset = queryset.filter(meter__serial_number=meter_serial)
-
-        # Filter by date range
-        date_from = self.request.query_params.get("date_from")
-        if date_from:
-            queryset = queryset.filter(reading_date__gte=date_from)
-
-        date_to = self.request.query_params.get("date_to")
-        if date_to:
-            queryset = queryset.filter(reading_date__lte=date_to)
-
-        return queryset
+        errors = date_filter_errors(self.request.query_params)
+        if errors:
+            raise ValidationError(errors)
+        return filter_readings(queryset, self.request.query_params)
 
     @extend_schema(
         summary="Get summary statistics for readings",
         responses={200: ReadingSummarySerializer()},
     )
     @action(detail=False, methods=["get"])
+    @cache_response
     def summary(self, request):
         """
         Get summary statistics for all readings.
 
         Returns total counts, date range, and breakdown by reading type.
+        Unfiltered requests are answered from the per-file rollup table
+        when every flow file has one; filtered requests query readings.
         """
-        readings = self.get_queryset()
+        summary = None
+        if not any(request.query_params.get(p) for p in READING_FILTER_PARAMS):
+            summary = rollup_summary()
+        if summary is None:
+            summary = self.live_summary(self.get_queryset())
 
+        serializer = ReadingSummarySerializer(summary)
+        return Response(serializer.data)
+
+    def live_summary(self, readings):
+        """Compute the summary by aggregating ``readings`` directly."""
         # Aggregate statistics
         stats = readings.aggregate(
             total_readings=Count("id"),
@@ -292,13 +621,16 @@ class ReadingViewSet(viewsets.ReadOnlyModelViewSet):
             latest_reading=Max("reading_date"),
         )
 
-        # Count by reading type
+        # Count by reading type (cleared ordering keeps reading_date out of
+        # the GROUP BY)
         reading_types = {}
-        type_counts = readings.values("reading_type").annotate(count=Count("id"))
+        type_counts = (
+            readings.order_by().values("reading_type").annotate(count=Count("id"))
+        )
         for item in type_counts:
             reading_types[item["reading_type"]] = item["count"]
 
-        summary = {
+        return {
             "total_readings": stats["total_readings"],
             "total_meter_points": stats["total_meter_points"],
             "total_meters": stats["total_meters"],
@@ -309,5 +641,154 @@ class ReadingViewSet(viewsets.ReadOnlyModelViewSet):
             "reading_types": reading_types,
         }
 
-        serializer = ReadingSummarySerializer(summary)
-        return Response(serializer.data)
+    @extend_schema(
+        summary="Look up readings for many MPANs",
+        description=(
+            "Stream the readings of up to 5,000 MPANs as NDJSON, one "
+            '`{"mpan": ..., "readings": [...]}` line per MPAN with its '
+            "readings newest first. Every requested MPAN gets a line, with "
+            "an empty list if it has no readings. Readings have the fields "
+            "of `/api/readings/export/`."
+        ),
+        request=ReadingBatchSerializer,
+        responses={(200, "application/x-ndjson"): str},
+        filters=False,
+    )
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """
+        Stream readings for a list of MPANs.
+
+        Rows come from ``values_list`` like the export, rather than
+        through ``ReadingSerializer``, and are written out one MPAN at a
+        time.
+        """
+        batch = ReadingBatchSerializer(data=request.data)
+        batch.is_valid(raise_exception=True)
+        params = {
+            param: value.isoformat()
+            for param, value in batch.validated_data.items()
+            if param in ("date_from", "date_to")
+        }
+        readings = filter_readings(Reading.objects.all(), params)
+        return stream_batch(readings, batch.validated_data["mpans"])
+
+    @extend_schema(
+        summary="Export readings as NDJSON or CSV",
+        description=(
+            "Stream every reading matching `mpan`, `meter_serial`, `date_from` "
+            "and `date_to`, oldest first, without pagination."
+        ),
+        parameters=[
+            OpenApiParameter(
+                "export_format",
+                str,
+                enum=tuple(EXPORT_FORMATS),
+                description="Output format (default: ndjson)",
+            ),
+            OpenApiParameter("mpan", str),
+            OpenApiParameter("meter_serial", str),
+            OpenApiParameter("date_from", str),
+            OpenApiParameter("date_to", str),
+        ],
+        filters=False,
+        responses={(200, "application/x-ndjson"): str, (200, "text/csv"): str},
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        content_negotiation_class=ExportContentNegotiation,
+    )
+    def export(self, request):
+        """
+        Stream matching readings for bulk export.
+
+        Rows come straight from ``values_list`` and are formatted by hand,
+        skipping model instances and the serializer.
+        """
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in EXPORT_FORMATS:
+            raise ValidationError(
+                {"export_format": f"Must be one of: {', '.join(EXPORT_FORMATS)}"}
+            )
+        # Bad dates must be a 400 before the stream starts, not an error
+        # partway through it
+        errors = date_filter_errors(request.query_params)
+        if errors:
+            raise ValidationError(errors)
+
+        formatter, content_type = EXPORT_FORMATS[export_format]
+        readings = filter_readings(Reading.objects.all(), request.query_params)
+        response = StreamingHttpResponse(
+            formatter(export_rows(readings)), content_type=content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="readings.{export_format}"'
+        )
+        return response
+
+
+class LatestReadingViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    API endpoint for the newest reading on each meter register.
+
+    One row per meter and register, kept up to date by the importer, so a
+    portfolio snapshot costs one indexed lookup per register rather than
+    a search through every meter's readings.
+
+    Query Parameters:
+    - `mpan` - Comma-separated MPANs (up to 500)
+    - `meter_serial` - Filter by meter serial number
+    - `register_id` - Filter by register
+    """
+
+    queryset = LatestReading.objects.select_related("meter__meter_point").order_by(
+        "meter__meter_point__mpan", "meter__serial_number", "register_id"
+    )
+    serializer_class = LatestReadingSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["register_id"]
+
+    @extend_schema(
+        summary="List the latest reading per meter register",
+        description="Retrieve the newest reading on each register of many MPANs in one call.",
+        parameters=[
+            OpenApiParameter(
+                "mpan", str, description="Comma-separated MPANs (up to 500)"
+            ),
+            OpenApiParameter("meter_serial", str),
+        ],
+    )
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Get a latest reading",
+        description="Retrieve the newest reading on one meter register.",
+    )
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def get_queryset(self):
+        """Filter queryset by query parameters."""
+        queryset = super().get_queryset()
+
+        mpans = [
+            mpan.strip()
+            for mpan in self.request.query_params.get("mpan", "").split(",")
+            if mpan.strip()
+        ]
+        if len(mpans) > LATEST_MAX_MPANS:
+            raise ValidationError(
+                {"mpan": f"At most {LATEST_MAX_MPANS} MPANs per request"}
+            )
+        if mpans:
+            queryset = queryset.filter(meter__meter_point__mpan__in=mpans)
+
+        meter_serial = self.request.query_params.get("meter_serial")
+        if meter_serial:
+            queryset = queryset.filter(meter__serial_number=meter_serial)
+
+        return queryset
@@ -0,0 +1,128 @@
+"""
+Shared set-up for the benchmark management commands.
+
+Benchmarks run against a throwaway test database, seeded in bulk with
+``seed_database`` when they need readings, and call the API through
+``benchmark_client``. Each reports JSON with ``write_report``.
+"""
+
+import json
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from .counters import recompute_all_counters
+from .counts import invalidate_counts
+from .latest import rebuild_latest_readings
+from .models import FlowFile, Meter, MeterPoint, Reading
+from .rollups import refresh_rollups
+
+# Rows per INSERT while seeding
+SEED_BATCH_SIZE = 5000
+
+# Flow files the seeded readings are spread over
+SEED_FLOW_FILES = 10
+
+# First seeded MPAN; the rest follow on from it
+SEED_FIRST_MPAN = 1900000000000
+
+SEED_START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@contextmanager
+def throwaway_database():
+    """Run the block against a new test database, destroyed afterwards."""
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def seed_database(readings, meters):
+    """
+    Bulk insert ``meters`` MPANs with one meter each and ``readings`` spread
+    over them, then build the counters, rollups and latest readings the
+    importer would have maintained. Returns the number of readings.
+    """
+    flow_files = FlowFile.objects.bulk_create(
+        FlowFile(filename=f"bench_{i:02d}.uff", file_reference=f"BENCH{i:02d}")
+        for i in range(SEED_FLOW_FILES)
+    )
+    meter_points = MeterPoint.objects.bulk_create(
+        (MeterPoint(mpan=str(SEED_FIRST_MPAN + i)) for i in range(meters)),
+        batch_size=SEED_BATCH_SIZE,
+    )
+    meter_objs = Meter.objects.bulk_create(
+        (
+            Meter(
+                meter_point=mp, serial_number=f"BENCH{i:07d}", meter_type="SCD"[i % 3]
+            )
+            for i, mp in enumerate(meter_points)
+        ),
+        batch_size=SEED_BATCH_SIZE,
+    )
+    per_meter = max(readings // meters, 1)
+    Reading.objects.bulk_create(
+        (
+            Reading(
+                meter=meter,
+                register_id="01",
+                reading_date=SEED_START + timedelta(hours=6 * i),
+                reading_value=Decimal(i * 7 + n % 1000),
+                flow_file=flow_files[i * SEED_FLOW_FILES // per_meter],
+            )
+            for n, meter in enumerate(meter_objs)
+            for i in range(per_meter)
+        ),
+        batch_size=SEED_BATCH_SIZE,
+    )
+
+    for flow_file in flow_files:
+        flow_file.record_count = flow_file.readings.count()
+    FlowFile.objects.bulk_update(flow_files, ["record_count"])
+    refresh_rollups([flow_file.pk for flow_file in flow_files])
+    recompute_all_counters()
+    rebuild_latest_readings()
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+    invalidate_counts()
+    return per_meter * meters
+
+
+@contextmanager
+def benchmark_client():
+    """
+    Yield an authenticated APIClient, with throttling and the API response
+    cache turned off in the block.
+    """
+    client = APIClient()
+    client.force_authenticate(User(username="benchmark"))
+    caches = {
+        **settings.CACHES,
+        "api": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+    }
+    with override_settings(CACHES=caches), patch.object(
+        APIView, "throttle_classes", []
+    ):
+        yield client
+
+
+def write_report(command, report, output=None):
+    """Write ``report`` as JSON to ``output``, or to the command's stdout."""
+    text = json.dumps(report, indent=2)
+    if output:
+        Path(output).write_text(text + "\n", encoding="utf-8")
+        command.stderr.write(command.style.SUCCESS(f"Wrote {output}"))
+    else:
+        command.stdout.write(text)
@@ -0,0 +1,112 @@
+"""
+Response caching for the read-only API.
+
+Rendered JSON responses are stored in the "api" cache under a key made
+of the data version, the URL with its query parameters sorted, and the
+negotiated media type. Anything that changes imported data calls
+``data_changed``, which bumps the version once the transaction commits,
+so every cached response in every process is bypassed at once.
+"""
+
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag, urlencode
+from rest_framework.response import Response
+
+from .models import DataVersion
+
+
+def get_data_version():
+    """Return the current data version."""
+    return DataVersion.objects.filter(pk=1).values_list("version", flat=True).first()
+
+
+def bump_data_version():
+    """Advance the data version, invalidating every cached API response."""
+    updated = DataVersion.objects.filter(pk=1).update(
+        version=F("version") + 1, updated_at=timezone.now()
+    )
+    if not updated:
+        DataVersion.objects.get_or_create(pk=1, defaults={"version": 1})
+
+
+def data_changed():
+    """
+    Invalidate cached counts and API responses after a data change.
+
+    Both are keyed on the data version, which is bumped when the current
+    transaction commits (immediately outside one), so no request can
+    cache the old data under the new version.
+    """
+    transaction.on_commit(bump_data_version)
+
+
+def response_cache_key(request, version):
+    params = sorted(
+        (key, value)
+        for key in request.query_params
+        for value in request.query_params.getlist(key)
+    )
+    url = f"{request.scheme}://{request.get_host()}{request.path}?{urlencode(params)}"
+    digest = hashlib.sha256(f"{url}|{request.accepted_media_type}".encode())
+    return f"api-response:{version}:{digest.hexdigest()}"
+
+
+def _conditional(request, content, content_type, etag):
+    """Return 304 if the client already holds ``etag``, else the content."""
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(content, content_type=content_type)
+    response["ETag"] = etag
+    return response
+
+
+def cache_response(view_method):
+    """
+    Serve a read-only viewset method from the API cache, with ETags.
+
+    Only successful JSON responses are cached; the browsable API, errors
+    and streamed responses pass straight through.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.accepted_renderer.format != "json":
+            return view_method(self, request, *args, **kwargs)
+
+        api_cache = caches["api"]
+        key = response_cache_key(request, get_data_version())
+        cached = api_cache.get(key)
+        if cached is not None:
+            return _conditional(request, *cached)
+
+        response = view_method(self, request, *args, **kwargs)
+        if not isinstance(response, Response) or response.status_code != 200:
+            return response
+
+        # Render now, as finalize_response would, so the bytes can be stored
+        response.accepted_renderer = request.accepted_renderer
+        response.accepted_media_type = request.accepted_media_type
+        response.renderer_context = self.get_renderer_context()
+        response.render()
+        etag = quote_etag(hashlib.sha256(response.content).hexdigest())
+        api_cache.set(
+            key,
+            (response.content, response["Content-Type"], etag),
+            settings.API_CACHE_TIMEOUT,
+        )
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return _conditional(request, None, None, etag)
+        response["ETag"] = etag
+        return response
+
+    return wrapper
@@ -0,0 +1,171 @@
+"""
+Consumption between consecutive register readings, bucketed by period.
+
+D0010 readings are cumulative register values, so the consumption a
+reading records is its value minus the previous reading on the same
+meter and register. Each delta counts towards the period of the later
+reading, in the project's time zone; a register's first reading only
+sets the baseline.
+
+Where the database supports window functions the deltas come from
+``LAG()`` and are summed per period in a single query; otherwise the
+readings are walked once in register order in Python.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import groupby, pairwise
+
+from django.db import connections
+from django.db.models import DateField, F, Max, Q, Window
+from django.db.models.functions import Lag, Trunc
+from django.utils import timezone
+
+# Supported bucket sizes, as Trunc kinds
+CONSUMPTION_BUCKETS = ("day", "week", "month")
+
+# Matches Reading.reading_value; SQLite sums decimals as floats
+CONSUMPTION_QUANTUM = Decimal("0.001")
+
+# Rows fetched per round trip by the Python fallback
+CONSUMPTION_CHUNK_SIZE = 5000
+
+
+def bucket_start(day, bucket):
+    """Return the first day of the ``bucket`` period containing ``day``."""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket_start(day, bucket):
+    """Return the first day of the period after the one containing ``day``."""
+    start = bucket_start(day, bucket)
+    if bucket == "week":
+        return start + timedelta(days=7)
+    if bucket == "month":
+        return (start + timedelta(days=31)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def _local_midnight(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def bound_readings(readings, bucket, date_from=None, date_to=None):
+    """
+    Narrow ``readings`` to the periods overlapping ``date_from``..``date_to``.
+
+    Keeps each register's newest reading before the first period too, as
+    the baseline its first delta is taken against. Those baselines are
+    found with one grouped query, so a short range costs the same however
+    long the history is.
+    """
+    if date_to:
+        end = _local_midnight(next_bucket_start(date_to, bucket))
+        readings = readings.filter(reading_date__lt=end)
+    if date_from:
+        start = _local_midnight(bucket_start(date_from, bucket))
+        baselines = (
+            readings.filter(reading_date__lt=start)
+            .order_by()
+            .values("meter_id", "register_id")
+            .annotate(latest=Max("reading_date"))
+        )
+        kept = Q(reading_date__gte=start)
+        for baseline in baselines:
+            kept |= Q(
+                meter_id=baseline["meter_id"],
+                register_id=baseline["register_id"],
+                reading_date=baseline["latest"],
+            )
+        readings = readings.filter(kept)
+    return readings
+
+
+def _as_date(value):
+    """Normalise a truncated period read through a raw cursor to a date."""
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    if isinstance(value, datetime):
+        return value.date()
+    return value
+
+
+def _bucket(period, register_id, total, count):
+    return {
+        "period": period,
+        "register_id": register_id,
+        "consumption": Decimal(str(total)).quantize(CONSUMPTION_QUANTUM),
+        "readings": count,
+    }
+
+
+def database_consumption(readings, bucket):
+    """Sum LAG() deltas per period and register in the database."""
+    deltas = (
+        readings.order_by()
+        .annotate(
+            period=Trunc("reading_date", bucket, output_field=DateField()),
+            delta=F("reading_value")
+            - Window(
+                Lag("reading_value"),
+                partition_by=[F("meter_id"), F("register_id")],
+                order_by=F("reading_date").asc(),
+            ),
+        )
+        .values_list("period", "register_id", "delta")
+    )
+    # Aggregating over a window needs a derived table, which the ORM
+    # cannot express
+    sql, params = deltas.query.sql_with_params()
+    with connections[readings.db].cursor() as cursor:
+        cursor.execute(
+            "SELECT period, register_id, SUM(delta), COUNT(delta) "
+            f"FROM ({sql}) deltas WHERE delta IS NOT NULL "
+            "GROUP BY period, register_id ORDER BY period, register_id",
+            params,
+        )
+        return [
+            _bucket(_as_date(period), register_id, total, count)
+            for period, register_id, total, count in cursor.fetchall()
+        ]
+
+
+def python_consumption(readings, bucket):
+    """Sum deltas per period and register in a single ordered pass."""
+    rows = (
+        readings.order_by("meter_id", "register_id", "reading_date")
+        .values_list("meter_id", "register_id", "reading_date", "reading_value")
+        .iterator(chunk_size=CONSUMPTION_CHUNK_SIZE)
+    )
+    totals = defaultdict(lambda: [Decimal(0), 0])
+    for (_, register_id), register_rows in groupby(rows, key=lambda row: row[:2]):
+        for (*_, previous), (_, _, reading_date, value) in pairwise(register_rows):
+            period = bucket_start(timezone.localtime(reading_date).date(), bucket)
+            total = totals[period, register_id]
+            total[0] += value - previous
+            total[1] += 1
+    return [
+        _bucket(period, register_id, total, count)
+        for (period, register_id), (total, count) in sorted(totals.items())
+    ]
+
+
+def consumption(readings, bucket="day", date_from=None, date_to=None):
+    """
+    Return consumption per ``bucket`` period and register for ``readings``.
+
+    Each item holds ``period`` (the first day of the period),
+    ``register_id``, ``consumption`` and ``readings``, the number of
+    deltas summed; items are ordered by period, then register. With
+    ``date_from`` or ``date_to``, only the periods overlapping those dates
+    are returned, their deltas still taken against any earlier reading.
+    """
+    readings = bound_readings(readings, bucket, date_from, date_to)
+    if connections[readings.db].features.supports_over_clause:
+        return database_consumption(readings, bucket)
+    return python_consumption(readings, bucket)
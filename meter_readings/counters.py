@@ -0,0 +1,160 @@
+"""
+Maintenance of the denormalised MeterPoint and Meter counters.
+
+The importer adds each flow file's readings to the counters of the
+meters and meter points it touched, using ``F()`` arithmetic so
+concurrent imports never overwrite each other's totals. Anything else
+that changes readings or meters (the admin, repairs) recomputes the
+affected rows from scratch.
+"""
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    DateTimeField,
+    F,
+    Max,
+    Min,
+    OuterRef,
+    PositiveIntegerField,
+    Subquery,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from .models import Meter, MeterPoint, Reading
+from .utils import QUERY_CHUNK_SIZE, chunked
+
+
+def _by_pk(values, output_field):
+    """CASE expression mapping each primary key in ``values`` to its value."""
+    return Case(
+        *[When(pk=pk, then=Value(value)) for pk, value in values.items()],
+        output_field=output_field,
+    )
+
+
+def _add_totals(queryset, totals):
+    """
+    Add {pk: (count, first, last)} totals to the counters of ``queryset``.
+
+    Every column is updated relative to its current value in a single
+    statement, so the row lock taken by the UPDATE is all the
+    coordination concurrent writers need.
+    """
+    counts = _by_pk(
+        {pk: count for pk, (count, _, _) in totals.items()}, PositiveIntegerField()
+    )
+    firsts = _by_pk(
+        {pk: first for pk, (_, first, _) in totals.items()}, DateTimeField()
+    )
+    lasts = _by_pk({pk: last for pk, (_, _, last) in totals.items()}, DateTimeField())
+    queryset.filter(pk__in=list(totals)).update(
+        reading_count=F("reading_count") + counts,
+        # LEAST/GREATEST return NULL on SQLite if either side is NULL
+        first_reading_date=Coalesce(Least("first_reading_date", firsts), firsts),
+        last_reading_date=Coalesce(Greatest("last_reading_date", lasts), lasts),
+    )
+
+
+def add_flow_file_counters(flow_file_id):
+    """
+    Add a newly imported flow file's readings to the counters.
+
+    Returns the number of readings saved for the file.
+    """
+    meter_totals = {}
+    meter_point_totals = {}
+    rows = (
+        Reading.objects.filter(flow_file_id=flow_file_id)
+        .order_by()
+        .values_list("meter_id", "meter__meter_point_id")
+        .annotate(Count("id"), Min("reading_date"), Max("reading_date"))
+    )
+    for meter_id, meter_point_id, count, first, last in rows:
+        meter_totals[meter_id] = (count, first, last)
+        if meter_point_id in meter_point_totals:
+            total, earliest, latest = meter_point_totals[meter_point_id]
+            count, first, last = total + count, min(earliest, first), max(latest, last)
+        meter_point_totals[meter_point_id] = (count, first, last)
+
+    for chunk in chunked(sorted(meter_totals.items()), QUERY_CHUNK_SIZE):
+        _add_totals(Meter.objects.all(), dict(chunk))
+
+    for chunk in chunked(sorted(meter_point_totals.items()), QUERY_CHUNK_SIZE):
+        _add_totals(MeterPoint.objects.all(), dict(chunk))
+        # A separate statement, so it sees meters committed by any writer
+        # this transaction waited on for the row locks above
+        MeterPoint.objects.filter(pk__in=[pk for pk, _ in chunk]).update(
+            meter_count=_meter_point_totals()["meter_count"]
+        )
+
+    return sum(count for count, _, _ in meter_totals.values())
+
+
+def _meter_totals():
+    """Correlated subqueries computing every Meter counter from readings."""
+    readings = Reading.objects.filter(meter=OuterRef("pk")).order_by().values("meter")
+    return {
+        "reading_count": Coalesce(
+            Subquery(readings.annotate(value=Count("id")).values("value")), 0
+        ),
+        "first_reading_date": Subquery(
+            readings.annotate(value=Min("reading_date")).values("value")
+        ),
+        "last_reading_date": Subquery(
+            readings.annotate(value=Max("reading_date")).values("value")
+        ),
+    }
+
+
+def _meter_point_totals():
+    """Correlated subqueries computing every MeterPoint counter from meters."""
+    meters = (
+        Meter.objects.filter(meter_point=OuterRef("pk"))
+        .order_by()
+        .values("meter_point")
+    )
+    return {
+        "meter_count": Coalesce(
+            Subquery(meters.annotate(value=Count("id")).values("value")), 0
+        ),
+        "reading_count": Coalesce(
+            Subquery(meters.annotate(value=Sum("reading_count")).values("value")), 0
+        ),
+        "first_reading_date": Subquery(
+            meters.annotate(value=Min("first_reading_date")).values("value")
+        ),
+        "last_reading_date": Subquery(
+            meters.annotate(value=Max("last_reading_date")).values("value")
+        ),
+    }
+
+
+def refresh_counters(meter_ids=(), meter_point_ids=()):
+    """
+    Recompute the counters of the given meters and meter points.
+
+    The meter points of ``meter_ids`` are recomputed too; ids of rows
+    that no longer exist are ignored.
+    """
+    meter_point_ids = set(meter_point_ids)
+    with transaction.atomic():
+        for chunk in chunked(sorted(meter_ids), QUERY_CHUNK_SIZE):
+            meters = Meter.objects.filter(pk__in=chunk)
+            meters.update(**_meter_totals())
+            meter_point_ids.update(meters.values_list("meter_point_id", flat=True))
+
+        for chunk in chunked(sorted(meter_point_ids), QUERY_CHUNK_SIZE):
+            MeterPoint.objects.filter(pk__in=chunk).update(**_meter_point_totals())
+
+
+def recompute_all_counters():
+    """Recompute every meter and meter point counter from the readings."""
+    with transaction.atomic():
+        meters = Meter.objects.update(**_meter_totals())
+        meter_points = MeterPoint.objects.update(**_meter_point_totals())
+    return meters, meter_points
@@ -0,0 +1,97 @@
+"""
+Cheap whole-table row counts for dashboards and admin pagination.
+
+An exact COUNT(*) is a full scan on PostgreSQL. Large tables there are
+counted from the planner statistics in pg_class instead, which
+autovacuum/ANALYZE keep close to the true figure. Other databases get
+exact counts, cached under the data version kept by
+``meter_readings.caching``, so an import in any process moves every
+process on to fresh counts.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections, router
+from django.utils.functional import cached_property
+
+from .caching import get_data_version
+from .models import FlowFile, Meter, MeterPoint, Reading
+
+# Seconds an exact count stays cached; a new data version replaces it sooner
+COUNT_CACHE_TIMEOUT = 300
+
+COUNTED_MODELS = [FlowFile, MeterPoint, Meter, Reading]
+
+
+def _cache_key(model, version):
+    return f"meter_readings:count:{version}:{model._meta.db_table}"
+
+
+def estimated_count(model):
+    """
+    Return the planner's row estimate for ``model``'s table.
+
+    None when the database keeps no such statistic, or the table has never
+    been analysed.
+    """
+    connection = connections[router.db_for_read(model)]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    # reltuples is -1 before the first ANALYZE on PostgreSQL 14+
+    if row is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def table_count(model):
+    """
+    Return the number of rows in ``model``'s table, cheaply.
+
+    The planner estimate is used when it is at least
+    ``settings.APPROXIMATE_COUNT_THRESHOLD``; otherwise the exact count,
+    which is cached for the current data version.
+    """
+    estimate = estimated_count(model)
+    if estimate is not None and estimate >= settings.APPROXIMATE_COUNT_THRESHOLD:
+        return estimate
+
+    key = _cache_key(model, get_data_version())
+    count = cache.get(key)
+    if count is None:
+        count = model._default_manager.count()
+        cache.set(key, count, COUNT_CACHE_TIMEOUT)
+    return count
+
+
+def invalidate_counts():
+    """
+    Forget this process's cached counts for the current data version.
+
+    For rows changed without ``caching.data_changed``, such as seeded
+    benchmark data; ``data_changed`` reaches every process.
+    """
+    version = get_data_version()
+    cache.delete_many([_cache_key(model, version) for model in COUNTED_MODELS])
+
+
+class ApproximateCountPaginator(Paginator):
+    """
+    Paginator counting an unfiltered queryset with ``table_count``.
+
+    Filtered or searched querysets are still counted exactly, as the
+    table estimate says nothing about them.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is not None and not query.where and not query.distinct:
+            return table_count(self.object_list.model)
+        return super().count
@@ -0,0 +1,139 @@
+"""
+Bulk export of readings as NDJSON or CSV.
+
+Rows are read with ``values_list`` and formatted by hand rather than
+through model instances and DRF serializer fields, which dominate the
+cost of the paginated API at export volumes. Reading dates are written
+in UTC, whatever the API's display timezone.
+"""
+
+import csv
+from json.encoder import encode_basestring_ascii as json_string
+
+from rest_framework.negotiation import BaseContentNegotiation
+
+from .utils import chunked
+
+# Rows fetched per database round trip and formatted per yielded chunk
+EXPORT_CHUNK_SIZE = 5000
+
+# (output column, queryset lookup)
+EXPORT_FIELDS = [
+    ("id", "id"),
+    ("mpan", "meter__meter_point__mpan"),
+    ("meter_serial", "meter__serial_number"),
+    ("meter_type", "meter__meter_type"),
+    ("register_id", "register_id"),
+    ("reading_date", "reading_date"),
+    ("reading_value", "reading_value"),
+    ("reading_type", "reading_type"),
+    ("flow_filename", "flow_file__filename"),
+]
+
+
+def utc_timestamp(value):
+    """Format a UTC datetime from the database as ISO 8601 with a Z suffix."""
+    return value.isoformat().replace("+00:00", "Z")
+
+
+def export_rows(queryset):
+    """Yield export tuples for a Reading queryset, oldest reading first."""
+    return (
+        queryset.order_by("reading_date", "id")
+        .values_list(*[lookup for _, lookup in EXPORT_FIELDS])
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def reading_json(row):
+    """Format one export row as a JSON object."""
+    (
+        pk,
+        mpan,
+        serial,
+        meter_type,
+        register_id,
+        reading_date,
+        reading_value,
+        reading_type,
+        filename,
+    ) = row
+    return (
+        f'{{"id":{pk},"mpan":{json_string(mpan)},'
+        f'"meter_serial":{json_string(serial)},'
+        f'"meter_type":{json_string(meter_type)},'
+        f'"register_id":{json_string(register_id)},'
+        f'"reading_date":"{utc_timestamp(reading_date)}",'
+        f'"reading_value":"{reading_value}",'
+        f'"reading_type":{json_string(reading_type)},'
+        f'"flow_filename":{json_string(filename)}}}'
+    )
+
+
+def iter_ndjson(rows):
+    """Format export rows as newline-delimited JSON, one object per reading."""
+    for batch in chunked(rows, EXPORT_CHUNK_SIZE):
+        yield "".join(reading_json(row) + "\n" for row in batch)
+
+
+class _Echo:
+    """File-like object handing csv.writer output straight back."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    """Format export rows as CSV with a header line."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow([column for column, _ in EXPORT_FIELDS])
+    for batch in chunked(rows, EXPORT_CHUNK_SIZE):
+        yield "".join(
+            writer.writerow(
+                (
+                    pk,
+                    mpan,
+                    serial,
+                    meter_type,
+                    register_id,
+                    utc_timestamp(reading_date),
+                    reading_value,
+                    reading_type,
+                    filename,
+                )
+            )
+            for (
+                pk,
+                mpan,
+                serial,
+                meter_type,
+                register_id,
+                reading_date,
+                reading_value,
+                reading_type,
+                filename,
+            ) in batch
+        )
+
+
+# export format -> (formatter, content type)
+EXPORT_FORMATS = {
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+    "csv": (iter_csv, "text/csv"),
+}
+
+
+class ExportContentNegotiation(BaseContentNegotiation):
+    """
+    Pick the first renderer regardless of the Accept header.
+
+    The export body is chosen by ``export_format``, so a client sending
+    ``Accept: text/csv`` must not be refused with 406; errors still
+    render as JSON.
+    """
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return (renderers[0], renderers[0].media_type)
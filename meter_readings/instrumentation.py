@@ -0,0 +1,72 @@
+"""
+Phase timings and counts for a single flow file import.
+
+An ``ImportMetrics`` travels with the parsed file data, so the parse
+phases are timed wherever the file is parsed (in this process while
+streaming, or in a worker process with ``--workers``) and the database
+phases wherever it is saved. ``import_d0010`` stores the result as the
+file's ImportRun.
+"""
+
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+from django.db import connection
+
+# Phases timed separately, in the order they first happen
+IMPORT_PHASES = ("read", "parse", "resolve", "insert", "finalize")
+
+
+class ImportMetrics:
+    """
+    Seconds spent in each import phase, plus the counts reported with them.
+
+    ``read`` is time spent reading lines from disk, ``parse`` turning them
+    into readings, ``resolve`` finding or creating MeterPoints and Meters,
+    ``insert`` writing readings and ``finalize`` updating counters, latest
+    readings and rollups. ``total`` is the wall time of the import across
+    every process it ran in.
+    """
+
+    def __init__(self):
+        self.started_at = None
+        for phase in IMPORT_PHASES:
+            setattr(self, phase, 0.0)
+        self.total = 0.0
+        self.bytes = 0
+        self.lines = 0
+        self.queries = 0
+
+    @contextmanager
+    def timing(self, phase):
+        """Add the time spent in the ``with`` block to ``phase``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            setattr(self, phase, getattr(self, phase) + time.perf_counter() - start)
+
+    def take(self, readings, count):
+        """
+        Pull up to ``count`` items from the ``readings`` iterator.
+
+        Time spent in the parser's generator counts as parsing, less the
+        time it spent reading from disk meanwhile.
+        """
+        read_before = self.read
+        start = time.perf_counter()
+        chunk = list(islice(readings, count))
+        self.parse += time.perf_counter() - start - (self.read - read_before)
+        return chunk
+
+    @contextmanager
+    def counting_queries(self):
+        """Count the queries run on this thread's connection in the block."""
+
+        def count(execute, sql, params, many, context):
+            self.queries += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            yield
@@ -0,0 +1,116 @@
+"""
+Maintenance of the LatestReading table.
+
+The importer merges each flow file's newest reading per meter register
+into the table with a single INSERT ... SELECT ... ON CONFLICT DO UPDATE,
+which only replaces a row when the incoming reading is newer; concurrent
+imports are serialised by the unique (meter, register_id) index, whose
+entries each merge takes in the same sorted order.
+Anything else that changes readings (the admin, repairs) rebuilds the
+rows of the meters it touched.
+"""
+
+from django.db import connection, transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+from .models import LatestReading, Reading
+from .utils import QUERY_CHUNK_SIZE, chunked
+
+# LatestReading column -> Reading column it is copied from
+LATEST_COLUMNS = {
+    "meter_id": "meter_id",
+    "register_id": "register_id",
+    "reading_id": "id",
+    "reading_date": "reading_date",
+    "reading_value": "reading_value",
+    "reading_type": "reading_type",
+}
+
+
+def newest_readings(readings):
+    """
+    Narrow a Reading queryset to its newest reading per meter register.
+
+    Ranked with a window function rather than a NOT EXISTS self-join: the
+    planner has no statistics for a flow file that was only just
+    imported, and its one-row estimate made the anti-join a nested loop
+    over every pair of the file's readings.
+    """
+    return (
+        readings.annotate(
+            newest=Window(
+                RowNumber(),
+                partition_by=[F("meter_id"), F("register_id")],
+                order_by=F("reading_date").desc(),
+            )
+        )
+        .filter(newest=1)
+        .order_by()
+    )
+
+
+def _merge(readings):
+    """Upsert the newest of ``readings``, keeping any newer existing row."""
+    select = newest_readings(readings).values_list(*LATEST_COLUMNS.values())
+    sql, params = select.query.sql_with_params()
+    qn = connection.ops.quote_name
+    table = qn(LatestReading._meta.db_table)
+    updates = ", ".join(
+        f"{qn(column)} = excluded.{qn(column)}"
+        for column in LATEST_COLUMNS
+        if column not in ("meter_id", "register_id")
+    )
+    # SQLite needs a WHERE clause to parse ON CONFLICT after
+    # INSERT ... SELECT, and the ranked query has none at the top level.
+    # Rows are inserted in (meter, register) order so concurrent merges
+    # lock index entries in the same order and cannot deadlock, as the
+    # counters lock rows in sorted pk order
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({', '.join(map(qn, LATEST_COLUMNS))}) "
+            f"SELECT * FROM ({sql}) newest WHERE 1 = 1 "
+            f"ORDER BY newest.{qn('meter_id')}, newest.{qn('register_id')} "
+            f"ON CONFLICT ({qn('meter_id')}, {qn('register_id')}) "
+            f"DO UPDATE SET {updates} "
+            f"WHERE {table}.{qn('reading_date')} < excluded.{qn('reading_date')}",
+            params,
+        )
+
+
+def update_latest_readings(flow_file_id):
+    """Merge a newly imported flow file's readings into LatestReading."""
+    _merge(Reading.objects.filter(flow_file_id=flow_file_id))
+
+
+def refresh_latest_readings(meter_ids):
+    """Rebuild the LatestReading rows of the given meters from readings."""
+    with transaction.atomic():
+        for chunk in chunked(sorted(meter_ids), QUERY_CHUNK_SIZE):
+            LatestReading.objects.filter(meter_id__in=chunk).delete()
+            _merge(Reading.objects.filter(meter_id__in=chunk))
+
+
+def rebuild_latest_readings():
+    """Rebuild every LatestReading row; returns the number of rows."""
+    with transaction.atomic():
+        LatestReading.objects.all().delete()
+        _merge(Reading.objects.all())
+        return LatestReading.objects.count()
+
+
+def latest_for_mpans(mpans):
+    """
+    Return the LatestReading rows of many MPANs, ordered by MPAN.
+
+    MPANs are looked up ``QUERY_CHUNK_SIZE`` at a time, so any number
+    can be passed.
+    """
+    rows = []
+    for chunk in chunked(sorted(set(mpans)), QUERY_CHUNK_SIZE):
+        rows.extend(
+            LatestReading.objects.filter(meter__meter_point__mpan__in=chunk)
+            .select_related("meter__meter_point")
+            .order_by("meter__meter_point__mpan", "meter__serial_number", "register_id")
+        )
+    return rows
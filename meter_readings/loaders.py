@@ -0,0 +1,281 @@
+"""
+Bulk persistence of parsed D0010 readings.
+
+``ReadingLoader`` works on every database through the ORM. On PostgreSQL
+``CopyReadingLoader`` streams each chunk into a staging table with COPY
+and merges it with set-based INSERT ... SELECT statements instead.
+``reading_loader`` picks one according to ``IMPORT_LOADER``.
+"""
+
+import csv
+from io import StringIO
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.utils import timezone
+
+from .instrumentation import ImportMetrics
+from .models import Meter, MeterPoint, Reading
+from .utils import QUERY_CHUNK_SIZE, chunked
+
+# Rows per INSERT statement when creating readings
+INSERT_BATCH_SIZE = 2000
+
+# IMPORT_LOADER values: the database's fastest loader, or a specific one
+IMPORT_LOADERS = ("auto", "orm", "copy")
+
+# Session temporary table each COPY chunk is staged in
+STAGING_TABLE = "meter_readings_reading_staging"
+
+
+def reading_loader(flow_file, metrics=None):
+    """
+    Return the loader for ``flow_file`` on the default database.
+
+    ``IMPORT_LOADER`` "auto" uses COPY on PostgreSQL and the ORM elsewhere.
+    """
+    choice = settings.IMPORT_LOADER
+    if choice not in IMPORT_LOADERS:
+        raise ImproperlyConfigured(
+            f"IMPORT_LOADER must be one of {', '.join(IMPORT_LOADERS)}"
+        )
+    if choice == "copy" or (choice == "auto" and connection.vendor == "postgresql"):
+        if connection.vendor != "postgresql":
+            raise ImproperlyConfigured("IMPORT_LOADER=copy needs PostgreSQL")
+        return CopyReadingLoader(flow_file, metrics=metrics)
+    return ReadingLoader(flow_file, metrics=metrics)
+
+
+class ReadingLoader:
+    """
+    Saves parsed readings for one FlowFile using set-based queries.
+
+    MeterPoints and Meters are resolved once per distinct MPAN and
+    (MPAN, serial) pair, creating any missing rows with ``bulk_create``,
+    and cached for the lifetime of the loader so readings can be fed in
+    several chunks. Readings are inserted in batches; rows clashing with
+    the (meter, register_id, reading_date) unique constraint are ignored
+    by the database, so the first occurrence wins exactly as it did with
+    ``get_or_create``.
+
+    Meters are only looked up before creating them under MeterPoints that
+    already existed; a MeterPoint created by this loader has none yet.
+    Time spent resolving and inserting is added to ``metrics``.
+    """
+
+    def __init__(self, flow_file, batch_size=INSERT_BATCH_SIZE, metrics=None):
+        self.flow_file = flow_file
+        self.batch_size = batch_size
+        self.metrics = metrics if metrics is not None else ImportMetrics()
+        self.meter_point_ids = {}
+        self.meter_ids = {}
+        self.created_meter_point_ids = set()
+
+    def load(self, readings):
+        """Save a chunk of ParsedReading records."""
+        with self.metrics.timing("resolve"):
+            self.resolve_meter_points({reading.mpan for reading in readings})
+
+            new_meters = {}
+            for reading in readings:
+                key = (reading.mpan, reading.meter_serial)
+                if key not in self.meter_ids and key not in new_meters:
+                    new_meters[key] = reading.meter_type
+            self.resolve_meters(new_meters)
+
+        with self.metrics.timing("insert"):
+            Reading.objects.bulk_create(
+                [
+                    Reading(
+                        meter_id=self.meter_ids[(reading.mpan, reading.meter_serial)],
+                        flow_file_id=self.flow_file.pk,
+                        register_id=reading.register_id,
+                        reading_date=reading.reading_date,
+                        reading_value=reading.reading_value,
+                        reading_type=reading.reading_type,
+                    )
+                    for reading in readings
+                ],
+                batch_size=self.batch_size,
+                ignore_conflicts=True,
+            )
+
+    def resolve_meter_points(self, mpans):
+        """Populate ``meter_point_ids`` for the given MPANs, creating missing ones."""
+        missing = sorted(mpan for mpan in mpans if mpan not in self.meter_point_ids)
+        if not missing:
+            return
+
+        self._fetch_meter_points(missing)
+        to_create = [mpan for mpan in missing if mpan not in self.meter_point_ids]
+        if to_create:
+            MeterPoint.objects.bulk_create(
+                [MeterPoint(mpan=mpan) for mpan in to_create],
+                batch_size=self.batch_size,
+                ignore_conflicts=True,
+            )
+            self._fetch_meter_points(to_create)
+            self.created_meter_point_ids.update(
+                self.meter_point_ids[mpan] for mpan in to_create
+            )
+
+    def resolve_meters(self, meter_types):
+        """
+        Populate ``meter_ids`` for the given {(mpan, serial): meter_type} pairs.
+
+        Existing meters keep their stored type; new meters take the type
+        from the first 028 record they appeared under.
+        """
+        if not meter_types:
+            return
+
+        meter_point_ids = {self.meter_point_ids[mpan] for mpan, _ in meter_types}
+        self._fetch_meters(meter_point_ids - self.created_meter_point_ids)
+
+        to_create = [
+            Meter(
+                meter_point_id=self.meter_point_ids[mpan],
+                serial_number=serial,
+                meter_type=meter_type,
+            )
+            for (mpan, serial), meter_type in meter_types.items()
+            if (mpan, serial) not in self.meter_ids
+        ]
+        if to_create:
+            Meter.objects.bulk_create(
+                to_create, batch_size=self.batch_size, ignore_conflicts=True
+            )
+            self._fetch_meters({meter.meter_point_id for meter in to_create})
+
+    def _fetch_meter_points(self, mpans):
+        for chunk in chunked(mpans, QUERY_CHUNK_SIZE):
+            self.meter_point_ids.update(
+                MeterPoint.objects.filter(mpan__in=chunk).values_list("mpan", "id")
+            )
+
+    def _fetch_meters(self, meter_point_ids):
+        for chunk in chunked(sorted(meter_point_ids), QUERY_CHUNK_SIZE):
+            rows = Meter.objects.filter(meter_point_id__in=chunk).values_list(
+                "meter_point__mpan", "serial_number", "id"
+            )
+            for mpan, serial, meter_id in rows:
+                self.meter_ids[(mpan, serial)] = meter_id
+
+
+class CopyReadingLoader:
+    """
+    Saves parsed readings for one FlowFile with PostgreSQL COPY.
+
+    Each chunk is copied into a session temporary staging table, then
+    missing MeterPoints and Meters are created and readings merged with
+    one INSERT ... SELECT ... ON CONFLICT DO NOTHING each. Rows keep
+    their position in the file, so a repeated reading and a new meter's
+    type come from the first occurrence, as with ``ReadingLoader``.
+    """
+
+    def __init__(self, flow_file, metrics=None):
+        self.flow_file = flow_file
+        self.metrics = metrics if metrics is not None else ImportMetrics()
+        self.position = 0
+        self.staging_ready = False
+
+    def load(self, readings):
+        """Save a chunk of ParsedReading records."""
+        with connection.cursor() as cursor:
+            with self.metrics.timing("insert"):
+                self._stage(cursor, readings)
+            with self.metrics.timing("resolve"):
+                self._create_meter_points(cursor)
+                self._create_meters(cursor)
+            with self.metrics.timing("insert"):
+                self._merge_readings(cursor)
+
+    def _stage(self, cursor, readings):
+        if not self.staging_ready:
+            cursor.execute(
+                f"CREATE TEMPORARY TABLE IF NOT EXISTS {STAGING_TABLE} ("
+                "position bigint NOT NULL, mpan text NOT NULL, "
+                "serial_number text NOT NULL, meter_type text NOT NULL, "
+                "register_id text NOT NULL, reading_date timestamptz NOT NULL, "
+                "reading_value numeric NOT NULL, reading_type text NOT NULL)"
+            )
+            self.staging_ready = True
+        cursor.execute(f"TRUNCATE {STAGING_TABLE}")
+
+        data = StringIO()
+        writer = csv.writer(data, lineterminator="\n")
+        for position, reading in enumerate(readings, self.position):
+            writer.writerow(
+                (
+                    position,
+                    reading.mpan,
+                    reading.meter_serial,
+                    reading.meter_type,
+                    reading.register_id,
+                    reading.reading_date.isoformat(),
+                    reading.reading_value,
+                    reading.reading_type,
+                )
+            )
+        self.position += len(readings)
+        data.seek(0)
+        cursor.copy_expert(f"COPY {STAGING_TABLE} FROM STDIN WITH (FORMAT csv)", data)
+        # COPY bypasses execute wrappers
+        self.metrics.queries += 1
+
+    def _create_meter_points(self, cursor):
+        qn = connection.ops.quote_name
+        table = qn(MeterPoint._meta.db_table)
+        now = timezone.now()
+        cursor.execute(
+            f"INSERT INTO {table} ({qn('mpan')}, {qn('meter_count')}, "
+            f"{qn('reading_count')}, {qn('created_at')}, {qn('updated_at')}) "
+            f"SELECT DISTINCT staged.mpan, 0, 0, %s, %s FROM {STAGING_TABLE} staged "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {table} existing "
+            f"WHERE existing.{qn('mpan')} = staged.mpan) "
+            "ORDER BY staged.mpan ON CONFLICT DO NOTHING",
+            [now, now],
+        )
+
+    def _create_meters(self, cursor):
+        qn = connection.ops.quote_name
+        table = qn(Meter._meta.db_table)
+        meter_points = qn(MeterPoint._meta.db_table)
+        now = timezone.now()
+        cursor.execute(
+            f"INSERT INTO {table} ({qn('meter_point_id')}, {qn('serial_number')}, "
+            f"{qn('meter_type')}, {qn('reading_count')}, {qn('created_at')}, "
+            f"{qn('updated_at')}) "
+            f"SELECT mp.{qn('id')}, staged.serial_number, staged.meter_type, 0, %s, %s "
+            "FROM (SELECT DISTINCT ON (mpan, serial_number) mpan, serial_number, "
+            f"meter_type FROM {STAGING_TABLE} "
+            "ORDER BY mpan, serial_number, position) staged "
+            f"JOIN {meter_points} mp ON mp.{qn('mpan')} = staged.mpan "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {table} existing "
+            f"WHERE existing.{qn('meter_point_id')} = mp.{qn('id')} "
+            f"AND existing.{qn('serial_number')} = staged.serial_number) "
+            f"ORDER BY mp.{qn('id')}, staged.serial_number ON CONFLICT DO NOTHING",
+            [now, now],
+        )
+
+    def _merge_readings(self, cursor):
+        qn = connection.ops.quote_name
+        table = qn(Reading._meta.db_table)
+        meters = qn(Meter._meta.db_table)
+        meter_points = qn(MeterPoint._meta.db_table)
+        cursor.execute(
+            f"INSERT INTO {table} ({qn('meter_id')}, {qn('flow_file_id')}, "
+            f"{qn('register_id')}, {qn('reading_date')}, {qn('reading_value')}, "
+            f"{qn('reading_type')}, {qn('created_at')}) "
+            f"SELECT DISTINCT ON (m.{qn('id')}, staged.register_id, "
+            f"staged.reading_date) m.{qn('id')}, %s, staged.register_id, "
+            "staged.reading_date, staged.reading_value, staged.reading_type, %s "
+            f"FROM {STAGING_TABLE} staged "
+            f"JOIN {meter_points} mp ON mp.{qn('mpan')} = staged.mpan "
+            f"JOIN {meters} m ON m.{qn('meter_point_id')} = mp.{qn('id')} "
+            f"AND m.{qn('serial_number')} = staged.serial_number "
+            f"ORDER BY m.{qn('id')}, staged.register_id, staged.reading_date, "
+            "staged.position ON CONFLICT DO NOTHING",
+            [self.flow_file.pk, timezone.now()],
+        )
@@ -0,0 +1,276 @@
+"""Django management command to benchmark API latency over a large database."""
+
+import json
+import math
+import time
+from datetime import timedelta
+from functools import partial
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.settings import api_settings
+
+from meter_readings.benchmarking import (
+    SEED_FIRST_MPAN,
+    SEED_START,
+    benchmark_client,
+    seed_database,
+    throwaway_database,
+    write_report,
+)
+from meter_readings.models import Meter, MeterPoint
+
+
+def default_scenarios(readings, meters):
+    """Return (name, method, url, params) for every endpoint and filter."""
+    meter_point = MeterPoint.objects.order_by("pk").first()
+    meter = Meter.objects.order_by("pk").first()
+    mpan = meter_point.mpan
+    middle = SEED_START + timedelta(hours=6 * (readings // meters) // 2)
+    date_from = middle.date().isoformat()
+    date_to = (middle + timedelta(days=7)).date().isoformat()
+    deep_page = max(readings * 9 // 10 // api_settings.PAGE_SIZE, 1)
+    deep_meter_page = max(meters * 9 // 10 // api_settings.PAGE_SIZE, 1)
+    return [
+        ("readings", "get", "/api/readings/", {}),
+        ("readings mpan", "get", "/api/readings/", {"mpan": mpan}),
+        (
+            "readings date range",
+            "get",
+            "/api/readings/",
+            {"date_from": date_from, "date_to": date_to},
+        ),
+        ("readings search", "get", "/api/readings/", {"search": mpan}),
+        (
+            "readings ordering",
+            "get",
+            "/api/readings/",
+            {"ordering": "-reading_value"},
+        ),
+        ("readings deep page", "get", "/api/readings/", {"page": deep_page}),
+        (
+            "readings cursor",
+            "get",
+            "/api/readings/",
+            {"pagination": "cursor", "date_from": date_from},
+        ),
+        ("readings summary", "get", "/api/readings/summary/", {}),
+        (
+            "readings summary mpan",
+            "get",
+            "/api/readings/summary/",
+            {"mpan": mpan},
+        ),
+        (
+            "readings batch",
+            "post",
+            "/api/readings/batch/",
+            {"mpans": [str(SEED_FIRST_MPAN + i) for i in range(min(meters, 100))]},
+        ),
+        ("meter points", "get", "/api/meter-points/", {}),
+        ("meter points search", "get", "/api/meter-points/", {"search": mpan[:9]}),
+        (
+            "meter points ordering",
+            "get",
+            "/api/meter-points/",
+            {"ordering": "-reading_count"},
+        ),
+        (
+            "meter points deep page",
+            "get",
+            "/api/meter-points/",
+            {"page": deep_meter_page},
+        ),
+        ("meter point", "get", f"/api/meter-points/{meter_point.pk}/", {}),
+        (
+            "meter point readings",
+            "get",
+            f"/api/meter-points/{meter_point.pk}/readings/",
+            {},
+        ),
+        ("meters", "get", "/api/meters/", {}),
+        ("meters type", "get", "/api/meters/", {"meter_type": "C"}),
+        ("meters search", "get", "/api/meters/", {"search": meter.serial_number}),
+        ("meter", "get", f"/api/meters/{meter.pk}/", {}),
+        ("meter readings", "get", f"/api/meters/{meter.pk}/readings/", {}),
+        (
+            "meter consumption",
+            "get",
+            f"/api/meters/{meter.pk}/consumption/",
+            {"bucket": "month"},
+        ),
+        ("latest readings", "get", "/api/latest-readings/", {"mpan": mpan}),
+    ]
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def run_scenario(client, method, url, params, iterations):
+    """Time ``iterations`` requests after a warm-up; latencies in ms."""
+    if method == "post":
+        send = partial(client.post, url, params, format="json")
+    else:
+        send = partial(client.get, url, params)
+
+    def request():
+        # A streamed body runs its queries as it is read
+        response = send()
+        if response.streaming:
+            for _ in response.streaming_content:
+                pass
+        return response
+
+    response = request()
+    if response.status_code != 200:
+        raise CommandError(f"{method.upper()} {url} returned {response.status_code}")
+
+    latencies = []
+    queries = 0
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            request()
+            latencies.append((time.perf_counter() - start) * 1000)
+        queries = max(queries, len(captured))
+    return {
+        "p50_ms": round(percentile(latencies, 0.5), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "queries": queries,
+    }
+
+
+def run_scenarios(scenarios, iterations):
+    """Run every scenario through the benchmark client."""
+    results = {}
+    with benchmark_client() as client:
+        for name, method, url, params in scenarios:
+            results[name] = run_scenario(client, method, url, params, iterations)
+    return results
+
+
+def find_regressions(results, baseline, max_regression, max_p95_ms=None):
+    """
+    Compare ``results`` against a previous report's results.
+
+    A scenario regresses when its p95 grows by more than ``max_regression``
+    (a fraction) over the baseline, when it issues more queries than the
+    baseline, or when its p95 exceeds ``max_p95_ms``.
+    """
+    regressions = []
+    for name, result in results.items():
+        if max_p95_ms is not None and result["p95_ms"] > max_p95_ms:
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']}ms over the {max_p95_ms}ms limit"
+            )
+        before = baseline.get(name)
+        if before is None:
+            continue
+        limit = before["p95_ms"] * (1 + max_regression)
+        if result["p95_ms"] > limit:
+            regressions.append(
+                f"{name}: p95 {result['p95_ms']}ms, baseline {before['p95_ms']}ms"
+            )
+        if result["queries"] > before["queries"]:
+            regressions.append(
+                f"{name}: {result['queries']} queries, baseline {before['queries']}"
+            )
+    return regressions
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database with bulk-inserted readings and time "
+        "every API endpoint and filter, reporting p50/p95 latency and query "
+        "counts as JSON. Fails on regressions against a --baseline report."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--readings",
+            type=int,
+            default=1000000,
+            help="Readings to seed (default: 1000000)",
+        )
+        parser.add_argument(
+            "--meters",
+            type=int,
+            default=10000,
+            help="MPANs to seed, one meter each (default: 10000)",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Timed requests per scenario (default: 20)",
+        )
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            help="Only run scenarios whose name contains this (repeatable)",
+        )
+        parser.add_argument(
+            "--baseline", type=str, help="Previous JSON report to compare against"
+        )
+        parser.add_argument(
+            "--max-regression",
+            type=float,
+            default=0.25,
+            help="Allowed p95 growth over the baseline, as a fraction (default: 0.25)",
+        )
+        parser.add_argument(
+            "--max-p95-ms", type=float, help="Fail any scenario slower than this at p95"
+        )
+        parser.add_argument("--output", type=str, help="File to write the JSON to")
+
+    def handle(self, *args, **options):
+        if options["meters"] < 1 or options["readings"] < options["meters"]:
+            raise CommandError("--readings must be at least --meters, and both >= 1")
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be at least 1")
+
+        baseline = {}
+        if options["baseline"]:
+            try:
+                baseline = json.loads(Path(options["baseline"]).read_text())["results"]
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"Cannot read baseline {options['baseline']}: {e}")
+
+        with throwaway_database():
+            start = time.perf_counter()
+            readings = seed_database(options["readings"], options["meters"])
+            self.stderr.write(
+                f"Seeded {readings} readings on {connection.vendor} "
+                f"in {time.perf_counter() - start:.1f}s"
+            )
+            scenarios = default_scenarios(readings, options["meters"])
+            if options["scenario"]:
+                scenarios = [
+                    scenario
+                    for scenario in scenarios
+                    if any(part in scenario[0] for part in options["scenario"])
+                ]
+            results = run_scenarios(scenarios, options["iterations"])
+
+        write_report(
+            self,
+            {
+                "database": connection.vendor,
+                "readings": readings,
+                "meters": options["meters"],
+                "iterations": options["iterations"],
+                "results": results,
+            },
+            options["output"],
+        )
+
+        regressions = find_regressions(
+            results, baseline, options["max_regression"], options["max_p95_ms"]
+        )
+        if regressions:
+            raise CommandError("API latency regressions:\n" + "\n".join(regressions))
@@ -0,0 +1,90 @@
+"""Django management command to benchmark the batch MPAN lookup."""
+
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from meter_readings.benchmarking import (
+    benchmark_client,
+    seed_database,
+    throwaway_database,
+    write_report,
+)
+from meter_readings.models import MeterPoint
+
+
+def per_mpan(client, mpans):
+    """Fetch every MPAN's readings with paginated ``?mpan=`` requests."""
+    rows = 0
+    for mpan in mpans:
+        url = f"/api/readings/?mpan={mpan}"
+        while url:
+            data = client.get(url).json()
+            rows += len(data["results"])
+            url = data["next"]
+    return rows
+
+
+def batch(client, mpans):
+    """Fetch every MPAN's readings with one POST to the batch lookup."""
+    response = client.post("/api/readings/batch/", {"mpans": mpans}, format="json")
+    lines = b"".join(response.streaming_content).splitlines()
+    return sum(len(json.loads(line)["readings"]) for line in lines)
+
+
+def compare_lookups(client, mpans):
+    """Time ``per_mpan`` against ``batch``; returns {name: rows and seconds}."""
+    results = {}
+    for name, run in (("per_mpan", per_mpan), ("batch", batch)):
+        start = time.perf_counter()
+        rows = run(client, mpans)
+        results[name] = {
+            "rows": rows,
+            "seconds": round(time.perf_counter() - start, 4),
+        }
+    return results
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and time fetching every MPAN's "
+        "readings one GET /api/readings/?mpan= at a time against a single "
+        "POST to /api/readings/batch/, reporting JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--mpans", type=int, default=5000, help="MPANs to seed (default: 5000)"
+        )
+        parser.add_argument(
+            "--readings-per-mpan",
+            type=int,
+            default=4,
+            help="Readings seeded per MPAN (default: 4)",
+        )
+        parser.add_argument("--output", type=str, help="File to write the JSON to")
+
+    def handle(self, *args, **options):
+        if options["mpans"] < 1 or options["readings_per_mpan"] < 1:
+            raise CommandError("--mpans and --readings-per-mpan must be >= 1")
+
+        with throwaway_database():
+            readings = seed_database(
+                options["mpans"] * options["readings_per_mpan"], options["mpans"]
+            )
+            mpans = list(MeterPoint.objects.values_list("mpan", flat=True))
+            with benchmark_client() as client:
+                results = compare_lookups(client, mpans)
+
+        write_report(
+            self,
+            {
+                "database": connection.vendor,
+                "mpans": options["mpans"],
+                "readings": readings,
+                "results": results,
+            },
+            options["output"],
+        )
@@ -0,0 +1,92 @@
+"""Django management command to benchmark the bulk readings export."""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from meter_readings.benchmarking import (
+    benchmark_client,
+    seed_database,
+    throwaway_database,
+    write_report,
+)
+
+
+def paged(client):
+    """Walk the paginated readings list page by page."""
+    rows = 0
+    url = "/api/readings/"
+    while url:
+        data = client.get(url).json()
+        rows += len(data["results"])
+        url = data["next"]
+    return rows
+
+
+def exported(client, export_format):
+    """Stream every reading from the export endpoint."""
+    response = client.get("/api/readings/export/", {"export_format": export_format})
+    lines = b"".join(response.streaming_content).count(b"\n")
+    return lines - 1 if export_format == "csv" else lines
+
+
+def compare_exports(client):
+    """Time paging against NDJSON and CSV export; returns {name: throughput}."""
+    results = {}
+    for name, run in (
+        ("paginated", paged),
+        ("ndjson", lambda client: exported(client, "ndjson")),
+        ("csv", lambda client: exported(client, "csv")),
+    ):
+        start = time.perf_counter()
+        rows = run(client)
+        seconds = time.perf_counter() - start
+        results[name] = {
+            "rows": rows,
+            "seconds": round(seconds, 4),
+            "rows_per_sec": round(rows / seconds) if seconds else None,
+        }
+    return results
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database and report rows/sec for walking the "
+        "paginated /api/readings/ list against streaming the same rows from "
+        "/api/readings/export/ as NDJSON and CSV, as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--readings",
+            type=int,
+            default=50000,
+            help="Readings to seed (default: 50000)",
+        )
+        parser.add_argument(
+            "--meters",
+            type=int,
+            default=100,
+            help="MPANs to seed, one meter each (default: 100)",
+        )
+        parser.add_argument("--output", type=str, help="File to write the JSON to")
+
+    def handle(self, *args, **options):
+        if options["meters"] < 1 or options["readings"] < options["meters"]:
+            raise CommandError("--readings must be at least --meters, and both >= 1")
+
+        with throwaway_database():
+            readings = seed_database(options["readings"], options["meters"])
+            with benchmark_client() as client:
+                results = compare_exports(client)
+
+        write_report(
+            self,
+            {
+                "database": connection.vendor,
+                "readings": readings,
+                "results": results,
+            },
+            options["output"],
+        )
@@ -0,0 +1,145 @@
+"""Django management command to benchmark import_d0010 and report JSON."""
+
+import platform
+import resource
+import sys
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+import django
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from meter_readings.benchmarking import throwaway_database, write_report
+from meter_readings.instrumentation import IMPORT_PHASES
+from meter_readings.management.commands.import_d0010 import Command as ImportCommand
+from meter_readings.management.commands.import_d0010 import file_content_hash
+from meter_readings.models import ImportRun
+from meter_readings.utils import clear_all_data
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process so far, in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def timed(run):
+    """Run ``run()``, which returns a row count, and measure it."""
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        rows = run()
+        seconds = time.perf_counter() - start
+    return {
+        "rows": rows,
+        "seconds": round(seconds, 4),
+        "rows_per_sec": round(rows / seconds) if seconds else None,
+        "queries": len(queries),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def benchmark_file(path):
+    """
+    Time parsing, saving and a full import of one D0010 file.
+
+    ``parse`` reads the whole file without touching the database, ``save``
+    writes the already-parsed readings, and ``total`` runs import_d0010's
+    streaming import end to end. Imported data is cleared after each
+    write, so this must only run against a database that can be thrown
+    away. Peak RSS is the process high-water mark after each phase.
+    ``total`` also carries the phase seconds from the import's ImportRun.
+    """
+    importer = ImportCommand(stdout=StringIO())
+    parsed = {}
+
+    def parse():
+        parsed.update(importer.parse_d0010_file(str(path)))
+        parsed["readings"] = list(parsed["readings"])
+        return len(parsed["readings"])
+
+    def save():
+        parsed["content_hash"] = file_content_hash(path)
+        with transaction.atomic():
+            return importer.save_file_data(parsed, path.name)
+
+    result = {"file": str(path), "bytes": path.stat().st_size}
+    result["parse"] = timed(parse)
+    result["save"] = timed(save)
+    clear_all_data()
+    result["total"] = timed(lambda: importer.import_file(str(path)))
+    run = ImportRun.objects.get(flow_file__filename=path.name)
+    result["total"]["phases"] = {
+        phase: round(getattr(run, f"{phase}_seconds"), 4) for phase in IMPORT_PHASES
+    }
+    clear_all_data()
+    return result
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark import_d0010 on D0010 files in a throwaway test database, "
+        "reporting parse, save and total rows/sec, peak RSS and query counts "
+        "as JSON. Generates a synthetic file when no files are given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="*", type=str, help="D0010 files to time")
+        parser.add_argument(
+            "--mpans",
+            type=int,
+            default=1000,
+            help="MPANs in the generated file (default: 1000)",
+        )
+        parser.add_argument(
+            "--readings",
+            type=int,
+            default=30,
+            help="Readings per register in the generated file (default: 30)",
+        )
+        parser.add_argument(
+            "--seed", type=int, default=0, help="Seed for the generated file"
+        )
+        parser.add_argument("--output", type=str, help="File to write the JSON to")
+
+    def handle(self, *args, **options):
+        paths = [Path(file) for file in options["files"]]
+        for path in paths:
+            if not path.exists():
+                raise CommandError(f"File not found: {path}")
+
+        with tempfile.TemporaryDirectory() as directory:
+            if not paths:
+                call_command(
+                    "generate_d0010",
+                    directory,
+                    mpans=options["mpans"],
+                    readings=options["readings"],
+                    seed=options["seed"],
+                    stdout=self.stderr,
+                )
+                paths = sorted(Path(directory).glob("*.uff"))
+
+            with throwaway_database():
+                results = []
+                for path in paths:
+                    try:
+                        results.append(benchmark_file(path))
+                    except CommandError as e:
+                        results.append({"file": str(path), "error": str(e)})
+
+        write_report(
+            self,
+            {
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "files": results,
+            },
+            options["output"],
+        )
@@ -0,0 +1,145 @@
+"""Django management command to benchmark 030 reading parsing."""
+
+import gc
+import tempfile
+import timeit
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from meter_readings.benchmarking import SEED_FIRST_MPAN, write_report
+from meter_readings.management.commands.import_d0010 import LONDON_TZ
+from meter_readings.management.commands.import_d0010 import Command as ImportCommand
+from meter_readings.management.commands.import_d0010 import decode_reading_date
+from meter_readings.synthetic import write_d0010
+
+
+def strptime_localize(date_str):
+    """The strptime + LONDON_TZ.localize pair decode_reading_date replaced."""
+    return LONDON_TZ.localize(datetime.strptime(date_str, "%Y%m%d%H%M%S"))
+
+
+def benchmark_date_decoding(repeat):
+    """
+    Time decode_reading_date against strptime_localize over half-hourly
+    timestamps spanning a year, so both BST change days are included.
+    """
+    start = datetime(2024, 1, 1)
+    timestamps = [
+        (start + timedelta(minutes=30 * i)).strftime("%Y%m%d%H%M%S")
+        for i in range(366 * 48)
+    ]
+    results = {"timestamps": len(timestamps)}
+    for name, decode in (
+        ("strptime_localize", strptime_localize),
+        ("decode_reading_date", decode_reading_date),
+    ):
+        best = min(
+            timeit.repeat(
+                lambda: [decode(ts) for ts in timestamps], number=1, repeat=repeat
+            )
+        )
+        results[f"{name}_us"] = round(best / len(timestamps) * 1e6, 3)
+    results["speedup"] = round(
+        results["strptime_localize_us"] / results["decode_reading_date_us"], 2
+    )
+    return results
+
+
+class DictImportCommand(ImportCommand):
+    """Parser variant returning the previous dict-per-reading representation."""
+
+    def parse_reading_record(self, parts, mpan, meter_serial, meter_type):
+        record = super().parse_reading_record(parts, mpan, meter_serial, meter_type)
+        return {
+            "mpan": mpan,
+            "meter_serial": meter_serial,
+            "meter_type": meter_type,
+            "register_id": parts[1].strip(),
+            "reading_date": record.reading_date,
+            "reading_value": record.reading_value,
+            "reading_type": "ACTUAL",
+        }
+
+
+def retained_bytes(command, path):
+    """Parse ``path`` and return (readings, bytes retained holding them)."""
+    gc.collect()
+    tracemalloc.start()
+    readings = list(command.parse_d0010_file(str(path))["readings"])
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(readings), current
+
+
+def benchmark_reading_memory(path):
+    """
+    Compare the bytes retained per reading when a parsed file is held as
+    ParsedReading records against the 7-key dicts the parser used to return.
+    """
+    results = {}
+    for name, command in (("dict", DictImportCommand()), ("slots", ImportCommand())):
+        count, retained = retained_bytes(command, path)
+        results["readings"] = count
+        results[f"{name}_bytes_per_reading"] = round(retained / count, 1)
+    results["saving"] = round(
+        1 - results["slots_bytes_per_reading"] / results["dict_bytes_per_reading"], 3
+    )
+    return results
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark 030 reading parsing without a database: decode_reading_date "
+        "against strptime, and the memory held per parsed reading as slotted "
+        "records against dicts, reporting JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=5,
+            help="Timing runs for date decoding, best kept (default: 5)",
+        )
+        parser.add_argument(
+            "--mpans",
+            type=int,
+            default=2000,
+            help="MPANs in the generated file (default: 2000)",
+        )
+        parser.add_argument(
+            "--readings",
+            type=int,
+            default=50,
+            help="Readings per register in the generated file (default: 50)",
+        )
+        parser.add_argument("--output", type=str, help="File to write the JSON to")
+
+    def handle(self, *args, **options):
+        if min(options["repeat"], options["mpans"], options["readings"]) < 1:
+            raise CommandError("--repeat, --mpans and --readings must be >= 1")
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "benchmark.uff"
+            with path.open("w", encoding="utf-8") as file:
+                write_d0010(
+                    file,
+                    file_reference="0000000001",
+                    first_mpan=SEED_FIRST_MPAN,
+                    mpans=options["mpans"],
+                    readings=options["readings"],
+                )
+            memory = benchmark_reading_memory(path)
+
+        write_report(
+            self,
+            {
+                "date_decoding": benchmark_date_decoding(options["repeat"]),
+                "reading_memory": memory,
+            },
+            options["output"],
+        )
@@ -0,0 +1,56 @@
+"""Django management command to export readings as NDJSON or CSV."""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from meter_readings.exports import EXPORT_FORMATS, export_rows
+from meter_readings.models import Reading
+from meter_readings.utils import date_filter_errors, filter_readings
+
+
+class Command(BaseCommand):
+    help = (
+        "Export readings as NDJSON or CSV, filtered like the readings API. "
+        "Writes to stdout unless --output is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mpan", type=str, help="Only readings for this MPAN")
+        parser.add_argument(
+            "--meter-serial", type=str, help="Only readings for this meter serial"
+        )
+        parser.add_argument(
+            "--date-from", type=str, help="Readings from this date onwards"
+        )
+        parser.add_argument("--date-to", type=str, help="Readings up to this date")
+        parser.add_argument(
+            "--format",
+            choices=list(EXPORT_FORMATS),
+            default="ndjson",
+            help="Output format (default: ndjson)",
+        )
+        parser.add_argument("--output", type=str, help="File to write the export to")
+
+    def handle(self, *args, **options):
+        errors = date_filter_errors(options)
+        if errors:
+            raise CommandError(
+                "; ".join(
+                    f"--{param.replace('_', '-')}: {message}"
+                    for param, message in errors.items()
+                )
+            )
+        readings = filter_readings(Reading.objects.all(), options)
+        formatter, _ = EXPORT_FORMATS[options["format"]]
+        chunks = formatter(export_rows(readings))
+
+        if not options["output"]:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        with open(options["output"], "w", encoding="utf-8", newline="") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        self.stderr.write(
+            self.style.SUCCESS(f"Exported readings to {options['output']}")
+        )
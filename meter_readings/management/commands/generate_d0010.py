@@ -0,0 +1,122 @@
+"""Django management command to generate synthetic D0010 files for load tests."""
+
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from meter_readings.synthetic import SYNTHETIC_REGISTERS, write_d0010
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate seeded synthetic D0010 files of any size, with clock change "
+        "timestamps, repeated readings and renamed resends, for import benchmarks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", type=str, help="Directory to write files to")
+        parser.add_argument(
+            "--files", type=int, default=1, help="Number of files (default: 1)"
+        )
+        parser.add_argument(
+            "--mpans", type=int, default=1000, help="MPANs per file (default: 1000)"
+        )
+        parser.add_argument(
+            "--meters-per-mpan",
+            type=int,
+            default=1,
+            help="Meters per MPAN (default: 1)",
+        )
+        parser.add_argument(
+            "--registers",
+            type=int,
+            default=2,
+            help=f"Registers per meter, 1-{len(SYNTHETIC_REGISTERS)} (default: 2)",
+        )
+        parser.add_argument(
+            "--readings",
+            type=int,
+            default=30,
+            help="Interval readings per register (default: 30)",
+        )
+        parser.add_argument(
+            "--start",
+            type=str,
+            default="2024-03-01",
+            help="Local date of the first reading (default: 2024-03-01)",
+        )
+        parser.add_argument(
+            "--interval-hours",
+            type=int,
+            default=24,
+            help="Hours between readings (default: 24)",
+        )
+        parser.add_argument(
+            "--no-dst",
+            action="store_true",
+            help="Leave out the readings around BST clock changes",
+        )
+        parser.add_argument(
+            "--duplicate-rate",
+            type=float,
+            default=0.0,
+            help="Chance each reading line is repeated, 0-1 (default: 0)",
+        )
+        parser.add_argument(
+            "--resends",
+            type=int,
+            default=0,
+            help="Renamed copies of the first files to write (default: 0)",
+        )
+        parser.add_argument("--seed", type=int, default=0, help="Random seed")
+
+    def handle(self, *args, **options):
+        if not 1 <= options["registers"] <= len(SYNTHETIC_REGISTERS):
+            raise CommandError(
+                f"--registers must be between 1 and {len(SYNTHETIC_REGISTERS)}"
+            )
+        if not 0 <= options["duplicate_rate"] <= 1:
+            raise CommandError("--duplicate-rate must be between 0 and 1")
+        for option in ("files", "mpans", "meters_per_mpan", "readings"):
+            if options[option] < 1:
+                raise CommandError(f"--{option.replace('_', '-')} must be at least 1")
+        try:
+            start = datetime.strptime(options["start"], "%Y-%m-%d")
+        except ValueError:
+            raise CommandError("--start must be a date (YYYY-MM-DD)")
+
+        output = Path(options["output"])
+        output.mkdir(parents=True, exist_ok=True)
+
+        seed = options["seed"]
+        paths = []
+        for index in range(options["files"]):
+            path = output / f"synthetic_{seed}_{index:04d}.uff"
+            with open(path, "w", encoding="utf-8", newline="\n") as f:
+                readings = write_d0010(
+                    f,
+                    file_reference=f"{seed % 10000:04d}{index:06d}",
+                    # Distinct MPANs per seed and file
+                    first_mpan=1900000000000
+                    + (seed % 1000) * 10**9
+                    + index * options["mpans"],
+                    mpans=options["mpans"],
+                    meters_per_mpan=options["meters_per_mpan"],
+                    registers=options["registers"],
+                    readings=options["readings"],
+                    start=start,
+                    interval=timedelta(hours=options["interval_hours"]),
+                    dst=not options["no_dst"],
+                    duplicate_rate=options["duplicate_rate"],
+                    seed=seed * 100003 + index,
+                )
+            paths.append(path)
+            self.stdout.write(f"{path}: {readings} readings")
+
+        for index in range(options["resends"]):
+            original = paths[index % len(paths)]
+            resend = output / f"{original.stem}_resend{index:02d}.uff"
+            shutil.copyfile(original, resend)
+            self.stdout.write(f"{resend}: resend of {original.name}")
@@ -1,25 +1,129 @@
 """Django management command to import D0010 flow files."""
 
+import hashlib
 import logging
 import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
 from datetime import datetime
 from decimal import Decimal, InvalidOperation
 
+import django
 import pytz
 from django.core.management.base import BaseCommand, CommandError
-from django.db import transaction
-
-from meter_readings.models import FlowFile, Meter, MeterPoint, Reading
+from django.db import IntegrityError, connection, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from meter_readings.caching import data_changed
+from meter_readings.counters import add_flow_file_counters
+from meter_readings.instrumentation import ImportMetrics
+from meter_readings.latest import update_latest_readings
+from meter_readings.loaders import reading_loader
+from meter_readings.models import FlowFile, ImportRun, RejectedLine
+from meter_readings.records import ParsedReading
+from meter_readings.rollups import create_rollup
 
 logger = logging.getLogger("meter_readings")
 
 # Timezone for reading dates (UK energy industry standard)
 LONDON_TZ = pytz.timezone("Europe/London")
 
+# Readings handed to the bulk loader per round of queries
+SAVE_CHUNK_SIZE = 10000
+
+# Size hint for each batch of lines read from disk, in characters
+READ_BATCH_SIZE = 1 << 20
+
+# --on-error modes: abandon the file, drop invalid lines, or drop them and
+# keep a RejectedLine row for each
+ON_ERROR_MODES = ("fail", "skip", "quarantine")
+
+# Europe/London tzinfo per calendar date, or per (date, hour) on the days
+# the clocks change. Filled lazily by london_tzinfo().
+_LONDON_TZINFO_CACHE = {}
+_CLOCK_CHANGE_DAY = object()
+
+
+def london_tzinfo(year, month, day, hour):
+    """
+    Return the pytz tzinfo LONDON_TZ.localize() would pick for a local time.
+
+    Most dates have a single UTC offset, so the answer is cached per date.
+    On BST change days the offset is cached per hour instead; UK clocks
+    change on the hour, so every minute of an hour shares the same answer,
+    including the non-existent spring hour and the repeated autumn hour
+    (both resolved as GMT, matching localize's is_dst=False default).
+    """
+    tzinfo = _LONDON_TZINFO_CACHE.get((year, month, day))
+    if tzinfo is None:
+        first = LONDON_TZ.localize(datetime(year, month, day)).tzinfo
+        last = LONDON_TZ.localize(datetime(year, month, day, 23, 59, 59)).tzinfo
+        tzinfo = first if first is last else _CLOCK_CHANGE_DAY
+        _LONDON_TZINFO_CACHE[(year, month, day)] = tzinfo
+
+    if tzinfo is _CLOCK_CHANGE_DAY:
+        key = (year, month, day, hour)
+        tzinfo = _LONDON_TZINFO_CACHE.get(key)
+        if tzinfo is None:
+            tzinfo = LONDON_TZ.localize(datetime(year, month, day, hour)).tzinfo
+            _LONDON_TZINFO_CACHE[key] = tzinfo
+
+    return tzinfo
+
+
+def decode_reading_date(date_str):
+    """
+    Decode a YYYYMMDDHHMMSS timestamp as an aware Europe/London datetime.
+
+    Produces the same result as strptime("%Y%m%d%H%M%S") followed by
+    LONDON_TZ.localize(), by slicing the fixed-width fields and reusing
+    the cached offset for the date. Raises ValueError for anything
+    strptime would reject.
+    """
+    if len(date_str) != 14 or not (date_str.isascii() and date_str.isdigit()):
+        raise ValueError(f"Invalid date format: {date_str}")
+
+    year = int(date_str[0:4])
+    month = int(date_str[4:6])
+    day = int(date_str[6:8])
+    hour = int(date_str[8:10])
+    minute = int(date_str[10:12])
+    second = int(date_str[12:14])
+
+    # Validate the fields before touching the cache
+    naive_dt = datetime(year, month, day, hour, minute, second)
+    return naive_dt.replace(tzinfo=london_tzinfo(year, month, day, hour))
+
+
+def file_content_hash(file_path):
+    """SHA-256 hex digest of a file's bytes."""
+    with open(file_path, "rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+
+def parse_file_in_worker(file_path, on_error="fail"):
+    """Process pool entry point: parse a whole file for the writer process."""
+    command = Command()
+    command.on_error = on_error
+    file_data = command.parse_d0010_file(file_path)
+    metrics = file_data["metrics"]
+    start = time.perf_counter()
+    file_data["readings"] = list(file_data["readings"])
+    elapsed = time.perf_counter() - start
+    metrics.parse += elapsed - metrics.read
+    metrics.total += elapsed
+    return file_data
+
 
 class Command(BaseCommand):
     help = "Import D0010 flow files containing meter readings"
 
+    on_error = "fail"
+
     def add_arguments(self, parser):
         parser.add_argument(
             "files", nargs="+", type=str, help="Path(s) to D0010 file(s) to import"
@@ -29,10 +133,30 @@ class Command(BaseCommand):
             action="store_true",
             help="Parse files but do not save to database",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Parse files in N worker processes (default: 1, sequential)",
+        )
+        parser.add_argument(
+            "--on-error",
+            choices=ON_ERROR_MODES,
+            default="fail",
+            help=(
+                "What to do with an invalid line: fail the file (default), skip "
+                "it, or quarantine it in the file's rejected lines"
+            ),
+        )
 
     def handle(self, *args, **options):
         files = options["files"]
         dry_run = options["dry_run"]
+        workers = options["workers"]
+        self.on_error = options["on_error"]
+
+        if workers < 1:
+            raise CommandError("--workers must be at least 1")
 
         self.stdout.write(f"Starting import of {len(files)} file(s)...")
         if dry_run:
@@ -40,57 +164,218 @@ class Command(BaseCommand):
                 self.style.WARNING("DRY RUN MODE - No data will be saved")
             )
 
+        if workers > 1 and len(files) > 1:
+            results = self.import_files_parallel(files, dry_run, workers)
+        else:
+            results = self.import_files(files, dry_run)
+
         total_imported = 0
 
-        for file_path in files:
-            try:
-                imported_count = self.import_file(file_path, dry_run)
-                total_imported += imported_count
+        for file_path, outcome in results:
+            if isinstance(outcome, Exception):
+                self.stdout.write(self.style.ERROR(f"✗ {file_path}: {str(outcome)}"))
+            else:
+                total_imported += outcome
                 self.stdout.write(
-                    self.style.SUCCESS(
-                        f"✓ {file_path}: {imported_count} readings imported"
-                    )
+                    self.style.SUCCESS(f"✓ {file_path}: {outcome} readings imported")
                 )
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f"✗ {file_path}: {str(e)}"))
 
         self.stdout.write(
             self.style.SUCCESS(f"Import completed. Total readings: {total_imported}")
         )
 
-    def import_file(self, file_path, dry_run=False):
+    def import_files(self, files, dry_run=False):
+        """Import files one after another, yielding (path, count or exception)."""
+        for file_path in files:
+            try:
+                yield file_path, self.import_file(file_path, dry_run)
+            except Exception as e:
+                yield file_path, e
+
+    def import_files_parallel(self, files, dry_run, workers):
+        """
+        Parse files in a process pool and write them from this process.
+
+        Yields (path, count or exception) in input order. At most
+        ``2 * workers`` files are parsed ahead of the writer, bounding how
+        many parsed files are held in memory. SQLite allows a single
+        writer, so files are saved one at a time on this thread's
+        connection; on PostgreSQL up to ``workers`` files are saved
+        concurrently, each on its own connection.
+        """
+        concurrent_writes = not dry_run and connection.vendor == "postgresql"
+        window = 2 * workers
+        pending = deque()
+        remaining = iter(files)
+
+        with ExitStack() as stack:
+            parse_pool = stack.enter_context(
+                ProcessPoolExecutor(max_workers=workers, initializer=django.setup)
+            )
+            write_pool = (
+                stack.enter_context(ThreadPoolExecutor(max_workers=workers))
+                if concurrent_writes
+                else None
+            )
+
+            def submit_next():
+                for file_path in remaining:
+                    try:
+                        _, content_hash = self.check_importable(file_path)
+                    except CommandError as e:
+                        pending.append((file_path, None, None, e))
+                        continue
+                    parsed = parse_pool.submit(
+                        parse_file_in_worker, file_path, self.on_error
+                    )
+                    if write_pool is not None:
+                        parsed = write_pool.submit(
+                            self.write_parsed_in_thread,
+                            file_path,
+                            parsed,
+                            content_hash,
+                        )
+                    pending.append((file_path, parsed, content_hash, None))
+                    return
+
+            for _ in range(window):
+                submit_next()
+
+            while pending:
+                file_path, future, content_hash, error = pending.popleft()
+                submit_next()
+
+                if error is not None:
+                    yield file_path, error
+                    continue
+                try:
+                    if write_pool is not None:
+                        yield file_path, future.result()
+                    else:
+                        yield file_path, self.write_parsed(
+                            file_path, future.result(), dry_run, content_hash
+                        )
+                except Exception as e:
+                    yield file_path, e
+
+    def write_parsed(self, file_path, file_data, dry_run=False, content_hash=None):
+        """Save ``file_data`` parsed by a worker process."""
+        if dry_run:
+            self.report_rejected(file_path, file_data)
+            return len(file_data["readings"])
+
+        # Re-checked here: another file with the same name or contents may
+        # have been saved since this one was queued.
+        filename, file_data["content_hash"] = self.check_importable(
+            file_path, content_hash
+        )
+
+        with transaction.atomic():
+            return self.save_file_data(file_data, filename)
+
+    def write_parsed_in_thread(self, file_path, parsed, content_hash):
+        """Writer thread entry point: wait for the parse, then save on a new connection."""
+        try:
+            return self.write_parsed(
+                file_path, parsed.result(), content_hash=content_hash
+            )
+        finally:
+            connections.close_all()
+
+    def check_importable(self, file_path, content_hash=None):
+        """
+        Return (filename, content_hash), or raise CommandError if the file
+        cannot be imported.
+
+        A resend is recognised by its content hash before any parsing,
+        whatever it is called this time.
+        """
         if not os.path.exists(file_path):
             raise CommandError(f"File not found: {file_path}")
 
         filename = os.path.basename(file_path)
 
-        if FlowFile.objects.filter(filename=filename).exists():
+        if content_hash is None:
+            content_hash = file_content_hash(file_path)
+
+        # One query for both the name and the contents
+        originals = set(
+            FlowFile.objects.filter(
+                Q(filename=filename) | Q(content_hash=content_hash)
+            ).values_list("filename", flat=True)
+        )
+        if filename in originals:
             raise CommandError(f"File {filename} has already been imported")
+        if originals:
+            raise CommandError(
+                f"File {filename} has already been imported as {min(originals)}"
+            )
+
+        return filename, content_hash
+
+    def import_file(self, file_path, dry_run=False):
+        filename, content_hash = self.check_importable(file_path)
 
         file_data = self.parse_d0010_file(file_path)
+        file_data["content_hash"] = content_hash
 
         if dry_run:
-            return len(file_data["readings"])
+            count = sum(1 for _ in file_data["readings"])
+            self.report_rejected(file_path, file_data)
+            return count
 
         with transaction.atomic():
             return self.save_file_data(file_data, filename)
 
     def parse_d0010_file(self, file_path):
-        file_data = {"header": None, "readings": [], "trailer": None}
+        """
+        Start a streaming parse of a D0010 file.
+
+        ``readings`` is a generator, so nothing is read until it is
+        consumed; ``header`` and ``trailer`` are filled in as the
+        generator reaches the ZHV and ZPT records. Unless ``on_error`` is
+        "fail", invalid lines are collected in ``rejected`` as
+        (line number, line, reason) instead of raising. ``metrics``
+        collects the file's phase timings for its ImportRun.
+        """
+        metrics = ImportMetrics()
+        metrics.started_at = timezone.now()
+        metrics.bytes = os.path.getsize(file_path)
+        file_data = {
+            "header": None,
+            "readings": None,
+            "trailer": None,
+            "rejected": [],
+            "metrics": metrics,
+        }
+        file_data["readings"] = self.iter_readings(file_path, file_data)
+        return file_data
+
+    def iter_readings(self, file_path, file_data):
+        """
+        Yield parsed 030 readings one at a time, carrying MPAN/meter context.
+
+        Lines are read in batches so reading from disk can be timed apart
+        from parsing without a clock call per line.
+        """
         current_mpan = None
         current_meter_serial = None
         current_meter_type = None
+        reading_count = 0
+        metrics = file_data["metrics"]
+        line_num = 0
 
         with open(file_path, "r", encoding="utf-8") as file:
-            for line_num, line in enumerate(file, 1):
+            for line in self.read_lines(file, metrics):
+                line_num += 1
                 line = line.strip()
                 if not line:
                     continue
 
+                reading_data = None
+                parts = line.split("|")
+                record_type = parts[0]
                 try:
-                    parts = line.split("|")
-                    record_type = parts[0]
-
                     if record_type == "ZHV":
                         file_data["header"] = self.parse_header(parts)
                     elif record_type == "026":
@@ -113,19 +398,49 @@ class Command(BaseCommand):
                             current_meter_serial,
                             current_meter_type,
                         )
-                        file_data["readings"].append(reading_data)
                     elif record_type == "ZPT":
                         file_data["trailer"] = self.parse_trailer(parts)
 
                 except Exception as e:
-                    raise CommandError(
-                        f"Error parsing line {line_num}: {str(e)}\nLine: {line}"
-                    )
+                    if self.on_error == "fail":
+                        raise CommandError(
+                            f"Error parsing line {line_num}: {str(e)}\nLine: {line}"
+                        )
+                    # Readings after a bad 026/028 must not be credited to
+                    # the previous MPAN or meter, so they are rejected too
+                    if record_type == "026":
+                        current_mpan = None
+                        current_meter_serial = None
+                    elif record_type == "028":
+                        current_meter_serial = None
+                    file_data["rejected"].append((line_num, line, str(e)))
+                    continue
+
+                if reading_data is not None:
+                    reading_count += 1
+                    yield reading_data
 
-        if not file_data["readings"]:
+        metrics.lines = line_num
+        if not reading_count:
             raise CommandError("No readings found in file")
 
-        return file_data
+    def read_lines(self, file, metrics):
+        """Yield the lines of ``file``, adding the time spent reading to ``metrics``."""
+        while True:
+            with metrics.timing("read"):
+                lines = file.readlines(READ_BATCH_SIZE)
+            if not lines:
+                return
+            yield from lines
+
+    def report_rejected(self, name, file_data):
+        """Warn about the invalid lines skipped or quarantined from a file."""
+        rejected = len(file_data["rejected"])
+        if rejected:
+            action = "quarantined" if self.on_error == "quarantine" else "skipped"
+            self.stdout.write(
+                self.style.WARNING(f"! {name}: {rejected} invalid line(s) {action}")
+            )
 
     def parse_header(self, parts):
         return {
@@ -142,7 +457,7 @@ class Command(BaseCommand):
         if not mpan.isdigit() or len(mpan) != 13:
             raise ValueError(f"Invalid MPAN format: {mpan}")
 
-        return mpan
+        return sys.intern(mpan)
 
     def parse_meter_record(self, parts):
         if len(parts) < 3:
@@ -154,24 +469,18 @@ class Command(BaseCommand):
         if not serial_number:
             raise ValueError("Empty meter serial number")
 
-        return serial_number, meter_type
+        return sys.intern(serial_number), sys.intern(meter_type)
 
     def parse_reading_record(self, parts, mpan, meter_serial, meter_type):
         if len(parts) < 4:
             raise ValueError("Invalid 030 reading record format")
 
-        register_id = parts[1].strip()
+        register_id = sys.intern(parts[1].strip())
         date_str = parts[2].strip()
         value_str = parts[3].strip()
 
         try:
-            if len(date_str) == 14:
-                # Parse as naive datetime first
-                naive_dt = datetime.strptime(date_str, "%Y%m%d%H%M%S")
-                # Make timezone-aware in Europe/London timezone
-                reading_date = LONDON_TZ.localize(naive_dt)
-            else:
-                raise ValueError(f"Invalid date format: {date_str}")
+            reading_date = decode_reading_date(date_str)
         except ValueError:
             raise ValueError(f"Could not parse reading date: {date_str}")
 
@@ -180,15 +489,9 @@ class Command(BaseCommand):
         except (InvalidOperation, ValueError):
             raise ValueError(f"Invalid reading value: {value_str}")
 
-        return {
-            "mpan": mpan,
-            "meter_serial": meter_serial,
-            "meter_type": meter_type,
-            "register_id": register_id,
-            "reading_date": reading_date,
-            "reading_value": reading_value,
-            "reading_type": "ACTUAL",
-        }
+        return ParsedReading(
+            mpan, meter_serial, meter_type, register_id, reading_date, reading_value
+        )
 
     def parse_trailer(self, parts):
         return {
@@ -200,50 +503,94 @@ class Command(BaseCommand):
         }
 
     def save_file_data(self, file_data, filename):
-        flow_file = FlowFile.objects.create(
-            filename=filename,
-            file_reference=(
-                file_data["header"]["file_reference"] if file_data["header"] else ""
-            ),
-            record_count=0,
+        """
+        Save readings from ``parse_d0010_file`` in fixed-size chunks.
+
+        Must run inside a transaction: a parse error part-way through the
+        stream is raised after earlier chunks were written, and relies on
+        the rollback to leave nothing behind. Phase timings, counts and
+        the queries run are recorded in the file's ImportRun.
+        """
+        metrics = file_data["metrics"]
+        start = time.perf_counter()
+        with metrics.counting_queries():
+            flow_file, imported_count = self.save_readings(file_data, filename, metrics)
+        metrics.total += time.perf_counter() - start
+
+        ImportRun.objects.create(
+            flow_file=flow_file,
+            started_at=metrics.started_at,
+            read_seconds=metrics.read,
+            parse_seconds=metrics.parse,
+            resolve_seconds=metrics.resolve,
+            insert_seconds=metrics.insert,
+            finalize_seconds=metrics.finalize,
+            total_seconds=metrics.total,
+            bytes_read=metrics.bytes,
+            line_count=metrics.lines,
+            reading_count=imported_count,
+            rejected_count=flow_file.rejected_count,
+            rows_per_second=imported_count / metrics.total if metrics.total else 0.0,
+            query_count=metrics.queries,
         )
+        data_changed()
 
-        imported_count = 0
-
-        for reading_data in file_data["readings"]:
-            try:
-                meter_point, _ = MeterPoint.objects.get_or_create(
-                    mpan=reading_data["mpan"]
-                )
-
-                meter, _ = Meter.objects.get_or_create(
-                    meter_point=meter_point,
-                    serial_number=reading_data["meter_serial"],
-                    defaults={"meter_type": reading_data["meter_type"]},
-                )
-
-                reading, created = Reading.objects.get_or_create(
-                    meter=meter,
-                    register_id=reading_data["register_id"],
-                    reading_date=reading_data["reading_date"],
-                    defaults={
-                        "flow_file": flow_file,
-                        "reading_value": reading_data["reading_value"],
-                        "reading_type": reading_data["reading_type"],
-                    },
-                )
+        return imported_count
 
-                if created:
-                    imported_count += 1
+    def save_readings(self, file_data, filename, metrics):
+        """Write the FlowFile and its readings; return (flow_file, count)."""
+        try:
+            flow_file = FlowFile.objects.create(
+                filename=filename,
+                file_reference="",
+                record_count=0,
+                content_hash=file_data.get("content_hash", ""),
+            )
+        except IntegrityError:
+            # A concurrent writer saved the same name or contents first
+            raise CommandError(f"File {filename} has already been imported")
 
-            except Exception as e:
-                logger.error(f"Error saving reading: {str(e)}")
-                raise CommandError(f"Database error: {str(e)}")
+        loader = reading_loader(flow_file, metrics=metrics)
+        readings = iter(file_data["readings"])
 
+        try:
+            while chunk := metrics.take(readings, SAVE_CHUNK_SIZE):
+                loader.load(chunk)
+            with metrics.timing("finalize"):
+                imported_count = add_flow_file_counters(flow_file.pk)
+                update_latest_readings(flow_file.pk)
+        except CommandError:
+            raise
+        except Exception as e:
+            logger.error(f"Error saving readings: {str(e)}")
+            raise CommandError(f"Database error: {str(e)}")
+
+        # The header has been parsed by the time the stream is exhausted
+        flow_file.file_reference = (
+            file_data["header"]["file_reference"] if file_data["header"] else ""
+        )
         flow_file.record_count = imported_count
-        flow_file.save()
+        flow_file.rejected_count = len(file_data["rejected"])
+        with metrics.timing("finalize"):
+            if self.on_error == "quarantine" and file_data["rejected"]:
+                RejectedLine.objects.bulk_create(
+                    (
+                        RejectedLine(
+                            flow_file=flow_file,
+                            line_number=line_number,
+                            raw_line=line,
+                            reason=reason,
+                        )
+                        for line_number, line, reason in file_data["rejected"]
+                    ),
+                    batch_size=SAVE_CHUNK_SIZE,
+                )
+            create_rollup(flow_file.pk)
+            flow_file.rollup_complete = True
+            flow_file.save()
+        self.report_rejected(filename, file_data)
 
-        return imported_count
+        return flow_file, imported_count
 
 
 # Timezone-aware datetime handling
@@ -0,0 +1,338 @@
+"""Django management command to ingest D0010 flow files dropped into an inbox."""
+
+import ctypes
+import ctypes.util
+import fcntl
+import logging
+import os
+import select
+import signal
+import socket
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from meter_readings.management.commands.import_d0010 import Command as ImportCommand
+
+logger = logging.getLogger("meter_readings")
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+
+# Held locked by the ingester that owns a processing directory
+OWNER_LOCK = ".lock"
+
+
+class InotifyWatcher:
+    """Wakes when a file is written or moved into a directory (Linux only)."""
+
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if (
+            libc.inotify_add_watch(
+                self.fd, os.fsencode(path), IN_CLOSE_WRITE | IN_MOVED_TO
+            )
+            < 0
+        ):
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"inotify_add_watch failed for {path}")
+
+    def wait(self, timeout):
+        """Block until the directory changes or ``timeout`` seconds pass."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        # Drain queued events; the caller rescans the directory anyway
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+        return True
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Fallback watcher that simply sleeps between directory scans."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def wait(self, timeout):
+        time.sleep(timeout)
+        return False
+
+    def close(self):
+        pass
+
+
+def make_watcher(path, polling=False):
+    """Return an inotify watcher where available, otherwise a polling one."""
+    if not polling and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(path)
+        except (AttributeError, OSError, TypeError) as e:
+            logger.warning(f"inotify unavailable, falling back to polling: {e}")
+    return PollingWatcher(path)
+
+
+class Command(BaseCommand):
+    help = (
+        "Watch an inbox directory and import D0010 files as they arrive. "
+        "Producers should write files elsewhere and rename them into the "
+        "inbox so they are never picked up half-written. Several ingesters "
+        "may share an inbox."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("inbox", type=str, help="Directory to watch for .uff files")
+        parser.add_argument(
+            "--done-dir",
+            type=str,
+            help="Where imported files are moved (default: <inbox>/done)",
+        )
+        parser.add_argument(
+            "--failed-dir",
+            type=str,
+            help="Where rejected files are moved (default: <inbox>/failed)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=2.0,
+            help="Seconds between directory scans (default: 2)",
+        )
+        parser.add_argument(
+            "--polling",
+            action="store_true",
+            help="Scan on an interval instead of using inotify",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Process files already in the inbox, then exit",
+        )
+
+    def handle(self, *args, **options):
+        self.inbox = Path(options["inbox"])
+        if not self.inbox.is_dir():
+            raise CommandError(f"Inbox directory not found: {self.inbox}")
+
+        self.processing_root = self.inbox / "processing"
+        self.done_dir = Path(options["done_dir"] or self.inbox / "done")
+        self.failed_dir = Path(options["failed_dir"] or self.inbox / "failed")
+        for directory in (self.processing_root, self.done_dir, self.failed_dir):
+            directory.mkdir(parents=True, exist_ok=True)
+        self.create_processing_dir()
+
+        self.importer = ImportCommand(stdout=self.stdout, stderr=self.stderr)
+        self.stopping = False
+        try:
+            self.recover_claimed_files()
+            if options["once"]:
+                self.ingest_pending()
+            else:
+                self.watch(options)
+        finally:
+            self.release_processing_dir()
+
+    def watch(self, options):
+        """Ingest files as they arrive until SIGTERM or SIGINT."""
+        signal.signal(signal.SIGTERM, self.request_stop)
+        signal.signal(signal.SIGINT, self.request_stop)
+
+        watcher = make_watcher(self.inbox, polling=options["polling"])
+        self.stdout.write(
+            f"Watching {self.inbox} ({type(watcher).__name__}), Ctrl+C to stop"
+        )
+        try:
+            while not self.stopping:
+                # Drop connections that timed out or broke while idle
+                close_old_connections()
+                self.ingest_pending()
+                watcher.wait(options["poll_interval"])
+        finally:
+            watcher.close()
+        self.stdout.write("Ingest stopped")
+
+    def request_stop(self, signum, frame):
+        self.stopping = True
+
+    def create_processing_dir(self):
+        """
+        Create this ingester's processing directory, already locked.
+
+        Each ingester claims files into its own directory, locked for as
+        long as it runs, so a restart only requeues a dead one's files.
+        The directory is made and locked under a hidden temporary name,
+        which recovery skips, then renamed into place, so no other
+        ingester ever sees it unlocked.
+        """
+        self.processing_dir = (
+            self.processing_root / f"{socket.gethostname()}-{os.getpid()}"
+        )
+        # Left by a dead ingester that had the same host and pid
+        if self.processing_dir.exists() and not self.recover_dir(self.processing_dir):
+            raise CommandError(f"{self.processing_dir} is locked by a running ingester")
+
+        staging = Path(tempfile.mkdtemp(prefix=".new-", dir=self.processing_root))
+        self.owner_lock = self.lock_processing_dir(staging)
+        if self.owner_lock is None:
+            raise CommandError(f"Could not lock {staging}")
+        os.rename(staging, self.processing_dir)
+
+    def lock_processing_dir(self, directory):
+        """
+        Return an open, exclusively locked lock file in ``directory``, or
+        None if another live ingester holds it.
+
+        The lock is released by the kernel when its holder exits, however
+        it exits.
+        """
+        lock = open(directory / OWNER_LOCK, "a")
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock.close()
+            return None
+        return lock
+
+    def release_processing_dir(self):
+        """Remove this ingester's processing directory if nothing is left in it."""
+        self.owner_lock.close()
+        (self.processing_dir / OWNER_LOCK).unlink(missing_ok=True)
+        try:
+            self.processing_dir.rmdir()
+        except FileNotFoundError:
+            # Another starting ingester found it unlocked and removed it
+            pass
+        except OSError:
+            logger.warning(f"Files left in {self.processing_dir}")
+
+    def recover_claimed_files(self):
+        """
+        Requeue files claimed by ingesters that died mid-import.
+
+        Directories still locked by a running ingester are left alone, as
+        are its files, and so are hidden ones still being created. Files
+        directly under ``processing/`` were claimed by an older,
+        single-directory ingester.
+        """
+        for path in sorted(self.processing_root.glob("*.uff")):
+            self.requeue(path)
+
+        for directory in sorted(self.processing_root.iterdir()):
+            if (
+                directory.is_dir()
+                and directory != self.processing_dir
+                and not directory.name.startswith(".")
+            ):
+                self.recover_dir(directory)
+
+    def recover_dir(self, directory):
+        """
+        Requeue the files of a dead ingester's ``directory`` and remove it.
+
+        Returns False if a running ingester still holds it.
+        """
+        try:
+            lock = self.lock_processing_dir(directory)
+        except FileNotFoundError:
+            # Another ingester recovered it first
+            return True
+        if lock is None:
+            return False
+        with lock:
+            for path in sorted(directory.glob("*.uff")):
+                self.requeue(path)
+            (directory / OWNER_LOCK).unlink(missing_ok=True)
+        try:
+            directory.rmdir()
+        except FileNotFoundError:
+            pass
+        except OSError:
+            logger.warning(f"Could not remove {directory}")
+        return True
+
+    def requeue(self, path):
+        logger.warning(f"Requeueing {path.name} left in {path.parent}")
+        os.replace(path, self.inbox / path.name)
+
+    def ingest_pending(self):
+        """Claim and import every .uff file currently in the inbox."""
+        for path in sorted(self.inbox.glob("*.uff")):
+            if path.name.startswith(".") or not path.is_file():
+                continue
+            if self.stopping:
+                return
+            claimed = self.claim(path)
+            if claimed is not None:
+                self.ingest_file(claimed)
+
+    def claim(self, path):
+        """
+        Move ``path`` into the processing directory.
+
+        rename() is atomic on one filesystem, so when several ingesters
+        share an inbox exactly one of them wins each file. Only a missing
+        source means another ingester won; a missing processing directory
+        is an error.
+        """
+        claimed = self.processing_dir / path.name
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError as e:
+            if os.path.lexists(path):
+                raise CommandError(
+                    f"Cannot claim {path.name} into {self.processing_dir}: {e}"
+                ) from e
+            return None
+        return claimed
+
+    def ingest_file(self, path):
+        try:
+            imported_count = self.importer.import_file(str(path))
+        except Exception as e:
+            logger.error(f"Ingest of {path.name} failed: {str(e)}")
+            self.stdout.write(self.style.ERROR(f"✗ {path.name}: {str(e)}"))
+            try:
+                destination = self.move(path, self.failed_dir)
+                destination.with_name(destination.name + ".error").write_text(
+                    f"{str(e)}\n"
+                )
+            except OSError as move_error:
+                logger.error(f"Could not file away {path.name}: {move_error}")
+            return
+
+        logger.info(f"Ingested {path.name}: {imported_count} readings")
+        self.stdout.write(
+            self.style.SUCCESS(f"✓ {path.name}: {imported_count} readings imported")
+        )
+        # The import is committed; a failed move must not stop the loop.
+        # The file stays in processing/ and is rejected as a resend if a
+        # later run requeues it.
+        try:
+            self.move(path, self.done_dir)
+        except OSError as e:
+            logger.error(f"Could not move {path.name} to {self.done_dir}: {e}")
+
+    def move(self, path, directory):
+        """Move ``path`` into ``directory`` without overwriting an earlier file."""
+        destination = directory / path.name
+        if destination.exists():
+            stamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
+            destination = directory / f"{path.name}.{stamp}"
+        os.replace(path, destination)
+        return destination
@@ -0,0 +1,65 @@
+"""Django management command to print the latest reading per meter register."""
+
+import csv
+
+from django.core.management.base import BaseCommand, CommandError
+
+from meter_readings.exports import utc_timestamp
+from meter_readings.latest import latest_for_mpans, rebuild_latest_readings
+
+
+class Command(BaseCommand):
+    help = (
+        "Print the latest reading on every register of the given MPANs as CSV, "
+        "or rebuild the latest-reading table with --rebuild."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("mpans", nargs="*", type=str, help="MPANs to look up")
+        parser.add_argument(
+            "--mpan-file", type=str, help="File with one MPAN per line to look up"
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Rebuild the latest-reading table from all readings",
+        )
+
+    def handle(self, *args, **options):
+        if options["rebuild"]:
+            rows = rebuild_latest_readings()
+            self.stderr.write(self.style.SUCCESS(f"Rebuilt {rows} latest readings"))
+            return
+
+        mpans = list(options["mpans"])
+        if options["mpan_file"]:
+            try:
+                with open(options["mpan_file"], encoding="utf-8") as f:
+                    mpans.extend(line.strip() for line in f if line.strip())
+            except OSError as e:
+                raise CommandError(f"Cannot read {options['mpan_file']}: {e}")
+        if not mpans:
+            raise CommandError("Give at least one MPAN, --mpan-file or --rebuild")
+
+        writer = csv.writer(self.stdout, lineterminator="\n")
+        writer.writerow(
+            [
+                "mpan",
+                "meter_serial",
+                "register_id",
+                "reading_date",
+                "reading_value",
+                "reading_type",
+            ]
+        )
+        for latest in latest_for_mpans(mpans):
+            writer.writerow(
+                [
+                    latest.meter.meter_point.mpan,
+                    latest.meter.serial_number,
+                    latest.register_id,
+                    utc_timestamp(latest.reading_date),
+                    latest.reading_value,
+                    latest.reading_type,
+                ]
+            )
@@ -0,0 +1,21 @@
+"""Django management command to rebuild the stored meter counters."""
+
+from django.core.management.base import BaseCommand
+
+from meter_readings.counters import recompute_all_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored reading counts and first/last reading dates "
+        "of every meter and meter point from the readings table."
+    )
+
+    def handle(self, *args, **options):
+        meters, meter_points = recompute_all_counters()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recomputed counters for {meters} meters and "
+                f"{meter_points} meter points"
+            )
+        )
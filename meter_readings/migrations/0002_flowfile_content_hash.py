@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flowfile",
+            name="content_hash",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="SHA-256 of the file contents, used to reject resends",
+                max_length=64,
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="flowfile",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("content_hash", ""), _negated=True),
+                fields=("content_hash",),
+                name="uniq_flowfile_content_hash",
+            ),
+        ),
+    ]
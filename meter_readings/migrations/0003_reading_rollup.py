@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Max, Min
+from django.db.models.functions import TruncDate
+
+
+def build_rollups(apps, schema_editor):
+    FlowFile = apps.get_model("meter_readings", "FlowFile")
+    Reading = apps.get_model("meter_readings", "Reading")
+    ReadingRollup = apps.get_model("meter_readings", "ReadingRollup")
+
+    for flow_file_id in FlowFile.objects.values_list("pk", flat=True):
+        groups = (
+            Reading.objects.filter(flow_file_id=flow_file_id)
+            .annotate(day=TruncDate("reading_date"))
+            .order_by()
+            .values("day", "reading_type")
+            .annotate(
+                reading_count=Count("id"),
+                first_reading=Min("reading_date"),
+                last_reading=Max("reading_date"),
+            )
+        )
+        ReadingRollup.objects.bulk_create(
+            ReadingRollup(flow_file_id=flow_file_id, **group) for group in groups
+        )
+    FlowFile.objects.update(rollup_complete=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0002_flowfile_content_hash"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flowfile",
+            name="rollup_complete",
+            field=models.BooleanField(
+                default=False,
+                help_text="Whether ReadingRollup rows reflect this file's readings",
+            ),
+        ),
+        migrations.CreateModel(
+            name="ReadingRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField(help_text="Reading date (Europe/London)")),
+                ("reading_type", models.CharField(max_length=10)),
+                ("reading_count", models.PositiveIntegerField()),
+                ("first_reading", models.DateTimeField()),
+                ("last_reading", models.DateTimeField()),
+                (
+                    "flow_file",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rollups",
+                        to="meter_readings.flowfile",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Reading Rollup",
+                "verbose_name_plural": "Reading Rollups",
+                "unique_together": {("flow_file", "day", "reading_type")},
+            },
+        ),
+        migrations.RunPython(build_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:52
+
+from django.db import migrations, models
+from django.db.models import Count, Max, Min, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def aggregate(queryset, group_by, value):
+    return Subquery(
+        queryset.order_by().values(group_by).annotate(value=value).values("value")
+    )
+
+
+def backfill_counters(apps, schema_editor):
+    Meter = apps.get_model("meter_readings", "Meter")
+    MeterPoint = apps.get_model("meter_readings", "MeterPoint")
+    Reading = apps.get_model("meter_readings", "Reading")
+
+    readings = Reading.objects.filter(meter=OuterRef("pk"))
+    Meter.objects.update(
+        reading_count=Coalesce(aggregate(readings, "meter", Count("id")), 0),
+        first_reading_date=aggregate(readings, "meter", Min("reading_date")),
+        last_reading_date=aggregate(readings, "meter", Max("reading_date")),
+    )
+
+    meters = Meter.objects.filter(meter_point=OuterRef("pk"))
+    MeterPoint.objects.update(
+        meter_count=Coalesce(aggregate(meters, "meter_point", Count("id")), 0),
+        reading_count=Coalesce(
+            aggregate(meters, "meter_point", Sum("reading_count")), 0
+        ),
+        first_reading_date=aggregate(meters, "meter_point", Min("first_reading_date")),
+        last_reading_date=aggregate(meters, "meter_point", Max("last_reading_date")),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0003_reading_rollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="meter",
+            name="first_reading_date",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="meter",
+            name="last_reading_date",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="meter",
+            name="reading_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="meterpoint",
+            name="first_reading_date",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="meterpoint",
+            name="last_reading_date",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="meterpoint",
+            name="meter_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="meterpoint",
+            name="reading_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name="meter",
+            index=models.Index(fields=["reading_count"], name="idx_meter_readings"),
+        ),
+        migrations.AddIndex(
+            model_name="meterpoint",
+            index=models.Index(
+                fields=["reading_count"], name="idx_meterpoint_readings"
+            ),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
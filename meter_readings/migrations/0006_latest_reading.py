@@ -0,0 +1,117 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+# LatestReading column -> Reading column it is copied from
+LATEST_COLUMNS = {
+    "meter_id": "meter_id",
+    "register_id": "register_id",
+    "reading_id": "id",
+    "reading_date": "reading_date",
+    "reading_value": "reading_value",
+    "reading_type": "reading_type",
+}
+
+
+def build_latest_readings(apps, schema_editor):
+    """
+    Fill LatestReading with one INSERT ... SELECT over the ranked readings.
+
+    Ranked with ROW_NUMBER like meter_readings.latest.newest_readings; the
+    table was just created, so there are no existing rows to merge with.
+    """
+    LatestReading = apps.get_model("meter_readings", "LatestReading")
+    Reading = apps.get_model("meter_readings", "Reading")
+
+    newest = (
+        Reading.objects.annotate(
+            newest=Window(
+                RowNumber(),
+                partition_by=[F("meter_id"), F("register_id")],
+                order_by=F("reading_date").desc(),
+            )
+        )
+        .filter(newest=1)
+        .order_by()
+        .values_list(*LATEST_COLUMNS.values())
+    )
+    sql, params = newest.query.sql_with_params()
+    connection = schema_editor.connection
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {qn(LatestReading._meta.db_table)} "
+            f"({', '.join(map(qn, LATEST_COLUMNS))}) {sql}",
+            params,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0005_data_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LatestReading",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "register_id",
+                    models.CharField(
+                        choices=[
+                            ("S", "Standard"),
+                            ("01", "Register 1"),
+                            ("02", "Register 2"),
+                            ("03", "Register 3"),
+                            ("A1", "Advance 1"),
+                            ("TO", "Total"),
+                            ("DY", "Day"),
+                            ("NT", "Night"),
+                            ("WK", "Weekend"),
+                            ("OT", "Other"),
+                        ],
+                        max_length=2,
+                    ),
+                ),
+                ("reading_date", models.DateTimeField()),
+                ("reading_value", models.DecimalField(decimal_places=3, max_digits=12)),
+                ("reading_type", models.CharField(max_length=10)),
+                (
+                    "meter",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="latest_readings",
+                        to="meter_readings.meter",
+                    ),
+                ),
+                (
+                    "reading",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="meter_readings.reading",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Latest Reading",
+                "verbose_name_plural": "Latest Readings",
+                "ordering": ["meter", "register_id"],
+                "unique_together": {("meter", "register_id")},
+            },
+        ),
+        migrations.RunPython(build_latest_readings, migrations.RunPython.noop),
+    ]
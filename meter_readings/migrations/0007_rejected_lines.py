@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0006_latest_reading"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="flowfile",
+            name="rejected_count",
+            field=models.PositiveIntegerField(
+                default=0, help_text="Invalid lines skipped or quarantined on import"
+            ),
+        ),
+        migrations.CreateModel(
+            name="RejectedLine",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("line_number", models.PositiveIntegerField()),
+                ("raw_line", models.TextField()),
+                ("reason", models.TextField()),
+                (
+                    "flow_file",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="rejected_lines",
+                        to="meter_readings.flowfile",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Rejected Line",
+                "verbose_name_plural": "Rejected Lines",
+                "ordering": ["flow_file", "line_number"],
+                "unique_together": {("flow_file", "line_number")},
+            },
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("meter_readings", "0007_rejected_lines"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "started_at",
+                    models.DateTimeField(help_text="When parsing the file began"),
+                ),
+                (
+                    "read_seconds",
+                    models.FloatField(help_text="Reading lines from disk"),
+                ),
+                (
+                    "parse_seconds",
+                    models.FloatField(help_text="Parsing lines into readings"),
+                ),
+                (
+                    "resolve_seconds",
+                    models.FloatField(help_text="Finding or creating MPANs and meters"),
+                ),
+                ("insert_seconds", models.FloatField(help_text="Inserting readings")),
+                (
+                    "finalize_seconds",
+                    models.FloatField(
+                        help_text="Updating counters, latest readings and rollups"
+                    ),
+                ),
+                ("total_seconds", models.FloatField()),
+                ("bytes_read", models.PositiveBigIntegerField()),
+                ("line_count", models.PositiveIntegerField()),
+                (
+                    "reading_count",
+                    models.PositiveIntegerField(help_text="Readings imported"),
+                ),
+                ("rejected_count", models.PositiveIntegerField()),
+                (
+                    "rows_per_second",
+                    models.FloatField(help_text="Readings imported per second"),
+                ),
+                (
+                    "query_count",
+                    models.PositiveIntegerField(help_text="Queries run while saving"),
+                ),
+                (
+                    "flow_file",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="import_run",
+                        to="meter_readings.flowfile",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Import Run",
+                "verbose_name_plural": "Import Runs",
+                "ordering": ["-started_at"],
+            },
+        ),
+    ]
@@ -20,11 +20,31 @@ class FlowFile(models.Model):
     record_count = models.PositiveIntegerField(
         default=0, help_text="Number of records imported"
     )
+    content_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="SHA-256 of the file contents, used to reject resends",
+    )
+    rejected_count = models.PositiveIntegerField(
+        default=0, help_text="Invalid lines skipped or quarantined on import"
+    )
+    rollup_complete = models.BooleanField(
+        default=False,
+        help_text="Whether ReadingRollup rows reflect this file's readings",
+    )
 
     class Meta:
         ordering = ["-imported_at"]
         verbose_name = "Flow File"
         verbose_name_plural = "Flow Files"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["content_hash"],
+                condition=~models.Q(content_hash=""),
+                name="uniq_flowfile_content_hash",
+            )
+        ]
 
     def __str__(self):
         return (
@@ -45,6 +65,11 @@ class MeterPoint(models.Model):
         validators=[mpan_validator],
         help_text="Meter Point Administration Number (13 digits)",
     )
+    # Denormalised totals, maintained by meter_readings.counters
+    meter_count = models.PositiveIntegerField(default=0)
+    reading_count = models.PositiveIntegerField(default=0)
+    first_reading_date = models.DateTimeField(null=True, blank=True)
+    last_reading_date = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -52,7 +77,10 @@ class MeterPoint(models.Model):
         ordering = ["mpan"]
         verbose_name = "Meter Point"
         verbose_name_plural = "Meter Points"
-        indexes = [models.Index(fields=["mpan"], name="idx_meterpoint_mpan")]
+        indexes = [
+            models.Index(fields=["mpan"], name="idx_meterpoint_mpan"),
+            models.Index(fields=["reading_count"], name="idx_meterpoint_readings"),
+        ]
 
     def clean(self):
         if self.mpan and not re.match(r"^\d{13}$", self.mpan):
@@ -88,6 +116,10 @@ class Meter(models.Model):
         default="S",
         help_text="Type of meter (from 028 record)",
     )
+    # Denormalised totals, maintained by meter_readings.counters
+    reading_count = models.PositiveIntegerField(default=0)
+    first_reading_date = models.DateTimeField(null=True, blank=True)
+    last_reading_date = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -101,6 +133,7 @@ class Meter(models.Model):
             models.Index(
                 fields=["meter_point", "serial_number"], name="idx_meter_mp_serial"
             ),
+            models.Index(fields=["reading_count"], name="idx_meter_readings"),
         ]
 
     def clean(self):
@@ -168,3 +201,138 @@ class Reading(models.Model):
 
     def __str__(self):
         return f"{self.mpan} - {self.meter.serial_number} - {self.reading_value} on {self.reading_date.strftime('%Y-%m-%d')}"
+
+
+class RejectedLine(models.Model):
+    """
+    An invalid line set aside by ``import_d0010 --on-error=quarantine``.
+
+    The rest of the file is imported; these lines can be fixed and sent
+    again in a new file.
+    """
+
+    flow_file = models.ForeignKey(
+        FlowFile, on_delete=models.CASCADE, related_name="rejected_lines"
+    )
+    line_number = models.PositiveIntegerField()
+    raw_line = models.TextField()
+    reason = models.TextField()
+
+    class Meta:
+        ordering = ["flow_file", "line_number"]
+        verbose_name = "Rejected Line"
+        verbose_name_plural = "Rejected Lines"
+        unique_together = [["flow_file", "line_number"]]
+
+    def __str__(self):
+        return f"{self.flow_file.filename} line {self.line_number}: {self.reason}"
+
+
+class ImportRun(models.Model):
+    """
+    Phase timings and counts recorded by ``import_d0010`` for one file.
+
+    Times are in seconds. Read and parse time is measured in whichever
+    process parsed the file, so with ``--workers`` it overlaps the saving
+    of other files.
+    """
+
+    flow_file = models.OneToOneField(
+        FlowFile, on_delete=models.CASCADE, related_name="import_run"
+    )
+    started_at = models.DateTimeField(help_text="When parsing the file began")
+    read_seconds = models.FloatField(help_text="Reading lines from disk")
+    parse_seconds = models.FloatField(help_text="Parsing lines into readings")
+    resolve_seconds = models.FloatField(
+        help_text="Finding or creating MPANs and meters"
+    )
+    insert_seconds = models.FloatField(help_text="Inserting readings")
+    finalize_seconds = models.FloatField(
+        help_text="Updating counters, latest readings and rollups"
+    )
+    total_seconds = models.FloatField()
+    bytes_read = models.PositiveBigIntegerField()
+    line_count = models.PositiveIntegerField()
+    reading_count = models.PositiveIntegerField(help_text="Readings imported")
+    rejected_count = models.PositiveIntegerField()
+    rows_per_second = models.FloatField(help_text="Readings imported per second")
+    query_count = models.PositiveIntegerField(help_text="Queries run while saving")
+
+    class Meta:
+        ordering = ["-started_at"]
+        verbose_name = "Import Run"
+        verbose_name_plural = "Import Runs"
+
+    def __str__(self):
+        return f"{self.flow_file.filename}: {self.reading_count} readings in {self.total_seconds:.2f}s"
+
+
+class ReadingRollup(models.Model):
+    """
+    Reading totals per flow file, day and reading type.
+
+    Maintained by ``meter_readings.rollups`` so the unfiltered readings
+    summary can be answered without scanning the readings table.
+    """
+
+    flow_file = models.ForeignKey(
+        FlowFile, on_delete=models.CASCADE, related_name="rollups"
+    )
+    day = models.DateField(help_text="Reading date (Europe/London)")
+    reading_type = models.CharField(max_length=10)
+    reading_count = models.PositiveIntegerField()
+    first_reading = models.DateTimeField()
+    last_reading = models.DateTimeField()
+
+    class Meta:
+        verbose_name = "Reading Rollup"
+        verbose_name_plural = "Reading Rollups"
+        unique_together = [["flow_file", "day", "reading_type"]]
+
+    def __str__(self):
+        return f"{self.flow_file.filename} {self.day} {self.reading_type}: {self.reading_count}"
+
+
+class LatestReading(models.Model):
+    """
+    The newest reading on each meter register.
+
+    Maintained by ``meter_readings.latest`` so current-state lookups for
+    many MPANs read one row per register instead of ordering readings.
+    """
+
+    meter = models.ForeignKey(
+        Meter, on_delete=models.CASCADE, related_name="latest_readings"
+    )
+    register_id = models.CharField(max_length=2, choices=Reading.REGISTER_CHOICES)
+    reading = models.ForeignKey(Reading, on_delete=models.CASCADE, related_name="+")
+    reading_date = models.DateTimeField()
+    reading_value = models.DecimalField(max_digits=12, decimal_places=3)
+    reading_type = models.CharField(max_length=10)
+
+    class Meta:
+        ordering = ["meter", "register_id"]
+        verbose_name = "Latest Reading"
+        verbose_name_plural = "Latest Readings"
+        unique_together = [["meter", "register_id"]]
+
+    def __str__(self):
+        return f"{self.meter.serial_number} {self.register_id}: {self.reading_value} on {self.reading_date.strftime('%Y-%m-%d')}"
+
+
+class DataVersion(models.Model):
+    """
+    Single-row counter bumped whenever imported data changes.
+
+    Cached API responses are keyed on it, so every process sees an
+    import straight away.
+    """
+
+    version = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Data Version"
+
+    def __str__(self):
+        return f"Data version {self.version}"
@@ -0,0 +1,196 @@
+"""
+Pagination classes for the meter readings API.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class ReadingKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over readings ordered by (reading_date, id).
+
+    Each page is fetched with a WHERE clause on the last row already seen
+    rather than an OFFSET, and no COUNT(*) is issued, so a deep page costs
+    the same as the first. The ordering is served by idx_reading_date, or
+    by idx_reading_meter_date when the queryset is limited to one meter.
+
+    Ordering is newest first unless ``ordering=reading_date`` is given.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    ordering_query_param = "ordering"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.descending = self.get_descending(request)
+
+        cursor = self.decode_cursor(request)
+        self.has_cursor = cursor is not None
+        self.reverse = cursor is not None and cursor[2]
+
+        # Walking backwards is the same query with the ordering flipped
+        descending = self.descending != self.reverse
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(f"{prefix}reading_date", f"{prefix}id")
+
+        if cursor is not None:
+            reading_date, pk, _ = cursor
+            if descending:
+                queryset = queryset.filter(reading_date__lte=reading_date).filter(
+                    Q(reading_date__lt=reading_date) | Q(id__lt=pk)
+                )
+            else:
+                queryset = queryset.filter(reading_date__gte=reading_date).filter(
+                    Q(reading_date__gt=reading_date) | Q(id__gt=pk)
+                )
+
+        results = list(queryset[: self.page_size + 1])
+        self.has_more = len(results) > self.page_size
+        results = results[: self.page_size]
+        if self.reverse:
+            results.reverse()
+
+        self.page = results
+        return results
+
+    def get_descending(self, request):
+        ordering = request.query_params.get(self.ordering_query_param)
+        if ordering in (None, "", "-reading_date"):
+            return True
+        if ordering == "reading_date":
+            return False
+        raise ValidationError(
+            {
+                self.ordering_query_param: (
+                    "Cursor pagination only supports ordering by "
+                    "reading_date or -reading_date"
+                )
+            }
+        )
+
+    def get_next_link(self):
+        # Going forwards there is a next page only if we over-fetched;
+        # after stepping backwards there is always the page we came from.
+        if not self.page or (not self.reverse and not self.has_more):
+            return None
+        return self.build_link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.page or not self.has_cursor:
+            return None
+        if self.reverse and not self.has_more:
+            return None
+        return self.build_link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def build_link(self, reading, reverse):
+        position = "|".join(
+            [reading.reading_date.isoformat(), str(reading.pk), "r" if reverse else "n"]
+        )
+        encoded = base64.urlsafe_b64encode(position.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        """Return (reading_date, id, reverse) from the request, or None."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = base64.urlsafe_b64decode(encoded.encode()).decode()
+            date_str, pk, direction = position.split("|")
+            reading_date = datetime.fromisoformat(date_str)
+            if reading_date.tzinfo is None or direction not in ("n", "r"):
+                raise ValueError(position)
+            return reading_date, int(pk), direction == "r"
+        except (TypeError, ValueError, UnicodeDecodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class ReadingPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset mode for readings.
+
+    Requests with ``pagination=cursor`` (to fetch the first page) or a
+    ``cursor`` parameter (from a next/previous link) are paged by
+    ReadingKeysetPagination instead; page-number responses are unchanged.
+    """
+
+    mode_query_param = "pagination"
+
+    def use_keyset(self, request):
+        params = request.query_params
+        return (
+            params.get(self.mode_query_param) == "cursor"
+            or ReadingKeysetPagination.cursor_query_param in params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request):
+            self.keyset = ReadingKeysetPagination()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_next_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_next_link()
+        return super().get_next_link()
+
+    def get_previous_link(self):
+        if self.keyset is not None:
+            return self.keyset.get_previous_link()
+        return super().get_previous_link()
+
+    def get_schema_operation_parameters(self, view):
+        return super().get_schema_operation_parameters(view) + [
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Set to `cursor` for keyset pagination",
+                "schema": {"type": "string", "enum": ["cursor"]},
+            },
+            {
+                "name": ReadingKeysetPagination.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Cursor from a keyset page's next/previous link",
+                "schema": {"type": "string"},
+            },
+        ]
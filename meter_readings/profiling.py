@@ -0,0 +1,154 @@
+"""
+Opt-in request profiling for the API.
+
+With ``API_PROFILING`` on, ``ProfilingMiddleware`` times every request
+under ``API_PROFILING_PATH_PREFIX``, counts its queries and the time
+spent in them, and adds a ``Server-Timing`` header. Requests slower than
+``API_PROFILING_SLOW_MS``, or running the same query shape at least
+``API_PROFILING_REPEAT_THRESHOLD`` times (the N+1 pattern), are kept in a
+bounded in-process buffer shown on the staff-only profiling page.
+
+Queries are observed with a connection execute wrapper rather than
+``DEBUG`` query logging, so it is safe to enable in production. Each
+process keeps its own buffer.
+"""
+
+import logging
+import threading
+import time
+from collections import Counter, deque
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger("meter_readings")
+
+# Repeated query shapes kept per sampled request
+REPEATED_QUERIES_SHOWN = 5
+
+_samples = deque()
+_samples_lock = threading.Lock()
+
+
+def recent_samples():
+    """Return the sampled requests, newest first."""
+    with _samples_lock:
+        return list(reversed(_samples))
+
+
+def clear_samples():
+    with _samples_lock:
+        _samples.clear()
+
+
+def _resize_samples(size):
+    global _samples
+    with _samples_lock:
+        if _samples.maxlen != size:
+            _samples = deque(_samples, maxlen=size)
+
+
+def _record_sample(sample):
+    with _samples_lock:
+        _samples.append(sample)
+
+
+class QueryProfile:
+    """
+    Execute wrapper collecting query count, time and repeats for one request.
+
+    Queries with the same SQL are the same shape whatever their parameters;
+    those with the same parameters too are exact duplicates.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes = Counter()
+        self.duplicates = 0
+        self._seen = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - start
+            self.count += 1
+            self.shapes[sql] += 1
+            key = (sql, repr(params))
+            if key in self._seen:
+                self.duplicates += 1
+            else:
+                self._seen.add(key)
+
+    def repeated(self, threshold):
+        """Return [(sql, count)] for shapes run at least ``threshold`` times."""
+        return [
+            (sql, count)
+            for sql, count in self.shapes.most_common(REPEATED_QUERIES_SHOWN)
+            if count >= threshold
+        ]
+
+
+class ProfilingMiddleware:
+    """
+    Time API requests and their queries when ``API_PROFILING`` is set.
+
+    Removes itself from the middleware chain when profiling is off. A
+    streamed response is timed until its headers are ready, not until
+    the last chunk is sent.
+    """
+
+    def __init__(self, get_response):
+        if not settings.API_PROFILING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.path_prefix = settings.API_PROFILING_PATH_PREFIX
+        self.slow_ms = settings.API_PROFILING_SLOW_MS
+        self.repeat_threshold = settings.API_PROFILING_REPEAT_THRESHOLD
+        _resize_samples(settings.API_PROFILING_SAMPLES)
+
+    def __call__(self, request):
+        if not request.path.startswith(self.path_prefix):
+            return self.get_response(request)
+
+        queries = QueryProfile()
+        start = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        total_ms = (time.perf_counter() - start) * 1000
+        db_ms = queries.seconds * 1000
+
+        response["Server-Timing"] = (
+            f"total;dur={total_ms:.1f}, "
+            f'db;dur={db_ms:.1f};desc="{queries.count} queries"'
+        )
+
+        repeated = queries.repeated(self.repeat_threshold)
+        if total_ms >= self.slow_ms or repeated:
+            _record_sample(
+                {
+                    "at": timezone.now(),
+                    "method": request.method,
+                    "path": request.get_full_path(),
+                    "status": response.status_code,
+                    "total_ms": round(total_ms, 1),
+                    "db_ms": round(db_ms, 1),
+                    "queries": queries.count,
+                    "duplicates": queries.duplicates,
+                    "repeated": repeated,
+                }
+            )
+            logger.info(
+                "Profiled %s %s: %.1fms, %d queries in %.1fms, %d duplicate(s)",
+                request.method,
+                request.path,
+                total_ms,
+                queries.count,
+                db_ms,
+                queries.duplicates,
+            )
+        return response
@@ -0,0 +1,39 @@
+"""Lightweight record types for parsed D0010 data."""
+
+
+class ParsedReading:
+    """
+    A single 030 reading together with its 026 MPAN and 028 meter context.
+
+    Slotted to keep per-reading overhead small on large files; the MPAN,
+    serial, meter type and register strings are interned by the parser so
+    every reading under the same meter shares one copy of each.
+    """
+
+    __slots__ = (
+        "mpan",
+        "meter_serial",
+        "meter_type",
+        "register_id",
+        "reading_date",
+        "reading_value",
+    )
+
+    # Every reading in a D0010 flow is an actual read
+    reading_type = "ACTUAL"
+
+    def __init__(
+        self, mpan, meter_serial, meter_type, register_id, reading_date, reading_value
+    ):
+        self.mpan = mpan
+        self.meter_serial = meter_serial
+        self.meter_type = meter_type
+        self.register_id = register_id
+        self.reading_date = reading_date
+        self.reading_value = reading_value
+
+    def __repr__(self):
+        return (
+            f"ParsedReading({self.mpan}, {self.meter_serial}, {self.register_id}, "
+            f"{self.reading_date.isoformat()}, {self.reading_value})"
+        )
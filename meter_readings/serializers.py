@@ -5,7 +5,15 @@ Converts model instances to/from JSON.
 
 from rest_framework import serializers
 
-from .models import FlowFile, Meter, MeterPoint, Reading
+from .models import (
+    FlowFile,
+    ImportRun,
+    LatestReading,
+    Meter,
+    MeterPoint,
+    Reading,
+    RejectedLine,
+)
 
 
 class FlowFileSerializer(serializers.ModelSerializer):
@@ -18,17 +26,53 @@ class FlowFileSerializer(serializers.ModelSerializer):
             "filename",
             "file_reference",
             "record_count",
+            "rejected_count",
+            "content_hash",
             "imported_at",
         ]
-        read_only_fields = ["id", "imported_at"]
+        read_only_fields = ["id", "rejected_count", "imported_at"]
+
+
+class RejectedLineSerializer(serializers.ModelSerializer):
+    """Serializer for lines quarantined from an import."""
+
+    class Meta:
+        model = RejectedLine
+        fields = ["line_number", "raw_line", "reason"]
+        read_only_fields = fields
+
+
+class ImportRunSerializer(serializers.ModelSerializer):
+    """Serializer for the phase timings and counts of one import."""
+
+    filename = serializers.CharField(source="flow_file.filename", read_only=True)
+
+    class Meta:
+        model = ImportRun
+        fields = [
+            "id",
+            "flow_file",
+            "filename",
+            "started_at",
+            "read_seconds",
+            "parse_seconds",
+            "resolve_seconds",
+            "insert_seconds",
+            "finalize_seconds",
+            "total_seconds",
+            "bytes_read",
+            "line_count",
+            "reading_count",
+            "rejected_count",
+            "rows_per_second",
+            "query_count",
+        ]
+        read_only_fields = fields
 
 
 class MeterPointSerializer(serializers.ModelSerializer):
     """Serializer for meter points (MPANs)."""
 
-    meter_count = serializers.IntegerField(read_only=True)
-    reading_count = serializers.IntegerField(read_only=True)
-
     class Meta:
         model = MeterPoint
         fields = [
@@ -38,15 +82,24 @@ class MeterPointSerializer(serializers.ModelSerializer):
             "updated_at",
             "meter_count",
             "reading_count",
+            "first_reading_date",
+            "last_reading_date",
+        ]
+        read_only_fields = [
+            "id",
+            "created_at",
+            "updated_at",
+            "meter_count",
+            "reading_count",
+            "first_reading_date",
+            "last_reading_date",
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
 
 
 class MeterSerializer(serializers.ModelSerializer):
     """Serializer for meters."""
 
     mpan = serializers.CharField(source="meter_point.mpan", read_only=True)
-    reading_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Meter
@@ -58,8 +111,17 @@ class MeterSerializer(serializers.ModelSerializer):
             "created_at",
             "updated_at",
             "reading_count",
+            "first_reading_date",
+            "last_reading_date",
+        ]
+        read_only_fields = [
+            "id",
+            "created_at",
+            "updated_at",
+            "reading_count",
+            "first_reading_date",
+            "last_reading_date",
         ]
-        read_only_fields = ["id", "created_at", "updated_at"]
 
 
 class ReadingSerializer(serializers.ModelSerializer):
@@ -106,6 +168,36 @@ class MeterPointDetailSerializer(MeterPointSerializer):
         fields = MeterPointSerializer.Meta.fields + ["meters"]
 
 
+class LatestReadingSerializer(serializers.ModelSerializer):
+    """The newest reading on a meter register."""
+
+    mpan = serializers.CharField(source="meter.meter_point.mpan", read_only=True)
+    meter_serial = serializers.CharField(source="meter.serial_number", read_only=True)
+
+    class Meta:
+        model = LatestReading
+        fields = [
+            "mpan",
+            "meter_serial",
+            "register_id",
+            "reading",
+            "reading_date",
+            "reading_value",
+            "reading_type",
+        ]
+        read_only_fields = fields
+
+
+class ReadingBatchSerializer(serializers.Serializer):
+    """Request body for looking up the readings of many MPANs at once."""
+
+    mpans = serializers.ListField(
+        child=serializers.CharField(max_length=13), min_length=1, max_length=5000
+    )
+    date_from = serializers.DateField(required=False)
+    date_to = serializers.DateField(required=False)
+
+
 class ReadingSummarySerializer(serializers.Serializer):
     """Summary statistics for readings."""
 
@@ -114,3 +206,19 @@ class ReadingSummarySerializer(serializers.Serializer):
     total_meters = serializers.IntegerField()
     date_range = serializers.DictField()
     reading_types = serializers.DictField()
+
+
+class ConsumptionBucketSerializer(serializers.Serializer):
+    """Consumption on one register over one period."""
+
+    period = serializers.DateField()
+    register_id = serializers.CharField()
+    consumption = serializers.DecimalField(max_digits=15, decimal_places=3)
+    readings = serializers.IntegerField()
+
+
+class ConsumptionSerializer(serializers.Serializer):
+    """Consumption per period for a meter point or meter."""
+
+    bucket = serializers.CharField()
+    results = ConsumptionBucketSerializer(many=True)
@@ -0,0 +1,100 @@
+"""
+Synthetic D0010 flow files for load testing the importer.
+
+Files are generated from a seeded ``random.Random``, so the same options
+always produce byte-identical files. Each register gets a cumulative,
+increasing series of reads on a fixed interval, optionally joined by
+reads around the year's two BST clock changes (including the repeated
+autumn hour and the missing spring hour) and by repeated 030 lines.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+
+# Register ids handed out in order, as many as requested
+SYNTHETIC_REGISTERS = ("01", "02", "03", "DY", "NT", "S", "TO", "A1", "WK", "OT")
+
+SYNTHETIC_METER_TYPES = ("S", "C", "D", "P")
+
+# Local times written on each clock change day: before, inside and after
+# the missing (spring) or repeated (autumn) hour
+CLOCK_CHANGE_TIMES = ((0, 30), (1, 30), (3, 0))
+
+
+def last_sunday(year, month):
+    """Return the last Sunday of ``month``, when UK clocks change."""
+    day = date(year, month + 1, 1) - timedelta(days=1)
+    return day - timedelta(days=(day.weekday() + 1) % 7)
+
+
+def reading_times(start, count, interval, dst=True):
+    """
+    Return sorted local reading times for one register.
+
+    ``count`` reads every ``interval`` from ``start``, plus the clock
+    change reads of each year covered when ``dst`` is set.
+    """
+    times = {start + interval * i for i in range(count)}
+    if dst and times:
+        for year in range(min(times).year, max(times).year + 1):
+            for month in (3, 10):
+                day = last_sunday(year, month)
+                times.update(
+                    datetime(year, month, day.day, hour, minute)
+                    for hour, minute in CLOCK_CHANGE_TIMES
+                )
+    return sorted(times)
+
+
+def write_d0010(
+    file,
+    file_reference,
+    first_mpan,
+    mpans,
+    meters_per_mpan=1,
+    registers=2,
+    readings=30,
+    start=datetime(2024, 3, 1),
+    interval=timedelta(days=1),
+    dst=True,
+    duplicate_rate=0.0,
+    seed=0,
+):
+    """
+    Write one synthetic D0010 flow to the text file ``file``.
+
+    MPANs run consecutively from ``first_mpan``. Each 030 line is written
+    twice with probability ``duplicate_rate``, as in a resent block.
+    Returns the number of distinct readings written.
+    """
+    rng = random.Random(seed)
+    register_ids = SYNTHETIC_REGISTERS[:registers]
+    times = [
+        moment.strftime("%Y%m%d%H%M%S")
+        for moment in reading_times(start, readings, interval, dst)
+    ]
+    created = start.strftime("%Y%m%d%H%M%S")
+    lines = 0
+    written = 0
+
+    file.write(f"ZHV|{file_reference}|D0010002|D|UDMS|X|MRCY|{created}||||OPER|\n")
+    for offset in range(mpans):
+        file.write(f"026|{first_mpan + offset:013d}|V|\n")
+        lines += 1
+        for meter in range(meters_per_mpan):
+            serial = f"SYN{first_mpan + offset:013d}{meter:02d}"
+            file.write(f"028|{serial}|{rng.choice(SYNTHETIC_METER_TYPES)}|\n")
+            lines += 1
+            for register_id in register_ids:
+                value = rng.randint(1000, 90000) + rng.randint(0, 999) / 1000
+                for timestamp in times:
+                    line = f"030|{register_id}|{timestamp}|{value:.3f}|||T|N|\n"
+                    file.write(line)
+                    lines += 1
+                    if rng.random() < duplicate_rate:
+                        file.write(line)
+                        lines += 1
+                    written += 1
+                    value += rng.randint(0, 50000) / 1000
+    file.write(f"ZPT|{file_reference}|{lines}||{mpans}|{created}|\n")
+    return written
@@ -5,13 +5,18 @@ Tests admin dashboard, file import, and testing utilities.
 
 import os
 import tempfile
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from unittest.mock import patch
 
 from django.contrib.auth.models import User
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 
-from meter_readings.models import FlowFile, Meter, MeterPoint, Reading
+from meter_readings.counters import recompute_all_counters
+from meter_readings.counts import invalidate_counts
+from meter_readings.models import FlowFile, ImportRun, Meter, MeterPoint, Reading
 
 
 class AdminViewsTest(TestCase):
@@ -47,6 +52,29 @@ class AdminViewsTest(TestCase):
         response = self.client.get("/admin/testing/")
         self.assertEqual(response.status_code, 200)
 
+    def test_testing_dashboard_shows_import_timings(self):
+        """Test recently imported files show their ImportRun timings."""
+        ImportRun.objects.create(
+            flow_file=self.flow_file,
+            started_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+            read_seconds=0.001,
+            parse_seconds=0.25,
+            resolve_seconds=0.002,
+            insert_seconds=0.5,
+            finalize_seconds=0.01,
+            total_seconds=0.8,
+            bytes_read=1024,
+            line_count=10,
+            reading_count=1,
+            rejected_count=0,
+            rows_per_second=1234.4,
+            query_count=17,
+        )
+        self.client.force_login(self.admin_user)
+        response = self.client.get("/admin/testing/")
+        self.assertContains(response, "0.250s")
+        self.assertContains(response, "<td>1234</td>", html=True)
+
     def test_clear_all_action(self):
         """Test clear_all action deletes all data."""
         self.client.force_login(self.admin_user)
@@ -61,3 +89,186 @@ class AdminViewsTest(TestCase):
         response = self.client.post("/admin/testing/", {"action": "clear_all"})
         self.assertEqual(response.status_code, 302)
         self.assertEqual(Reading.objects.count(), 0)
+
+
+class AdminChangelistQueryTest(TestCase):
+    """Test admin changelists run a fixed number of queries per page."""
+
+    CHANGELISTS = [
+        "/admin/meter_readings/meterpoint/",
+        "/admin/meter_readings/meter/",
+        "/admin/meter_readings/reading/",
+    ]
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(
+            User.objects.create_superuser(
+                username="admin", email="admin@test.com", password="testpass123"
+            )
+        )
+        self.flow_file = FlowFile.objects.create(
+            filename="test.uff", file_reference="TEST001"
+        )
+        self.meter_points = 0
+
+    def add_meter_points(self, count):
+        base = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+        for _ in range(count):
+            meter_point = MeterPoint.objects.create(
+                mpan=f"{1234567890000 + self.meter_points}"
+            )
+            self.meter_points += 1
+            for serial in ("A", "B"):
+                meter = Meter.objects.create(
+                    meter_point=meter_point, serial_number=f"{meter_point.mpan}{serial}"
+                )
+                for day in range(2):
+                    Reading.objects.create(
+                        meter=meter,
+                        register_id="01",
+                        reading_date=base + timedelta(days=day),
+                        reading_value=day,
+                        flow_file=self.flow_file,
+                    )
+        recompute_all_counters()
+        invalidate_counts()
+
+    def changelist_queries(self, url, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_query_count_independent_of_rows(self):
+        """Test a page of 40 rows costs the same queries as a page of 4."""
+        self.add_meter_points(2)
+        small = [self.changelist_queries(url) for url in self.CHANGELISTS]
+        self.add_meter_points(18)
+        large = [self.changelist_queries(url) for url in self.CHANGELISTS]
+        self.assertEqual(small, large)
+        for count in large:
+            self.assertLess(count, 15)
+
+    def test_count_columns_are_sortable(self):
+        """Test the count columns order by the stored counters."""
+        self.add_meter_points(2)
+        Meter.objects.filter(serial_number="1234567890001B").update(reading_count=50)
+        MeterPoint.objects.filter(mpan="1234567890001").update(reading_count=50)
+
+        # "o" takes 1-based list_display positions of the reading_count column
+        response = self.client.get("/admin/meter_readings/meter/", {"o": "-4"})
+        self.assertEqual(
+            response.context["cl"].result_list[0].serial_number, "1234567890001B"
+        )
+        response = self.client.get("/admin/meter_readings/meterpoint/", {"o": "-3"})
+        self.assertEqual(response.context["cl"].result_list[0].mpan, "1234567890001")
+
+
+class AdminReadingsPanelTest(TestCase):
+    """Test meter change pages load readings through the paginated panel."""
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(
+            User.objects.create_superuser(
+                username="admin", email="admin@test.com", password="testpass123"
+            )
+        )
+        flow_file = FlowFile.objects.create(
+            filename="test.uff", file_reference="TEST001"
+        )
+        self.meter_point = MeterPoint.objects.create(mpan="1234567890123")
+        self.meters = [
+            Meter.objects.create(meter_point=self.meter_point, serial_number=serial)
+            for serial in ("SHORT", "LONG")
+        ]
+        base = datetime(2025, 1, 1, 12, 0, tzinfo=timezone.utc)
+        for meter, days in zip(self.meters, (3, 120)):
+            Reading.objects.bulk_create(
+                Reading(
+                    meter=meter,
+                    register_id="01",
+                    reading_date=base + timedelta(days=day),
+                    reading_value=day,
+                    flow_file=flow_file,
+                )
+                for day in range(days)
+            )
+        recompute_all_counters()
+
+    def test_change_page_cost_independent_of_history(self):
+        """Test the meter change page no longer renders readings inline."""
+        # Warm per-process caches (content types, admin URL resolution)
+        self.client.get(f"/admin/meter_readings/meter/{self.meters[0].pk}/change/")
+        costs = []
+        for meter in self.meters:
+            url = f"/admin/meter_readings/meter/{meter.pk}/change/"
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(
+                response, f"/admin/meter_readings/meter/{meter.pk}/readings/"
+            )
+            self.assertNotContains(response, "readings-INITIAL_FORMS")
+            costs.append(len(queries))
+        self.assertEqual(costs[0], costs[1])
+
+    def test_panel_paginates_newest_first(self):
+        """Test the panel serves fixed-size pages with older/newer links."""
+        url = f"/admin/meter_readings/meter/{self.meters[1].pk}/readings/"
+        response = self.client.get(url)
+        page = response.context["page"]
+        self.assertEqual(len(page), 50)
+        self.assertEqual(page.paginator.count, 120)
+        self.assertEqual(page[0].reading_date.date().isoformat(), "2025-04-30")
+        self.assertContains(response, f'href="{url}?page=2"')
+
+        response = self.client.get(url, {"page": 3})
+        self.assertEqual(len(response.context["page"]), 20)
+
+    def test_panel_date_filter(self):
+        """Test the panel filters by whole days and counts the filtered set."""
+        url = f"/admin/meter_readings/meter/{self.meters[1].pk}/readings/"
+        response = self.client.get(
+            url, {"date_from": "2025-01-10", "date_to": "2025-01-19"}
+        )
+        page = response.context["page"]
+        self.assertEqual(page.paginator.count, 10)
+        self.assertEqual(page[0].reading_date.date().isoformat(), "2025-01-19")
+
+    def test_panel_ignores_bad_dates(self):
+        """Test malformed and impossible dates are ignored, not a server error."""
+        url = f"/admin/meter_readings/meter/{self.meters[1].pk}/readings/"
+        for params in (
+            {"date_from": "garbage"},
+            {"date_from": "2025-02-30"},
+            {"date_to": "2025-13-01"},
+        ):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context["page"].paginator.count, 120)
+
+    def test_meter_point_panel_lists_all_meters(self):
+        """Test the meter point panel spans its meters and names each one."""
+        url = f"/admin/meter_readings/meterpoint/{self.meter_point.pk}/readings/"
+        response = self.client.get(url)
+        self.assertEqual(response.context["page"].paginator.count, 123)
+        self.assertContains(response, "<th>Meter</th>")
+
+    def test_panel_unknown_object(self):
+        """Test missing and malformed IDs are a 404, not a server error."""
+        for object_id in (self.meters[1].pk + 100, "not-a-number"):
+            response = self.client.get(
+                f"/admin/meter_readings/meter/{object_id}/readings/"
+            )
+            self.assertEqual(response.status_code, 404)
+
+    def test_panel_requires_staff(self):
+        """Test the panel URL is behind the admin login."""
+        self.client.logout()
+        response = self.client.get(
+            f"/admin/meter_readings/meter/{self.meters[0].pk}/readings/"
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("/admin/login/", response.url)
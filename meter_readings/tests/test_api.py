@@ -1,14 +1,40 @@
 """API endpoint tests for meter readings."""
 
-from datetime import datetime, timezone
+import csv
+import json
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from io import StringIO
+from unittest.mock import patch
 
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
 from rest_framework import status
 from rest_framework.test import APIClient
 
+from meter_readings.api_views import ReadingViewSet
+from meter_readings.consumption import (
+    bound_readings,
+    database_consumption,
+    python_consumption,
+)
+from meter_readings.counters import recompute_all_counters
 from meter_readings.models import FlowFile, Meter, MeterPoint, Reading
+from meter_readings.pagination import ReadingKeysetPagination
+from meter_readings.rollups import refresh_rollups
 
+# Serve every request fresh: TestCase never commits, so data changes made
+# during a test do not bump the data version cached responses are keyed on
+NO_API_CACHE = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "api": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+}
 
+
+@override_settings(CACHES=NO_API_CACHE)
 class APITestCase(TestCase):
     """Test REST API endpoints."""
 
@@ -48,3 +74,595 @@ class APITestCase(TestCase):
         response = self.client.get("/api/readings/summary/", follow=True)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["total_readings"], 1)
+
+
+@override_settings(CACHES=NO_API_CACHE)
+class SummaryRollupTest(TestCase):
+    """Test the readings summary is served from rollups when it can be."""
+
+    def setUp(self):
+        self.client = APIClient()
+        files = [
+            FlowFile.objects.create(filename=f"file{i}.uff", file_reference=f"F{i}")
+            for i in range(2)
+        ]
+        base = datetime(2025, 3, 30, 0, 30, tzinfo=timezone.utc)
+        for index, mpan in enumerate(["1234567890123", "9876543210987"]):
+            meter_point = MeterPoint.objects.create(mpan=mpan)
+            meter = Meter.objects.create(
+                meter_point=meter_point, serial_number=f"SERIAL{index}"
+            )
+            for hour in range(6):
+                Reading.objects.create(
+                    meter=meter,
+                    register_id="01",
+                    reading_date=base + timedelta(hours=hour * 5),
+                    reading_value=hour,
+                    reading_type="ACTUAL" if hour % 3 else "ESTIMATED",
+                    flow_file=files[hour % 2],
+                )
+        refresh_rollups([flow_file.pk for flow_file in files])
+        recompute_all_counters()
+        self.url = "/api/readings/summary/"
+
+    def live_response(self, params=None):
+        with patch("meter_readings.api_views.rollup_summary", return_value=None):
+            return self.client.get(self.url, params).json()
+
+    def test_rollup_matches_live_summary(self):
+        """Test the rollup path returns exactly what the live query does."""
+        with patch.object(ReadingViewSet, "live_summary", side_effect=AssertionError):
+            rolled_up = self.client.get(self.url).json()
+        self.assertEqual(rolled_up, self.live_response())
+        self.assertEqual(rolled_up["total_readings"], 12)
+        self.assertEqual(rolled_up["total_meters"], 2)
+        self.assertEqual(rolled_up["reading_types"], {"ACTUAL": 8, "ESTIMATED": 4})
+
+    def test_filtered_summary_uses_live_query(self):
+        """Test filters bypass the rollup and still agree with it per MPAN."""
+        response = self.client.get(self.url, {"mpan": "1234567890123"}).json()
+        self.assertEqual(response["total_readings"], 6)
+        self.assertEqual(response["total_meter_points"], 1)
+        self.assertEqual(response["reading_types"], {"ACTUAL": 4, "ESTIMATED": 2})
+
+    def test_file_without_rollup_falls_back(self):
+        """Test a flow file with no rollup sends the summary to the live query."""
+        flow_file = FlowFile.objects.create(filename="late.uff", file_reference="L")
+        Reading.objects.create(
+            meter=Meter.objects.first(),
+            register_id="02",
+            reading_date=datetime(2025, 6, 1, tzinfo=timezone.utc),
+            reading_value=1,
+            flow_file=flow_file,
+        )
+        response = self.client.get(self.url).json()
+        self.assertEqual(response["total_readings"], 13)
+        self.assertEqual(response, self.live_response())
+
+    def test_admin_delete_refreshes_rollup(self):
+        """Test deleting a reading in the admin keeps the rollup in step."""
+        User.objects.create_superuser("admin", "admin@test.com", "pass")
+        self.client.login(username="admin", password="pass")
+        reading = Reading.objects.filter(reading_type="ESTIMATED").first()
+        self.client.post(
+            f"/admin/meter_readings/reading/{reading.pk}/delete/", {"post": "yes"}
+        )
+        self.assertFalse(Reading.objects.filter(pk=reading.pk).exists())
+
+        response = self.client.get(self.url).json()
+        self.assertEqual(response["reading_types"], {"ACTUAL": 8, "ESTIMATED": 3})
+        self.assertEqual(response, self.live_response())
+        self.assertEqual(Meter.objects.get(pk=reading.meter_id).reading_count, 5)
+
+    def test_list_endpoints_use_stored_counters(self):
+        """Test meter and meter point lists read and order by the counters."""
+        Meter.objects.filter(serial_number="SERIAL1").update(reading_count=99)
+        response = self.client.get("/api/meters/", {"ordering": "-reading_count"})
+        self.assertEqual(response.data["results"][0]["serial_number"], "SERIAL1")
+        self.assertEqual(response.data["results"][0]["reading_count"], 99)
+
+        response = self.client.get("/api/meter-points/")
+        self.assertEqual(
+            [
+                (row["meter_count"], row["reading_count"])
+                for row in response.data["results"]
+            ],
+            [(1, 6), (1, 6)],
+        )
+
+
+@override_settings(CACHES=NO_API_CACHE)
+@patch.object(ReadingKeysetPagination, "page_size", 2)
+class CursorPaginationTest(TestCase):
+    """Test keyset pagination of readings."""
+
+    def setUp(self):
+        self.client = APIClient()
+        flow_file = FlowFile.objects.create(
+            filename="test.uff", file_reference="TEST001", record_count=5
+        )
+        meter_point = MeterPoint.objects.create(mpan="1234567890123")
+        self.meter = Meter.objects.create(
+            meter_point=meter_point, serial_number="TEST001", meter_type="S"
+        )
+        base = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+        # Registers share timestamps, so pages must break ties on id
+        self.readings = [
+            Reading.objects.create(
+                meter=self.meter,
+                register_id=register,
+                reading_date=base + timedelta(days=day),
+                reading_value=100 + day,
+                flow_file=flow_file,
+            )
+            for day in range(3)
+            for register in ("01", "02")
+        ]
+
+    def collect(self, url, link="next"):
+        ids = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn("count", response.data)
+            ids.extend(row["id"] for row in response.data["results"])
+            url = response.data[link]
+            pages += 1
+        return ids, pages
+
+    def test_walks_all_readings_newest_first(self):
+        """Test next links visit every reading once in (date, id) order."""
+        ids, pages = self.collect("/api/readings/?pagination=cursor")
+        expected = sorted(
+            self.readings, key=lambda r: (r.reading_date, r.id), reverse=True
+        )
+        self.assertEqual(ids, [r.id for r in expected])
+        self.assertEqual(pages, 3)
+
+    def test_ascending_and_previous_links(self):
+        """Test ascending order and walking back with previous links."""
+        first = self.client.get(
+            "/api/readings/?pagination=cursor&ordering=reading_date"
+        )
+        self.assertIsNone(first.data["previous"])
+        second = self.client.get(first.data["next"])
+        third = self.client.get(second.data["next"])
+        self.assertIsNone(third.data["next"])
+
+        back = self.client.get(third.data["previous"])
+        self.assertEqual(back.data["results"], second.data["results"])
+        back = self.client.get(back.data["previous"])
+        self.assertEqual(back.data["results"], first.data["results"])
+        self.assertIsNone(back.data["previous"])
+        self.assertEqual(
+            [row["id"] for row in first.data["results"]],
+            [self.readings[0].id, self.readings[1].id],
+        )
+
+    def test_meter_readings_action_supports_cursor(self):
+        """Test the per-meter readings action pages by cursor on request."""
+        ids, _ = self.collect(
+            f"/api/meters/{self.meter.pk}/readings/?pagination=cursor"
+        )
+        self.assertEqual(len(ids), 6)
+
+        response = self.client.get(f"/api/meters/{self.meter.pk}/readings/")
+        self.assertEqual(response.data["count"], 6)
+
+    def test_invalid_cursor_and_ordering(self):
+        """Test malformed cursors and unsupported orderings are rejected."""
+        response = self.client.get("/api/readings/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(
+            "/api/readings/?pagination=cursor&ordering=reading_value"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_page_number_pagination_unchanged(self):
+        """Test requests without cursor mode still get counted pages."""
+        response = self.client.get("/api/readings/")
+        self.assertEqual(response.data["count"], 6)
+
+
+@override_settings(CACHES=NO_API_CACHE)
+class ReadingsActionTest(TestCase):
+    """Test paginated and streamed per-meter / per-MPAN readings."""
+
+    def setUp(self):
+        self.client = APIClient()
+        flow_file = FlowFile.objects.create(
+            filename="test.uff", file_reference="TEST001", record_count=3
+        )
+        self.meter_point = MeterPoint.objects.create(mpan="1234567890123")
+        meter = Meter.objects.create(
+            meter_point=self.meter_point, serial_number="TEST001", meter_type="S"
+        )
+        base = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+        for day in range(3):
+            Reading.objects.create(
+                meter=meter,
+                register_id="01",
+                reading_date=base + timedelta(days=day),
+                reading_value=100 + day,
+                flow_file=flow_file,
+            )
+        self.url = f"/api/meter-points/{self.meter_point.pk}/readings/"
+
+    def test_readings_action_is_paginated(self):
+        """Test the action returns a page rather than the whole history."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        self.assertEqual(len(response.data["results"]), 3)
+        self.assertEqual(response.data["results"][0]["mpan"], "1234567890123")
+
+    def test_stream_ndjson(self):
+        """Test NDJSON streaming yields one reading per line, newest first."""
+        response = self.client.get(self.url, {"stream": "ndjson"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(
+            [row["reading_value"] for row in rows], ["102.000", "101.000", "100.000"]
+        )
+
+    def test_stream_json_matches_paginated_results(self):
+        """Test the streamed JSON array matches the paginated rows."""
+        streamed = json.loads(
+            b"".join(self.client.get(self.url, {"stream": "json"}).streaming_content)
+        )
+        paged = self.client.get(self.url, format="json").json()["results"]
+        self.assertEqual(streamed, paged)
+
+    def test_invalid_stream_format(self):
+        """Test unknown stream formats are rejected."""
+        response = self.client.get(self.url, {"stream": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ExportTest(TestCase):
+    """Test the bulk NDJSON/CSV export endpoint and command."""
+
+    def setUp(self):
+        self.client = APIClient()
+        flow_file = FlowFile.objects.create(
+            filename="test.uff", file_reference="TEST001", record_count=4
+        )
+        base = datetime(2025, 1, 15, 12, 0, tzinfo=timezone.utc)
+        for index, mpan in enumerate(["1234567890123", "9876543210987"]):
+            meter_point = MeterPoint.objects.create(mpan=mpan)
+            meter = Meter.objects.create(
+                meter_point=meter_point, serial_number=f"SERIAL{index}", meter_type="S"
+            )
+            for day in range(2):
+                Reading.objects.create(
+                    meter=meter,
+                    register_id="01",
+                    reading_date=base + timedelta(days=day * 2 + index),
+                    reading_value=100 + day,
+                    flow_file=flow_file,
+                )
+        self.url = "/api/readings/export/"
+
+    def test_export_ndjson_matches_serializer_fields(self):
+        """Test NDJSON rows carry the API's values, oldest first."""
+        response = self.client.get(self.url, HTTP_ACCEPT="application/x-ndjson")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(len(rows), 4)
+
+        dates = [row["reading_date"] for row in rows]
+        self.assertEqual(dates, sorted(dates))
+
+        api_row = self.client.get(f"/api/readings/{rows[0]['id']}/").json()
+        for field in ["mpan", "meter_serial", "register_id", "reading_value"]:
+            self.assertEqual(rows[0][field], api_row[field])
+        self.assertEqual(rows[0]["flow_filename"], "test.uff")
+        self.assertEqual(rows[0]["reading_date"], "2025-01-15T12:00:00Z")
+
+    def test_export_csv_with_filters(self):
+        """Test CSV export applies the readings list filters."""
+        response = self.client.get(
+            self.url,
+            {
+                "export_format": "csv",
+                "mpan": "1234567890123",
+                "date_from": "2025-01-16",
+            },
+        )
+        self.assertEqual(response["Content-Type"], "text/csv")
+        reader = csv.DictReader(
+            b"".join(response.streaming_content).decode().splitlines()
+        )
+        rows = list(reader)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["mpan"], "1234567890123")
+        self.assertEqual(rows[0]["reading_value"], "101.000")
+
+    def test_invalid_export_format(self):
+        """Test unknown export formats are rejected."""
+        response = self.client.get(self.url, {"export_format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_invalid_dates_rejected_before_streaming(self):
+        """Test malformed and impossible dates are a 400, not a broken stream."""
+        for params in (
+            {"date_from": "notadate"},
+            {"date_to": "2025-02-30"},
+            {"export_format": "csv", "date_from": "2025-13-01"},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertFalse(response.streaming)
+        response = self.client.get("/api/readings/", {"date_from": "notadate"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_command_rejects_invalid_dates(self):
+        """Test the command reports a bad date instead of failing mid-export."""
+        with self.assertRaisesMessage(CommandError, "--date-to"):
+            call_command(
+                "export_readings", "--date-to", "2025-02-30", stdout=StringIO()
+            )
+
+    def test_export_command_matches_endpoint(self):
+        """Test the management command writes the same rows as the endpoint."""
+        out = StringIO()
+        call_command("export_readings", "--meter-serial", "SERIAL1", stdout=out)
+        response = self.client.get(self.url, {"meter_serial": "SERIAL1"})
+        self.assertEqual(out.getvalue(), b"".join(response.streaming_content).decode())
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+
+@override_settings(CACHES=NO_API_CACHE)
+class ConsumptionTest(TestCase):
+    """Test consumption buckets built from consecutive register readings."""
+
+    def setUp(self):
+        self.client = APIClient()
+        flow_file = FlowFile.objects.create(filename="test.uff", file_reference="T1")
+        self.meter_point = MeterPoint.objects.create(mpan="1234567890123")
+        old_meter = Meter.objects.create(
+            meter_point=self.meter_point, serial_number="OLD"
+        )
+        self.new_meter = Meter.objects.create(
+            meter_point=self.meter_point, serial_number="NEW"
+        )
+        readings = [
+            (old_meter, "01", 30, 100),
+            (old_meter, "01", 31, 110),
+            (old_meter, "01", 32, 125),
+            (old_meter, "01", 33, 130),
+            (old_meter, "02", 30, 50),
+            (old_meter, "02", 32, 58),
+            # An exchanged meter starts from zero rather than the old total
+            (self.new_meter, "01", 32, 0),
+            (self.new_meter, "01", 33, 7),
+        ]
+        for meter, register_id, day, value in readings:
+            Reading.objects.create(
+                meter=meter,
+                register_id=register_id,
+                reading_date=datetime(2025, 1, 1, 12, tzinfo=timezone.utc)
+                + timedelta(days=day - 1),
+                reading_value=value,
+                flow_file=flow_file,
+            )
+        self.url = f"/api/meter-points/{self.meter_point.pk}/consumption/"
+
+    def buckets(self, response):
+        return [
+            (row["period"], row["register_id"], row["consumption"], row["readings"])
+            for row in response.data["results"]
+        ]
+
+    def test_daily_consumption(self):
+        """Test deltas are summed per day and never cross meters."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["bucket"], "day")
+        self.assertEqual(
+            self.buckets(response),
+            [
+                ("2025-01-31", "01", "10.000", 1),
+                ("2025-02-01", "01", "15.000", 1),
+                ("2025-02-01", "02", "8.000", 1),
+                ("2025-02-02", "01", "12.000", 2),
+            ],
+        )
+
+    def test_weekly_and_monthly_consumption(self):
+        """Test weeks start on Monday and months on the first."""
+        weekly = self.client.get(self.url, {"bucket": "week"})
+        self.assertEqual(
+            self.buckets(weekly),
+            [("2025-01-27", "01", "37.000", 4), ("2025-01-27", "02", "8.000", 1)],
+        )
+        monthly = self.client.get(self.url, {"bucket": "month"})
+        self.assertEqual(
+            self.buckets(monthly),
+            [
+                ("2025-01-01", "01", "10.000", 1),
+                ("2025-02-01", "01", "27.000", 3),
+                ("2025-02-01", "02", "8.000", 1),
+            ],
+        )
+
+    def test_date_range_keeps_earlier_baseline(self):
+        """Test date_from drops periods, not the reading before them."""
+        response = self.client.get(
+            self.url, {"date_from": "2025-02-02", "date_to": "2025-02-02"}
+        )
+        self.assertEqual(self.buckets(response), [("2025-02-02", "01", "12.000", 2)])
+
+    def test_meter_consumption(self):
+        """Test the meter action only counts that meter's readings."""
+        response = self.client.get(f"/api/meters/{self.new_meter.pk}/consumption/")
+        self.assertEqual(self.buckets(response), [("2025-02-02", "01", "7.000", 1)])
+
+    def test_date_range_fetches_only_baseline_and_range(self):
+        """Test the bounds are applied in the query, keeping one baseline each."""
+        readings = bound_readings(
+            Reading.objects.filter(meter__meter_point=self.meter_point),
+            "day",
+            date_from=date(2025, 2, 1),
+            date_to=date(2025, 2, 1),
+        )
+        self.assertEqual(
+            sorted(
+                readings.values_list(
+                    "meter__serial_number", "register_id", "reading_value"
+                )
+            ),
+            [
+                ("NEW", "01", Decimal("0.000")),
+                ("OLD", "01", Decimal("110.000")),
+                ("OLD", "01", Decimal("125.000")),
+                ("OLD", "02", Decimal("50.000")),
+                ("OLD", "02", Decimal("58.000")),
+            ],
+        )
+
+    def test_date_to_keeps_whole_period(self):
+        """Test date_to keeps the whole period it falls in."""
+        response = self.client.get(
+            self.url,
+            {"bucket": "month", "date_from": "2025-01-15", "date_to": "2025-02-01"},
+        )
+        self.assertEqual(
+            self.buckets(response),
+            [
+                ("2025-01-01", "01", "10.000", 1),
+                ("2025-02-01", "01", "27.000", 3),
+                ("2025-02-01", "02", "8.000", 1),
+            ],
+        )
+
+    def test_invalid_parameters(self):
+        """Test unknown buckets and malformed or impossible dates are rejected."""
+        for params in (
+            {"bucket": "year"},
+            {"date_from": "yesterday"},
+            {"date_from": "2024-02-30"},
+            {"date_to": "2024-13-01"},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(
+            f"/api/meters/{self.new_meter.pk}/consumption/", {"date_from": "2024-02-30"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_python_fallback_matches_database(self):
+        """Test the fallback used without window functions agrees."""
+        if not connection.features.supports_over_clause:
+            self.skipTest("Database has no window functions")
+        readings = Reading.objects.filter(meter__meter_point=self.meter_point)
+        for bucket in ("day", "week", "month"):
+            self.assertEqual(
+                python_consumption(readings, bucket),
+                database_consumption(readings, bucket),
+            )
+
+
+class BatchLookupTest(TestCase):
+    """Test looking up the readings of many MPANs in one POST."""
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            User.objects.create_user(username="reader", password="testpass123")
+        )
+        flow_file = FlowFile.objects.create(filename="test.uff", file_reference="T1")
+        for mp in range(3):
+            meter_point = MeterPoint.objects.create(mpan=f"100000000000{mp}")
+            meter = Meter.objects.create(
+                meter_point=meter_point, serial_number=f"M{mp}"
+            )
+            for day in range(1, 4):
+                Reading.objects.create(
+                    meter=meter,
+                    register_id="01",
+                    reading_date=datetime(2025, 1, day, 12, tzinfo=timezone.utc),
+                    reading_value=mp * 100 + day,
+                    flow_file=flow_file,
+                )
+
+    def post(self, body):
+        return self.client.post("/api/readings/batch/", body, format="json")
+
+    def results(self, response):
+        """Decode the NDJSON body into {mpan: readings}, checking each MPAN once."""
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        results = {row["mpan"]: row["readings"] for row in rows}
+        self.assertEqual(len(results), len(rows))
+        return results
+
+    def test_readings_grouped_by_mpan(self):
+        """Test every requested MPAN gets one line of readings, newest first."""
+        response = self.post({"mpans": ["1000000000002", "1000000000000", "999"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        results = self.results(response)
+        self.assertEqual(set(results), {"1000000000002", "1000000000000", "999"})
+        self.assertEqual(
+            [row["reading_value"] for row in results["1000000000002"]],
+            ["203.000", "202.000", "201.000"],
+        )
+        self.assertEqual(
+            results["1000000000000"][0],
+            {
+                "id": results["1000000000000"][0]["id"],
+                "mpan": "1000000000000",
+                "meter_serial": "M0",
+                "meter_type": "S",
+                "register_id": "01",
+                "reading_date": "2025-01-03T12:00:00Z",
+                "reading_value": "3.000",
+                "reading_type": "ACTUAL",
+                "flow_filename": "test.uff",
+            },
+        )
+        self.assertEqual(results["999"], [])
+
+    def test_date_range(self):
+        """Test date_from and date_to filter like the readings list."""
+        response = self.post(
+            {
+                "mpans": ["1000000000001"],
+                "date_from": "2025-01-02",
+                "date_to": "2025-01-03",
+            }
+        )
+        self.assertEqual(
+            [row["reading_value"] for row in self.results(response)["1000000000001"]],
+            ["102.000"],
+        )
+
+    def test_one_query_per_chunk(self):
+        """Test MPANs are fetched a chunk at a time, not one by one."""
+        mpans = [f"100000000000{mp}" for mp in range(3)] + ["1000000000000"]
+        with patch("meter_readings.api_views.QUERY_CHUNK_SIZE", 2):
+            with self.assertNumQueries(2):
+                results = self.results(self.post({"mpans": mpans}))
+        self.assertEqual(sum(map(len, results.values())), 9)
+
+    def test_requires_authentication(self):
+        """Test anonymous clients cannot POST a batch lookup."""
+        response = APIClient().post(
+            "/api/readings/batch/", {"mpans": ["1000000000000"]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_requests(self):
+        """Test empty, oversized and malformed bodies are rejected."""
+        for body in (
+            {"mpans": []},
+            {"mpans": [str(n) for n in range(5001)]},
+            {"mpans": ["1000000000000"], "date_from": "soon"},
+        ):
+            response = self.post(body)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
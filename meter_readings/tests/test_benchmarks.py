@@ -0,0 +1,121 @@
+"""Tests for the benchmark harnesses."""
+
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from meter_readings.benchmarking import benchmark_client, seed_database
+from meter_readings.management.commands.benchmark_api import (
+    default_scenarios,
+    find_regressions,
+    percentile,
+    run_scenarios,
+)
+from meter_readings.management.commands.benchmark_batch import compare_lookups
+from meter_readings.management.commands.benchmark_export import compare_exports
+from meter_readings.management.commands.benchmark_parser import (
+    benchmark_date_decoding,
+    benchmark_reading_memory,
+)
+from meter_readings.models import LatestReading, MeterPoint, Reading
+from meter_readings.synthetic import write_d0010
+
+
+class BenchmarkApiTest(TestCase):
+    def test_seed_builds_derived_tables(self):
+        """Test seeded data has the counters and latest readings imports keep."""
+        self.assertEqual(seed_database(readings=40, meters=4), 40)
+        self.assertEqual(Reading.objects.count(), 40)
+        self.assertEqual(
+            set(MeterPoint.objects.values_list("reading_count", flat=True)), {10}
+        )
+        self.assertEqual(LatestReading.objects.count(), 4)
+
+    def test_every_scenario_runs(self):
+        """Test each endpoint answers 200 and reports latency and queries."""
+        seed_database(readings=40, meters=4)
+        scenarios = default_scenarios(40, 4)
+        results = run_scenarios(scenarios, iterations=2)
+        self.assertEqual(list(results), [name for name, *_ in scenarios])
+        for result in results.values():
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+            self.assertGreater(result["queries"], 0)
+
+    def test_find_regressions(self):
+        """Test slower p95s, extra queries and the absolute limit are flagged."""
+        baseline = {"a": {"p95_ms": 10.0, "queries": 3}}
+        self.assertEqual(
+            find_regressions({"a": {"p95_ms": 12.0, "queries": 3}}, baseline, 0.25),
+            [],
+        )
+        self.assertEqual(
+            len(
+                find_regressions(
+                    {
+                        "a": {"p95_ms": 13.0, "queries": 4},
+                        "b": {"p95_ms": 60, "queries": 1},
+                    },
+                    baseline,
+                    0.25,
+                    max_p95_ms=50,
+                )
+            ),
+            3,
+        )
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles."""
+        samples = list(range(1, 21))
+        self.assertEqual(percentile(samples, 0.5), 10)
+        self.assertEqual(percentile(samples, 0.95), 19)
+
+
+class ReadThroughputBenchmarkTest(TestCase):
+    def setUp(self):
+        seed_database(readings=40, meters=4)
+
+    def test_lookups_fetch_the_same_rows(self):
+        """Test per-MPAN and batch lookups both return every seeded reading."""
+        mpans = list(MeterPoint.objects.values_list("mpan", flat=True))
+        with benchmark_client() as client:
+            results = compare_lookups(client, mpans)
+        self.assertEqual(
+            {name: result["rows"] for name, result in results.items()},
+            {"per_mpan": 40, "batch": 40},
+        )
+
+    def test_exports_fetch_the_same_rows(self):
+        """Test paging and both export formats return every seeded reading."""
+        with benchmark_client() as client:
+            results = compare_exports(client)
+        self.assertEqual(
+            {name: result["rows"] for name, result in results.items()},
+            {"paginated": 40, "ndjson": 40, "csv": 40},
+        )
+
+
+class ParserBenchmarkTest(TestCase):
+    def test_date_decoding(self):
+        """Test both decoders are timed over a year of half-hours."""
+        results = benchmark_date_decoding(repeat=1)
+        self.assertEqual(results["timestamps"], 366 * 48)
+        self.assertGreater(results["speedup"], 0)
+
+    def test_reading_memory(self):
+        """Test retained bytes are measured per parsed reading for both shapes."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "benchmark.uff"
+            with path.open("w", encoding="utf-8") as file:
+                write_d0010(
+                    file,
+                    file_reference="0000000001",
+                    first_mpan=1900000000000,
+                    mpans=3,
+                    readings=5,
+                    dst=False,
+                )
+            results = benchmark_reading_memory(path)
+        self.assertEqual(results["readings"], 30)
+        self.assertGreater(results["dict_bytes_per_reading"], 0)
+        self.assertGreater(results["slots_bytes_per_reading"], 0)
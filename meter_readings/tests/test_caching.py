@@ -0,0 +1,117 @@
+"""Tests for the API response cache and its import-driven invalidation."""
+
+import tempfile
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from meter_readings.caching import bump_data_version, get_data_version
+from meter_readings.counters import recompute_all_counters
+from meter_readings.models import FlowFile, Meter, MeterPoint, Reading
+from meter_readings.utils import clear_all_data
+
+API_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "api": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "api-responses-test",
+    },
+}
+
+
+@override_settings(CACHES=API_CACHES)
+class ResponseCacheTest(TestCase):
+    def setUp(self):
+        caches["api"].clear()
+        self.addCleanup(caches["api"].clear)
+        self.client = APIClient()
+        flow_file = FlowFile.objects.create(filename="test.uff", file_reference="T1")
+        meter_point = MeterPoint.objects.create(mpan="1234567890123")
+        self.meter = Meter.objects.create(meter_point=meter_point, serial_number="A")
+        for day in range(1, 4):
+            Reading.objects.create(
+                meter=self.meter,
+                register_id="01",
+                reading_date=datetime(2025, 1, day, tzinfo=timezone.utc),
+                reading_value=day,
+                flow_file=flow_file,
+            )
+        recompute_all_counters()
+
+    def test_repeat_request_served_from_cache(self):
+        """Test a repeated request costs only the data version lookup."""
+        first = self.client.get("/api/readings/?meter_serial=A")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data["count"], 3)
+        with self.assertNumQueries(1):
+            second = self.client.get("/api/readings/?meter_serial=A")
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["ETag"], first["ETag"])
+
+    def test_query_parameter_order_shares_entry(self):
+        """Test reordered query parameters hit the same cache entry."""
+        self.client.get("/api/readings/?meter_serial=A&ordering=reading_date")
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                "/api/readings/?ordering=reading_date&meter_serial=A"
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_bump_invalidates(self):
+        """Test a new data version bypasses responses cached under the old one."""
+        self.client.get("/api/meters/")
+        Meter.objects.filter(pk=self.meter.pk).update(serial_number="B")
+        bump_data_version()
+        response = self.client.get("/api/meters/")
+        self.assertEqual(response.json()["results"][0]["serial_number"], "B")
+
+    def test_import_invalidates(self):
+        """Test an import bumps the data version once it commits."""
+        before = self.client.get("/api/meter-points/").json()["count"]
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".uff", delete=False) as f:
+            f.write(
+                "ZHV|0000123456|D0010002|D|UDMS|X|MRCY|20231201120000||||OPER|\n"
+                "026|1234567890124|V|\n028|B|S|\n030|01|20231201100000|1.000|\n"
+            )
+        self.addCleanup(Path(f.name).unlink)
+        version = get_data_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_d0010", f.name, stdout=StringIO())
+        self.assertEqual(get_data_version(), version + 1)
+        after = self.client.get("/api/meter-points/").json()["count"]
+        self.assertEqual(after, before + 1)
+
+    def test_clear_all_data_invalidates(self):
+        """Test clearing all data bumps the data version."""
+        version = get_data_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            clear_all_data()
+        self.assertEqual(get_data_version(), version + 1)
+
+    def test_if_none_match_returns_not_modified(self):
+        """Test a matching If-None-Match gets 304, cached or not."""
+        etag = self.client.get("/api/readings/summary/")["ETag"]
+        response = self.client.get("/api/readings/summary/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+        caches["api"].clear()
+        response = self.client.get("/api/readings/summary/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(
+            "/api/readings/summary/", HTTP_IF_NONE_MATCH='"stale"'
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_browsable_api_and_errors_not_cached(self):
+        """Test only successful JSON responses are stored."""
+        self.client.get("/api/readings/", HTTP_ACCEPT="text/html")
+        self.client.get("/api/meters/999999/")
+        self.client.get(f"/api/meters/{self.meter.pk}/readings/?stream=ndjson")
+        self.assertEqual(caches["api"]._cache, {})
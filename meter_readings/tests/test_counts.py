@@ -0,0 +1,107 @@
+"""Tests for cheap table counts and the approximate admin paginator."""
+
+import tempfile
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+from unittest import skipUnless
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+
+from meter_readings.caching import bump_data_version
+from meter_readings.counts import (
+    ApproximateCountPaginator,
+    estimated_count,
+    invalidate_counts,
+    table_count,
+)
+from meter_readings.models import FlowFile, Meter, MeterPoint, Reading
+
+
+class TableCountTest(TestCase):
+    def setUp(self):
+        invalidate_counts()
+        self.flow_file = FlowFile.objects.create(
+            filename="test.uff", file_reference="TEST001"
+        )
+        meter_point = MeterPoint.objects.create(mpan="1234567890123")
+        self.meter = Meter.objects.create(meter_point=meter_point, serial_number="A")
+        for day in range(1, 4):
+            Reading.objects.create(
+                meter=self.meter,
+                register_id="01",
+                reading_date=datetime(2025, 1, day, tzinfo=timezone.utc),
+                reading_value=day,
+                flow_file=self.flow_file,
+            )
+
+    def test_exact_count_is_cached_until_invalidated(self):
+        """Test small tables are counted exactly once, then from the cache."""
+        self.assertEqual(table_count(Reading), 3)
+        Reading.objects.filter(reading_value=1).delete()
+        # Only the data version is read (and pg_class on PostgreSQL)
+        with self.assertNumQueries(1 if connection.vendor != "postgresql" else 2):
+            self.assertEqual(table_count(Reading), 3)
+        invalidate_counts()
+        self.assertEqual(table_count(Reading), 2)
+
+    def test_new_data_version_refreshes_counts(self):
+        """Test a version bumped by another process's import is seen here."""
+        self.assertEqual(table_count(Reading), 3)
+        Reading.objects.filter(reading_value=1).delete()
+        # What data_changed does on commit in the importing process
+        bump_data_version()
+        self.assertEqual(table_count(Reading), 2)
+
+    def test_import_invalidates_counts(self):
+        """Test an import clears cached counts once it commits."""
+        self.assertEqual(table_count(FlowFile), 1)
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".uff", delete=False) as f:
+            f.write(
+                "ZHV|0000123456|D0010002|D|UDMS|X|MRCY|20231201120000||||OPER|\n"
+                "026|1234567890124|V|\n028|B|S|\n030|01|20231201100000|1.000|\n"
+            )
+        self.addCleanup(Path(f.name).unlink)
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("import_d0010", f.name, stdout=StringIO())
+        self.assertEqual(table_count(FlowFile), 2)
+
+    @override_settings(APPROXIMATE_COUNT_THRESHOLD=1000)
+    def test_estimate_used_at_threshold(self):
+        """Test the planner estimate replaces COUNT(*) only for large tables."""
+        with patch("meter_readings.counts.estimated_count", return_value=250000):
+            self.assertEqual(table_count(Reading), 250000)
+        with patch("meter_readings.counts.estimated_count", return_value=999):
+            self.assertEqual(table_count(Reading), 3)
+
+    @override_settings(APPROXIMATE_COUNT_THRESHOLD=1000)
+    def test_paginator_estimates_only_unfiltered_querysets(self):
+        """Test filtered querysets are still counted exactly."""
+        with patch("meter_readings.counts.estimated_count", return_value=250000):
+            paginator = ApproximateCountPaginator(Reading.objects.order_by("id"), 100)
+            self.assertEqual(paginator.count, 250000)
+            filtered = Reading.objects.filter(reading_value__gte=2)
+            self.assertEqual(ApproximateCountPaginator(filtered, 100).count, 2)
+
+    @override_settings(APPROXIMATE_COUNT_THRESHOLD=1000)
+    def test_reading_changelist_uses_estimate(self):
+        """Test the readings admin pages through the estimated total."""
+        client = Client()
+        client.force_login(
+            User.objects.create_superuser("admin", "admin@test.com", "pass")
+        )
+        with patch("meter_readings.counts.estimated_count", return_value=250000):
+            response = client.get("/admin/meter_readings/reading/")
+        self.assertEqual(response.context["cl"].result_count, 250000)
+        self.assertEqual(len(response.context["cl"].result_list), 3)
+
+    @skipUnless(connection.vendor == "postgresql", "pg_class is PostgreSQL only")
+    def test_estimate_from_pg_class(self):
+        """Test reltuples is read once the table has statistics."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Reading._meta.db_table}")
+        self.assertEqual(estimated_count(Reading), 3)
@@ -1,14 +1,51 @@
+import tempfile
+from datetime import datetime, timedelta
 from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import skipIf, skipUnless
+from unittest.mock import patch
 
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management import call_command
-from django.test import TestCase
-from pathlib import Path
-import tempfile
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-from meter_readings.models import FlowFile, Reading
+from meter_readings.loaders import CopyReadingLoader, ReadingLoader, reading_loader
+from meter_readings.management.commands import import_d0010
+from meter_readings.management.commands.import_d0010 import (
+    LONDON_TZ,
+    Command,
+    decode_reading_date,
+)
+from meter_readings.models import (
+    FlowFile,
+    ImportRun,
+    Meter,
+    MeterPoint,
+    Reading,
+    RejectedLine,
+)
+
+HEADER = "ZHV|0000123456|D0010002|D|UDMS|X|MRCY|20231201120000||||OPER| | |\n"
 
 
 class ImportCommandTest(TestCase):
+    def setUp(self):
+        caches["api"].clear()
+        self.addCleanup(caches["api"].clear)
+
+    def write_flow_file(self, content):
+        """Write D0010 content to a temporary file removed after the test."""
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".uff", delete=False) as f:
+            f.write(content)
+        self.addCleanup(Path(f.name).unlink)
+        return f.name
+
     def test_import_basic_file(self):
         """Test importing a simple D0010 file."""
         content = """ZHV|0000123456|D0010002|D|UDMS|X|MRCY|20231201120000||||OPER| | |
@@ -29,3 +66,475 @@ ZPT|00002|
             self.assertEqual(reading.reading_value, Decimal("12345.000"))
         finally:
             Path(temp_path).unlink()
+
+    def test_duplicate_readings_in_file_counted_once(self):
+        """Test repeated readings keep the first value and are counted once."""
+        path = self.write_flow_file(
+            HEADER
+            + "026|1234567890123|V|\n"
+            + "028|M00123456|C|\n"
+            + "030|01|20231201100000|100.000|\n"
+            + "030|01|20231201100000|999.000|\n"
+            + "030|02|20231201100000|200.000|\n"
+            + "ZPT|00004|\n"
+        )
+        call_command("import_d0010", path, stdout=StringIO())
+
+        flow_file = FlowFile.objects.get()
+        self.assertEqual(flow_file.record_count, 2)
+        self.assertEqual(flow_file.file_reference, "0000123456")
+        reading = Reading.objects.get(register_id="01")
+        self.assertEqual(reading.reading_value, Decimal("100.000"))
+
+    def test_overlapping_file_only_counts_new_readings(self):
+        """Test a second file reuses meters and skips existing readings."""
+        first = self.write_flow_file(
+            HEADER
+            + "026|1234567890123|V|\n"
+            + "028|M00123456|C|\n"
+            + "030|01|20231201100000|100.000|\n"
+        )
+        second = self.write_flow_file(
+            HEADER
+            + "026|1234567890123|V|\n"
+            + "028|M00123456|P|\n"
+            + "030|01|20231201100000|100.000|\n"
+            + "030|01|20231202100000|150.000|\n"
+            + "026|1234567890124|V|\n"
+            + "028|M00999999|S|\n"
+            + "030|S|20231202100000|5.000|\n"
+        )
+        call_command("import_d0010", first, second, stdout=StringIO())
+
+        second_file = FlowFile.objects.get(filename=Path(second).name)
+        self.assertEqual(second_file.record_count, 2)
+        self.assertEqual(second_file.readings.count(), 2)
+        self.assertEqual(MeterPoint.objects.count(), 2)
+        self.assertEqual(Meter.objects.count(), 2)
+        self.assertEqual(Meter.objects.get(serial_number="M00123456").meter_type, "C")
+
+    def test_query_count_independent_of_reading_count(self):
+        """Test saving uses set-based queries rather than one per reading."""
+        lines = [HEADER]
+        for mp in range(5):
+            lines.append(f"026|{1234567890100 + mp}|V|\n")
+            lines.append(f"028|SERIAL{mp}|S|\n")
+            for day in range(1, 21):
+                lines.append(f"030|01|202312{day:02d}100000|{day}.000|\n")
+        path = self.write_flow_file("".join(lines))
+
+        with CaptureQueriesContext(connection) as queries:
+            call_command("import_d0010", path, stdout=StringIO())
+
+        self.assertEqual(Reading.objects.count(), 100)
+        self.assertEqual(FlowFile.objects.get().record_count, 100)
+        self.assertLess(len(queries), 20)
+
+    def test_import_creates_summary_rollup(self):
+        """Test each imported file gets rollup rows totalling its readings."""
+        path = self.write_flow_file(
+            HEADER
+            + "026|1234567890123|V|\n"
+            + "028|M00123456|S|\n"
+            + "030|01|20231201100000|1.000|\n"
+            + "030|01|20231201220000|2.000|\n"
+            + "030|01|20231202100000|3.000|\n"
+        )
+        call_command("import_d0010", path, stdout=StringIO())
+
+        flow_file = FlowFile.objects.get()
+        self.assertTrue(flow_file.rollup_complete)
+        self.assertEqual(
+            list(
+                flow_file.rollups.order_by("day").values_list(
+                    "reading_count", flat=True
+                )
+            ),
+            [2, 1],
+        )
+
+    def test_import_maintains_counters(self):
+        """Test each file adds only its new readings to the stored counters."""
+        first = self.write_flow_file(
+            HEADER
+            + "026|1234567890123|V|\n"
+            + "028|M00123456|C|\n"
+            + "030|01|20231201100000|100.000|\n"
+        )
+        second = self.write_flow_file(
+            HEADER
+            + "026|1234567890123|V|\n"
+            + "028|M00123456|C|\n"
+            + "030|01|20231201100000|100.000|\n"
+            + "030|01|20231130100000|90.000|\n"
+            + "028|M00999999|S|\n"
+            + "030|S|20231202100000|5.000|\n"
+        )
+        call_command("import_d0010", first, second, stdout=StringIO())
+
+        meter = Meter.objects.get(serial_number="M00123456")
+        self.assertEqual(meter.reading_count, 2)
+        self.assertEqual(meter.first_reading_date.date().isoformat(), "2023-11-30")
+        self.assertEqual(meter.last_reading_date.date().isoformat(), "2023-12-01")
+
+        meter_point = MeterPoint.objects.get()
+        self.assertEqual(meter_point.meter_count, 2)
+        self.assertEqual(meter_point.reading_count, 3)
+        self.assertEqual(meter_point.last_reading_date.date().isoformat(), "2023-12-02")
+
+        # Damage the counters and check the repair command restores them
+        Meter.objects.update(reading_count=0, first_reading_date=None)
+        MeterPoint.objects.update(meter_count=0, reading_count=0)
+        call_command("recompute_counters", stdout=StringIO())
+        meter.refresh_from_db()
+        meter_point.refresh_from_db()
+        self.assertEqual(meter.reading_count, 2)
+        self.assertEqual(meter.first_reading_date.date().isoformat(), "2023-11-30")
+        self.assertEqual((meter_point.meter_count, meter_point.reading_count), (2, 3))
+
+    def test_dry_run_counts_without_saving(self):
+        """Test dry run streams the file and reports the reading count."""
+        path = self.write_flow_file(
+            HEADER
+            + "026|1234567890123|V|\n"
+            + "028|M00123456|S|\n"
+            + "030|01|20231201100000|100.000|\n"
+            + "030|01|20231202100000|110.000|\n"
+        )
+        self.assertEqual(Command().import_file(path, dry_run=True), 2)
+        self.assertEqual(FlowFile.objects.count(), 0)
+        self.assertEqual(Reading.objects.count(), 0)
+
+    def test_parse_error_after_saved_chunks_rolls_back(self):
+        """Test a bad line late in the stream reports its line and saves nothing."""
+        path = self.write_flow_file(
+            HEADER
+            + "026|1234567890123|V|\n"
+            + "028|M00123456|S|\n"
+            + "030|01|20231201100000|100.000|\n"
+            + "030|01|20231202100000|110.000|\n"
+            + "030|01|20231203100000|120.000|\n"
+            + "030|01|NOT-A-DATE|130.000|\n"
+        )
+        with patch(
+            "meter_readings.management.commands.import_d0010.SAVE_CHUNK_SIZE", 2
+        ):
+            with self.assertRaisesMessage(CommandError, "Error parsing line 7"):
+                Command().import_file(path)
+
+        self.assertEqual(FlowFile.objects.count(), 0)
+        self.assertEqual(Reading.objects.count(), 0)
+
+    def test_file_without_readings_rejected(self):
+        """Test a file with no 030 records is rejected."""
+        path = self.write_flow_file(HEADER + "026|1234567890123|V|\nZPT|00001|\n")
+        with self.assertRaisesMessage(CommandError, "No readings found in file"):
+            Command().import_file(path)
+        self.assertEqual(FlowFile.objects.count(), 0)
+
+    BAD_BLOCKS = (
+        HEADER
+        + "026|1234567890123|V|\n"
+        + "028|M00123456|S|\n"
+        + "030|01|20231201100000|100.000|\n"
+        + "030|01|NOT-A-DATE|110.000|\n"
+        + "030|01|20231203100000|120.000|\n"
+        + "026|BAD-MPAN|V|\n"
+        + "028|M00999999|S|\n"
+        + "030|01|20231201100000|5.000|\n"
+        + "026|1234567890124|V|\n"
+        + "028|M00123457|S|\n"
+        + "030|01|20231201100000|200.000|\n"
+    )
+
+    def test_on_error_skip_imports_valid_lines(self):
+        """Test skip mode drops invalid lines and imports the rest."""
+        path = self.write_flow_file(self.BAD_BLOCKS)
+        out = StringIO()
+        call_command("import_d0010", path, on_error="skip", stdout=out)
+
+        flow_file = FlowFile.objects.get()
+        self.assertEqual(flow_file.record_count, 3)
+        self.assertEqual(flow_file.rejected_count, 3)
+        self.assertFalse(RejectedLine.objects.exists())
+        self.assertIn("3 invalid line(s) skipped", out.getvalue())
+
+    def test_on_error_quarantine_records_rejected_lines(self):
+        """Test quarantined lines keep their number, text and reason."""
+        path = self.write_flow_file(self.BAD_BLOCKS)
+        call_command("import_d0010", path, on_error="quarantine", stdout=StringIO())
+
+        # Nothing from the bad MPAN's block is credited to the previous MPAN
+        self.assertEqual(
+            sorted(Reading.objects.values_list("meter__serial_number", flat=True)),
+            ["M00123456", "M00123456", "M00123457"],
+        )
+        rejected = list(
+            RejectedLine.objects.values_list("line_number", "raw_line", "reason")
+        )
+        self.assertEqual([line[0] for line in rejected], [5, 7, 9])
+        self.assertEqual(rejected[0][1], "030|01|NOT-A-DATE|110.000|")
+        self.assertIn("Could not parse reading date", rejected[0][2])
+        self.assertIn("Invalid MPAN format", rejected[1][2])
+        self.assertIn("without preceding MPAN/meter", rejected[2][2])
+
+        flow_file = FlowFile.objects.get()
+        response = APIClient().get(f"/api/flow-files/{flow_file.pk}/rejected-lines/")
+        self.assertEqual(
+            [row["line_number"] for row in response.json()["results"]], [5, 7, 9]
+        )
+
+    def test_import_records_import_run(self):
+        """Test each import stores its phase timings and counts."""
+        path = self.write_flow_file(self.BAD_BLOCKS)
+        call_command("import_d0010", path, on_error="skip", stdout=StringIO())
+
+        run = ImportRun.objects.get()
+        self.assertEqual(run.flow_file, FlowFile.objects.get())
+        self.assertEqual(run.reading_count, 3)
+        self.assertEqual(run.rejected_count, 3)
+        self.assertEqual(run.bytes_read, Path(path).stat().st_size)
+        self.assertEqual(run.line_count, len(self.BAD_BLOCKS.splitlines()))
+        self.assertGreater(run.query_count, 0)
+        phases = (
+            run.read_seconds
+            + run.parse_seconds
+            + run.resolve_seconds
+            + run.insert_seconds
+            + run.finalize_seconds
+        )
+        self.assertGreater(phases, 0)
+        self.assertLessEqual(phases, run.total_seconds)
+        self.assertAlmostEqual(run.rows_per_second, 3 / run.total_seconds)
+
+        response = APIClient().get("/api/import-runs/", {"flow_file": run.flow_file_id})
+        self.assertEqual(response.status_code, 200)
+        [row] = response.json()["results"]
+        self.assertEqual(row["filename"], run.flow_file.filename)
+        self.assertEqual(row["reading_count"], 3)
+
+    def test_dry_run_records_no_import_run(self):
+        """Test a dry run leaves no ImportRun behind."""
+        path = self.write_flow_file(self.BAD_BLOCKS)
+        call_command(
+            "import_d0010", path, dry_run=True, on_error="skip", stdout=StringIO()
+        )
+        self.assertFalse(ImportRun.objects.exists())
+
+    def test_on_error_skip_still_needs_readings(self):
+        """Test a file with no valid readings is still rejected."""
+        path = self.write_flow_file(HEADER + "026|1234567890123|V|\n030|01|x|1|\n")
+        with self.assertRaisesMessage(CommandError, "No readings found in file"):
+            command = Command()
+            command.on_error = "skip"
+            command.import_file(path)
+        self.assertEqual(FlowFile.objects.count(), 0)
+
+    def test_renamed_resend_rejected_before_parsing(self):
+        """Test a resend under a new name is caught by content hash."""
+        content = (
+            HEADER
+            + "026|1234567890123|V|\n"
+            + "028|M00123456|S|\n"
+            + "030|01|20231201100000|100.000|\n"
+        )
+        original = self.write_flow_file(content)
+        resend = self.write_flow_file(content)
+        Command().import_file(original)
+
+        flow_file = FlowFile.objects.get()
+        self.assertEqual(len(flow_file.content_hash), 64)
+
+        with patch.object(Command, "parse_d0010_file") as parse:
+            with self.assertRaisesMessage(
+                CommandError, f"has already been imported as {flow_file.filename}"
+            ):
+                Command().import_file(resend)
+            parse.assert_not_called()
+
+        self.assertEqual(FlowFile.objects.count(), 1)
+
+
+class ImportLoaderTest(TestCase):
+    FILES = {
+        "first.uff": (
+            HEADER
+            + "026|1234567890123|V|\n"
+            + "028|M00123456|C|\n"
+            + "030|01|20231201100000|100.000|\n"
+            + "030|01|20231202100000|110.000|\n"
+        ),
+        "second.uff": (
+            HEADER
+            + "026|1234567890123|V|\n"
+            + "028|M00123456|P|\n"
+            + "030|01|20231202100000|999.000|\n"
+            + "030|01|20231203100000|120.000|\n"
+            + "028|M00123457|S|\n"
+            + "030|01|20231203100000|5.000|\n"
+            + "026|1234567890124|V|\n"
+            + "028|M00999999|D|\n"
+            + "030|DY|20231203100000|7.500|\n"
+            + "030|DY|20231203100000|8.500|\n"
+            + "030|NT|20231203100000|1.250|\n"
+            + "028|M00999999|S|\n"
+            + "030|DY|20231203100000|9.500|\n"
+            + "030|DY|20231204100000|10.500|\n"
+        ),
+    }
+
+    def import_files(self, loader, directory):
+        """Import FILES in small chunks with ``loader``; return what was saved."""
+        paths = []
+        for name, content in self.FILES.items():
+            path = Path(directory) / name
+            path.write_text(content)
+            paths.append(str(path))
+        with override_settings(IMPORT_LOADER=loader), patch.object(
+            import_d0010, "SAVE_CHUNK_SIZE", 3
+        ):
+            call_command("import_d0010", *paths, stdout=StringIO())
+        return (
+            sorted(
+                Meter.objects.values_list(
+                    "meter_point__mpan", "serial_number", "meter_type"
+                )
+            ),
+            sorted(
+                Reading.objects.values_list(
+                    "meter__serial_number",
+                    "register_id",
+                    "reading_date",
+                    "reading_value",
+                    "reading_type",
+                    "flow_file__filename",
+                )
+            ),
+            sorted(FlowFile.objects.values_list("filename", "record_count")),
+        )
+
+    @skipUnless(connection.vendor == "postgresql", "COPY is PostgreSQL only")
+    def test_copy_loader_matches_orm_loader(self):
+        """Test COPY saves exactly what the ORM loader saves, chunk by chunk."""
+        with tempfile.TemporaryDirectory() as directory:
+            orm = self.import_files("orm", directory)
+            FlowFile.objects.all().delete()
+            Meter.objects.all().delete()
+            MeterPoint.objects.all().delete()
+            copy = self.import_files("copy", directory)
+
+        self.assertEqual(copy, orm)
+        # First occurrences win, within and across chunks and files
+        self.assertIn(("1234567890124", "M00999999", "D"), copy[0])
+        self.assertIn(("1234567890123", "M00123456", "C"), copy[0])
+        self.assertEqual(copy[2], [("first.uff", 2), ("second.uff", 5)])
+
+    def test_loader_chosen_by_database(self):
+        """Test COPY is used automatically on PostgreSQL only."""
+        flow_file = FlowFile(filename="test.uff")
+        expected = (
+            CopyReadingLoader if connection.vendor == "postgresql" else ReadingLoader
+        )
+        self.assertIsInstance(reading_loader(flow_file), expected)
+        with override_settings(IMPORT_LOADER="orm"):
+            self.assertIsInstance(reading_loader(flow_file), ReadingLoader)
+        with override_settings(IMPORT_LOADER="bulk"):
+            with self.assertRaises(ImproperlyConfigured):
+                reading_loader(flow_file)
+
+    @skipIf(connection.vendor == "postgresql", "COPY is available on PostgreSQL")
+    def test_copy_loader_needs_postgresql(self):
+        """Test forcing COPY elsewhere is a configuration error."""
+        with override_settings(IMPORT_LOADER="copy"):
+            with self.assertRaisesMessage(ImproperlyConfigured, "needs PostgreSQL"):
+                reading_loader(FlowFile(filename="test.uff"))
+
+
+class ParallelImportTest(TransactionTestCase):
+    def write_flow_file(self, directory, name, mpan):
+        path = Path(directory) / name
+        path.write_text(
+            HEADER
+            + f"026|{mpan}|V|\n"
+            + "028|M00123456|S|\n"
+            + "030|01|20231201100000|100.000|\n"
+            + "030|01|20231202100000|110.000|\n"
+        )
+        return str(path)
+
+    def run_import(self, *args):
+        output = StringIO()
+        call_command("import_d0010", *args, stdout=output, no_color=True)
+        return output.getvalue().splitlines()
+
+    def test_workers_report_like_sequential_import(self):
+        """Test --workers imports every file and prints the same ✓/✗ lines."""
+        with tempfile.TemporaryDirectory() as directory:
+            paths = [
+                self.write_flow_file(directory, "a.uff", "1234567890123"),
+                self.write_flow_file(directory, "b.uff", "1234567890124"),
+                str(Path(directory) / "missing.uff"),
+                self.write_flow_file(directory, "bad.uff", "12345"),
+                self.write_flow_file(directory, "c.uff", "1234567890125"),
+            ]
+            parallel = self.run_import(*paths, "--workers", "3")
+            # Parse timings come back from the worker processes
+            self.assertEqual(
+                ImportRun.objects.filter(
+                    parse_seconds__gt=0, read_seconds__gt=0
+                ).count(),
+                3,
+            )
+
+            # Same files again, sequentially, into an empty database
+            FlowFile.objects.all().delete()
+            sequential = self.run_import(*paths)
+
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(parallel[1], f"✓ {paths[0]}: 2 readings imported")
+        self.assertEqual(parallel[3], f"✗ {paths[2]}: File not found: {paths[2]}")
+        self.assertTrue(parallel[4].startswith(f"✗ {paths[3]}: Error parsing line 2"))
+        self.assertEqual(parallel[-1], "Import completed. Total readings: 6")
+        self.assertEqual(Reading.objects.count(), 6)
+
+
+class ReadingDateDecodingTest(TestCase):
+    def assertMatchesLocalize(self, date_str):
+        expected = LONDON_TZ.localize(datetime.strptime(date_str, "%Y%m%d%H%M%S"))
+        actual = decode_reading_date(date_str)
+        self.assertEqual(actual, expected, date_str)
+        self.assertEqual(actual.utcoffset(), expected.utcoffset(), date_str)
+        self.assertIs(actual.tzinfo, expected.tzinfo, date_str)
+
+    def test_matches_localize_across_dst_boundaries(self):
+        """Test every 5 minutes around BST changes decodes like strptime+localize."""
+        for day in ["20230325", "20230326", "20231029", "20240331", "20241027"]:
+            start = datetime.strptime(day, "%Y%m%d") - timedelta(hours=2)
+            for step in range(0, 28 * 12):
+                moment = start + timedelta(minutes=5 * step, seconds=step % 60)
+                self.assertMatchesLocalize(moment.strftime("%Y%m%d%H%M%S"))
+
+    def test_matches_localize_on_ordinary_dates(self):
+        """Test cached offsets for ordinary winter and summer dates."""
+        for date_str in ["20240101000000", "20240615235959", "20231201100000"]:
+            self.assertMatchesLocalize(date_str)
+            self.assertMatchesLocalize(date_str)
+
+    def test_rejects_what_strptime_rejects(self):
+        """Test malformed timestamps raise ValueError."""
+        with self.assertRaises(ValueError):
+            decode_reading_date("2023120110000")
+
+        for date_str in [
+            "2023120110000a",
+            "+0231201100000",
+            "20231301000000",
+            "20230230000000",
+            "20231201240000",
+            "00001201100000",
+            "２０２３１２０１１０００００",
+        ]:
+            with self.assertRaises(ValueError):
+                datetime.strptime(date_str, "%Y%m%d%H%M%S")
+            with self.assertRaises(ValueError):
+                decode_reading_date(date_str)
@@ -0,0 +1,193 @@
+"""Tests for the ingest_d0010 inbox watcher command."""
+
+import fcntl
+import os
+import socket
+import sys
+import tempfile
+import threading
+import unittest
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from meter_readings.management.commands.ingest_d0010 import (
+    Command,
+    InotifyWatcher,
+    make_watcher,
+)
+from meter_readings.models import FlowFile, Reading
+
+GOOD_FILE = """ZHV|0000123456|D0010002|D|UDMS|X|MRCY|20231201120000||||OPER| | |
+026|1234567890123|V| | |
+028|M00123456|S| | |
+030|01|20231201100000|12345.000|||T|N| | |
+ZPT|00002|
+"""
+
+
+class IngestCommandTest(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.inbox = Path(self.tmp.name)
+
+    def ingest_once(self):
+        output = StringIO()
+        call_command("ingest_d0010", str(self.inbox), "--once", stdout=output)
+        return output.getvalue()
+
+    def test_imports_and_files_away_inbox(self):
+        """Test good files move to done/ and bad files to failed/ with a reason."""
+        (self.inbox / "good.uff").write_text(GOOD_FILE)
+        (self.inbox / "bad.uff").write_text("ZHV|0000123456|D0010002|\n")
+        (self.inbox / "notes.txt").write_text("ignored")
+
+        output = self.ingest_once()
+
+        self.assertIn("✓ good.uff: 1 readings imported", output)
+        self.assertIn("✗ bad.uff: No readings found in file", output)
+        self.assertTrue((self.inbox / "done" / "good.uff").exists())
+        self.assertTrue((self.inbox / "failed" / "bad.uff").exists())
+        self.assertIn(
+            "No readings found",
+            (self.inbox / "failed" / "bad.uff.error").read_text(),
+        )
+        self.assertTrue((self.inbox / "notes.txt").exists())
+        self.assertEqual(list((self.inbox / "processing").iterdir()), [])
+        self.assertEqual(FlowFile.objects.get().filename, "good.uff")
+        self.assertEqual(Reading.objects.count(), 1)
+
+    def test_resend_goes_to_failed_without_clobbering(self):
+        """Test a resent file is rejected and kept alongside the first failure."""
+        (self.inbox / "good.uff").write_text(GOOD_FILE)
+        self.ingest_once()
+        (self.inbox / "good.uff").write_text(GOOD_FILE)
+        self.ingest_once()
+        (self.inbox / "good.uff").write_text(GOOD_FILE)
+        self.ingest_once()
+
+        self.assertTrue((self.inbox / "done" / "good.uff").exists())
+        failed = sorted(p.name for p in (self.inbox / "failed").glob("good.uff*"))
+        self.assertEqual(len([name for name in failed if "error" not in name]), 2)
+        self.assertEqual(FlowFile.objects.count(), 1)
+
+    def test_requeues_files_left_in_processing(self):
+        """Test files claimed by a crashed run are imported on restart."""
+        dead = self.inbox / "processing" / "otherhost-1234"
+        dead.mkdir(parents=True)
+        (dead / ".lock").touch()
+        (dead / "good.uff").write_text(GOOD_FILE)
+        # Claimed by an ingester from before per-instance directories
+        (self.inbox / "processing" / "old.uff").write_text(
+            GOOD_FILE.replace("1234567890123", "1234567890124")
+        )
+
+        self.ingest_once()
+
+        self.assertTrue((self.inbox / "done" / "good.uff").exists())
+        self.assertTrue((self.inbox / "done" / "old.uff").exists())
+        self.assertEqual(Reading.objects.count(), 2)
+        self.assertEqual(list((self.inbox / "processing").iterdir()), [])
+
+    def test_leaves_files_of_running_ingester(self):
+        """Test a starting ingester does not take files another is importing."""
+        live = self.inbox / "processing" / "otherhost-5678"
+        live.mkdir(parents=True)
+        (live / "good.uff").write_text(GOOD_FILE)
+        with open(live / ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            self.ingest_once()
+
+        self.assertTrue((live / "good.uff").exists())
+        self.assertFalse(FlowFile.objects.exists())
+
+    def test_processing_dir_appears_locked(self):
+        """Test the processing directory is never visible unlocked."""
+        command = Command()
+        command.processing_root = self.inbox / "processing"
+        command.processing_root.mkdir()
+        command.create_processing_dir()
+        self.addCleanup(command.release_processing_dir)
+
+        self.assertEqual(
+            [path.name for path in command.processing_root.iterdir()],
+            [command.processing_dir.name],
+        )
+        with open(command.processing_dir / ".lock", "a") as lock:
+            with self.assertRaises(BlockingIOError):
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def test_requeues_own_dir_left_by_dead_ingester(self):
+        """Test a directory left under this host and pid is recovered first."""
+        stale = self.inbox / "processing" / f"{socket.gethostname()}-{os.getpid()}"
+        stale.mkdir(parents=True)
+        (stale / "good.uff").write_text(GOOD_FILE)
+
+        self.ingest_once()
+
+        self.assertTrue((self.inbox / "done" / "good.uff").exists())
+        self.assertEqual(list((self.inbox / "processing").iterdir()), [])
+
+    def test_claim_lost_race_and_missing_processing_dir(self):
+        """Test only a vanished source file counts as losing the claim."""
+        command = Command()
+        command.processing_dir = self.inbox / "processing" / "gone"
+        self.assertIsNone(command.claim(self.inbox / "missing.uff"))
+
+        (self.inbox / "good.uff").write_text(GOOD_FILE)
+        with self.assertRaises(CommandError):
+            command.claim(self.inbox / "good.uff")
+        self.assertTrue((self.inbox / "good.uff").exists())
+
+    def test_failed_move_does_not_stop_ingest(self):
+        """Test a file that cannot be moved after import does not stop the loop."""
+        (self.inbox / "a.uff").write_text(GOOD_FILE)
+        (self.inbox / "b.uff").write_text(
+            GOOD_FILE.replace("1234567890123", "1234567890124")
+        )
+        real_move = Command.move
+
+        def move(command, path, directory):
+            if path.name == "a.uff":
+                raise FileNotFoundError(path)
+            return real_move(command, path, directory)
+
+        with patch.object(Command, "move", move):
+            output = self.ingest_once()
+
+        self.assertIn("✓ a.uff", output)
+        self.assertIn("✓ b.uff", output)
+        self.assertTrue((self.inbox / "done" / "b.uff").exists())
+        self.assertEqual(FlowFile.objects.count(), 2)
+
+
+class WatcherTest(unittest.TestCase):
+    def test_polling_fallback(self):
+        """Test polling can be forced."""
+        with tempfile.TemporaryDirectory() as directory:
+            watcher = make_watcher(directory, polling=True)
+            self.assertFalse(watcher.wait(0))
+            watcher.close()
+
+    @unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+    def test_inotify_wakes_on_rename_into_directory(self):
+        """Test inotify reports a file renamed into the watched directory."""
+        with tempfile.TemporaryDirectory() as directory:
+            watcher = InotifyWatcher(directory)
+            self.addCleanup(watcher.close)
+            self.assertFalse(watcher.wait(0))
+
+            staging = os.path.join(directory, ".incoming")
+            Path(staging).write_text(GOOD_FILE)
+            watcher.wait(0)
+            timer = threading.Timer(
+                0.05, os.rename, [staging, os.path.join(directory, "new.uff")]
+            )
+            timer.start()
+            self.assertTrue(watcher.wait(5))
+            timer.join()
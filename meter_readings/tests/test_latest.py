@@ -0,0 +1,124 @@
+"""Tests for the maintained latest reading per meter register."""
+
+import tempfile
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from meter_readings.latest import latest_for_mpans, rebuild_latest_readings
+from meter_readings.models import LatestReading, Reading
+
+HEADER = "ZHV|0000123456|D0010002|D|UDMS|X|MRCY|20231201120000||||OPER|\n"
+
+
+class LatestReadingTest(TestCase):
+    def setUp(self):
+        caches["api"].clear()
+        self.addCleanup(caches["api"].clear)
+
+    def import_readings(self, *readings, mpan="1234567890123"):
+        """Import (register, YYYYMMDD, value) readings for one meter."""
+        lines = [HEADER, f"026|{mpan}|V|\n", "028|M001|S|\n"]
+        lines += [f"030|{reg}|{day}100000|{value}|\n" for reg, day, value in readings]
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".uff", delete=False) as f:
+            f.write("".join(lines))
+        self.addCleanup(Path(f.name).unlink)
+        call_command("import_d0010", f.name, stdout=StringIO())
+
+    def latest_values(self):
+        return {
+            latest.register_id: latest.reading_value
+            for latest in LatestReading.objects.all()
+        }
+
+    def test_import_keeps_newest_per_register(self):
+        """Test each register keeps only its newest reading from a file."""
+        self.import_readings(
+            ("01", "20231201", "100.000"),
+            ("01", "20231203", "130.000"),
+            ("01", "20231202", "120.000"),
+            ("02", "20231201", "50.000"),
+        )
+        self.assertEqual(
+            self.latest_values(), {"01": Decimal("130.000"), "02": Decimal("50.000")}
+        )
+        latest = LatestReading.objects.get(register_id="01")
+        self.assertEqual(latest.reading.reading_value, Decimal("130.000"))
+
+    def test_older_file_does_not_replace_newer_reading(self):
+        """Test a late-arriving older reading leaves the newer one in place."""
+        self.import_readings(("01", "20231205", "150.000"))
+        self.import_readings(("01", "20231201", "100.000"), ("02", "20231201", "5"))
+        self.assertEqual(
+            self.latest_values(), {"01": Decimal("150.000"), "02": Decimal("5.000")}
+        )
+        self.import_readings(("01", "20231210", "180.000"))
+        self.assertEqual(self.latest_values()["01"], Decimal("180.000"))
+
+    def test_admin_delete_falls_back_to_previous_reading(self):
+        """Test deleting the newest reading in the admin restores the one before."""
+        self.import_readings(
+            ("01", "20231201", "100.000"), ("01", "20231202", "120.000")
+        )
+        client = APIClient()
+        client.force_login(
+            User.objects.create_superuser("admin", "admin@test.com", "pass")
+        )
+        newest = Reading.objects.get(reading_value=Decimal("120.000"))
+        client.post(
+            f"/admin/meter_readings/reading/{newest.pk}/delete/", {"post": "yes"}
+        )
+        self.assertEqual(self.latest_values(), {"01": Decimal("100.000")})
+
+    def test_api_filters_by_mpan_list(self):
+        """Test many MPANs are looked up in one request."""
+        self.import_readings(("01", "20231201", "1"), mpan="1000000000001")
+        self.import_readings(("01", "20231201", "2"), mpan="1000000000002")
+        self.import_readings(("01", "20231201", "3"), mpan="1000000000003")
+
+        response = APIClient().get(
+            "/api/latest-readings/", {"mpan": "1000000000003,1000000000001"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["mpan"], row["reading_value"]) for row in response.data["results"]],
+            [("1000000000001", "1.000"), ("1000000000003", "3.000")],
+        )
+
+        too_many = ",".join(str(1000000000000 + i) for i in range(501))
+        response = APIClient().get("/api/latest-readings/", {"mpan": too_many})
+        self.assertEqual(response.status_code, 400)
+
+    def test_command_prints_csv(self):
+        """Test the command looks up MPANs from arguments and a file."""
+        self.import_readings(("01", "20231201", "1"), mpan="1000000000001")
+        self.import_readings(("01", "20231201", "2"), mpan="1000000000002")
+        with tempfile.NamedTemporaryFile(mode="w", delete=False) as f:
+            f.write("1000000000002\n\n")
+        self.addCleanup(Path(f.name).unlink)
+
+        out = StringIO()
+        call_command("latest_readings", "1000000000001", mpan_file=f.name, stdout=out)
+        self.assertEqual(
+            out.getvalue().splitlines(),
+            [
+                "mpan,meter_serial,register_id,reading_date,reading_value,reading_type",
+                "1000000000001,M001,01,2023-12-01T10:00:00Z,1.000,ACTUAL",
+                "1000000000002,M001,01,2023-12-01T10:00:00Z,2.000,ACTUAL",
+            ],
+        )
+
+    def test_rebuild_matches_import(self):
+        """Test a full rebuild gives the rows the importer maintained."""
+        self.import_readings(("01", "20231201", "1"), ("01", "20231202", "2"))
+        self.import_readings(("01", "20231203", "3"), ("02", "20231201", "4"))
+        maintained = self.latest_values()
+        self.assertEqual(rebuild_latest_readings(), 2)
+        self.assertEqual(self.latest_values(), maintained)
+        self.assertEqual(len(latest_for_mpans(["1234567890123", "9"])), 2)
@@ -0,0 +1,111 @@
+"""Tests for the opt-in API profiling middleware and its staff page."""
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from meter_readings.models import FlowFile, MeterPoint
+from meter_readings.profiling import QueryProfile, clear_samples, recent_samples
+
+
+@override_settings(API_PROFILING=True, API_PROFILING_SLOW_MS=0)
+class ProfilingMiddlewareTest(TestCase):
+    def setUp(self):
+        clear_samples()
+        self.addCleanup(clear_samples)
+        caches["api"].clear()
+        self.addCleanup(caches["api"].clear)
+        self.client = APIClient()
+        FlowFile.objects.create(filename="test.uff", file_reference="T1")
+
+    def test_server_timing_header(self):
+        """Test API responses report total and database time."""
+        response = self.client.get("/api/flow-files/")
+        self.assertEqual(response.status_code, 200)
+        timing = response["Server-Timing"]
+        self.assertRegex(timing, r"^total;dur=[\d.]+, db;dur=[\d.]+;desc=")
+        self.assertRegex(timing, r'desc="[1-9]\d* queries"')
+
+    def test_only_api_paths_profiled(self):
+        """Test requests outside the API are left alone."""
+        response = self.client.get("/")
+        self.assertFalse(response.has_header("Server-Timing"))
+        self.assertEqual(recent_samples(), [])
+
+    def test_slow_requests_sampled_newest_first(self):
+        """Test slow requests are kept in a bounded buffer."""
+        with override_settings(API_PROFILING_SAMPLES=2):
+            client = APIClient()
+            for path in ("/api/flow-files/", "/api/meters/", "/api/meter-points/"):
+                client.get(path)
+
+        samples = recent_samples()
+        self.assertEqual(
+            [sample["path"] for sample in samples],
+            ["/api/meter-points/", "/api/meters/"],
+        )
+        self.assertEqual(samples[0]["status"], 200)
+        self.assertGreater(samples[0]["queries"], 0)
+
+    @override_settings(API_PROFILING_SLOW_MS=60000)
+    def test_fast_requests_not_sampled(self):
+        """Test requests under the slow threshold are not kept."""
+        self.client.get("/api/flow-files/")
+        self.assertEqual(recent_samples(), [])
+
+    @override_settings(API_PROFILING=False)
+    def test_disabled_by_default(self):
+        """Test the middleware drops out when profiling is off."""
+        response = APIClient().get("/api/flow-files/")
+        self.assertFalse(response.has_header("Server-Timing"))
+
+
+class QueryProfileTest(TestCase):
+    def test_repeated_and_duplicate_queries(self):
+        """Test N+1 query shapes and exact duplicates are detected."""
+        for mpan in ("1234567890123", "1234567890124"):
+            MeterPoint.objects.create(mpan=mpan)
+        profile = QueryProfile()
+        with connection.execute_wrapper(profile):
+            for mpan in ("1234567890123", "1234567890124", "1234567890123"):
+                MeterPoint.objects.filter(mpan=mpan).first()
+            FlowFile.objects.count()
+
+        self.assertEqual(profile.count, 4)
+        self.assertEqual(profile.duplicates, 1)
+        [(sql, count)] = profile.repeated(3)
+        self.assertIn("meter_readings_meterpoint", sql)
+        self.assertEqual(count, 3)
+        self.assertEqual(profile.repeated(4), [])
+
+
+class ProfilingPageTest(TestCase):
+    def setUp(self):
+        clear_samples()
+        self.addCleanup(clear_samples)
+        caches["api"].clear()
+        self.addCleanup(caches["api"].clear)
+        self.admin = User.objects.create_superuser(
+            username="admin", email="admin@test.com", password="testpass123"
+        )
+
+    def test_requires_staff(self):
+        """Test the profiling page requires staff privileges."""
+        response = self.client.get("/admin/profiling/")
+        self.assertEqual(response.status_code, 302)
+        self.assertIn("/admin/login/", response.url)
+
+    @override_settings(API_PROFILING=True, API_PROFILING_SLOW_MS=0)
+    def test_lists_and_clears_samples(self):
+        """Test sampled requests are listed and can be cleared."""
+        APIClient().get("/api/flow-files/?search=test")
+        self.client.force_login(self.admin)
+
+        response = self.client.get("/admin/profiling/")
+        self.assertContains(response, "GET /api/flow-files/?search=test")
+
+        response = self.client.post("/admin/profiling/", {"action": "clear"})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(recent_samples(), [])
@@ -0,0 +1,63 @@
+"""Tests for the synthetic D0010 generator and the import benchmark."""
+
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from meter_readings.management.commands.benchmark_import import benchmark_file
+from meter_readings.models import FlowFile, Reading
+from meter_readings.synthetic import last_sunday
+
+
+class GenerateD0010Test(TestCase):
+    def generate(self, **options):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        options = {"mpans": 3, "readings": 5, "registers": 2, **options}
+        call_command("generate_d0010", directory, stdout=StringIO(), **options)
+        return sorted(Path(directory).iterdir())
+
+    def test_same_seed_same_file(self):
+        """Test generated files are reproducible from their seed."""
+        first, second = self.generate(seed=7)[0], self.generate(seed=7)[0]
+        self.assertEqual(first.read_bytes(), second.read_bytes())
+        self.assertNotEqual(first.read_bytes(), self.generate(seed=8)[0].read_bytes())
+
+    def test_generated_file_imports(self):
+        """Test every reading, clock change reads and repeats included, imports."""
+        (path,) = self.generate(meters_per_mpan=2, duplicate_rate=0.5)
+        call_command("import_d0010", str(path), stdout=StringIO())
+
+        # 5 interval reads plus 3 on each of the two clock change days
+        self.assertEqual(Reading.objects.count(), 3 * 2 * 2 * (5 + 6))
+        autumn = last_sunday(2024, 10)
+        # The repeated autumn hour resolves to GMT
+        self.assertTrue(
+            Reading.objects.filter(
+                reading_date=datetime(2024, 10, autumn.day, 1, 30, tzinfo=timezone.utc)
+            ).exists()
+        )
+
+    def test_resends_rejected_by_content(self):
+        """Test resend copies are caught by the importer's content hash."""
+        original, resend = self.generate(resends=1)
+        out = StringIO()
+        call_command("import_d0010", str(original), str(resend), stdout=out)
+        self.assertEqual(FlowFile.objects.count(), 1)
+        self.assertIn(f"already been imported as {original.name}", out.getvalue())
+
+    def test_benchmark_file_reports_each_phase(self):
+        """Test the benchmark times parse, save and total and cleans up."""
+        (path,) = self.generate()
+        result = benchmark_file(path)
+        self.assertEqual(result["parse"]["queries"], 0)
+        for phase in ("parse", "save", "total"):
+            self.assertEqual(result[phase]["rows"], 3 * 2 * 11)
+            self.assertGreater(result[phase]["peak_rss_kb"], 0)
+        self.assertGreater(result["total"]["queries"], 0)
+        self.assertFalse(Reading.objects.exists())
@@ -2,8 +2,11 @@
 Utility functions for meter_readings app.
 """
 
+from itertools import islice
 from pathlib import Path
+
 from django.conf import settings
+from django.utils.dateparse import parse_date
 
 
 def get_sample_files():
@@ -21,11 +24,72 @@ def get_sample_file_path(filename):
     return Path(settings.BASE_DIR) / "sample_data" / filename
 
 
+def parse_date_param(value):
+    """
+    Parse a YYYY-MM-DD parameter, or return None if it is missing or not a
+    real date (``parse_date`` raises for well-formed ones like 2025-02-30).
+    """
+    try:
+        return parse_date(value or "")
+    except ValueError:
+        return None
+
+
+# Query parameters understood by filter_readings
+READING_FILTER_PARAMS = ("mpan", "meter_serial", "date_from", "date_to")
+
+
+def date_filter_errors(params):
+    """
+    Return {param: message} for ``date_from``/``date_to`` values in
+    ``params`` that are not real YYYY-MM-DD dates.
+
+    Check before ``filter_readings``; the database would otherwise reject
+    them only once the queryset runs, which for a streamed export is
+    after the response has started.
+    """
+    return {
+        param: "Must be a date (YYYY-MM-DD)"
+        for param in ("date_from", "date_to")
+        if params.get(param) and parse_date_param(params[param]) is None
+    }
+
+
+def filter_readings(queryset, params):
+    """
+    Apply the readings API filters to a Reading queryset.
+
+    ``params`` is any mapping of query parameters; supports ``mpan``,
+    ``meter_serial``, ``date_from`` and ``date_to``.
+    """
+    # Filter by MPAN
+    mpan = params.get("mpan")
+    if mpan:
+        queryset = queryset.filter(meter__meter_point__mpan=mpan)
+
+    # Filter by meter serial
+    meter_serial = params.get("meter_serial")
+    if meter_serial:
+        queryset = queryset.filter(meter__serial_number=meter_serial)
+
+    # Filter by date range
+    date_from = params.get("date_from")
+    if date_from:
+        queryset = queryset.filter(reading_date__gte=date_from)
+
+    date_to = params.get("date_to")
+    if date_to:
+        queryset = queryset.filter(reading_date__lte=date_to)
+
+    return queryset
+
+
 def clear_all_data():
     """
     Clear all meter reading data from database.
     WARNING: This is destructive and cannot be undone.
     """
+    from .caching import data_changed
     from .models import Reading, Meter, MeterPoint, FlowFile
 
     count = {
@@ -40,5 +104,21 @@ def clear_all_data():
     Meter.objects.all().delete()
     MeterPoint.objects.all().delete()
     FlowFile.objects.all().delete()
+    data_changed()
 
     return count
+
+
+# Values per chunk when a lookup or update is split into several
+# statements, kept well under SQLite's bound parameter limit
+QUERY_CHUNK_SIZE = 500
+
+
+def chunked(iterable, size):
+    """Yield successive lists of at most ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
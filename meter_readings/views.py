@@ -2,16 +2,17 @@
 
 from django.http import HttpResponse
 
+from .counts import table_count
 from .models import FlowFile, Meter, MeterPoint, Reading
 
 
 def index(request):
     """Dashboard view showing application status."""
     context = {
-        "meter_points_count": MeterPoint.objects.count(),
-        "meters_count": Meter.objects.count(),
-        "readings_count": Reading.objects.count(),
-        "flow_files_count": FlowFile.objects.count(),
+        "meter_points_count": table_count(MeterPoint),
+        "meters_count": table_count(Meter),
+        "readings_count": table_count(Reading),
+        "flow_files_count": table_count(FlowFile),
     }
 
     html_content = f"""